@@ -1,501 +1,705 @@
 import streamlit as st
 import pandas as pd
-import math
 import json
+import math
+import os
 from io import BytesIO
+from rab_engine import AHSP_Engine, Calculator, SF_UPLIFT_MIN, TARIF_PPN, item_dari_dimensi, segmen_ke_items
+from rab_excel import tulis_rab_excel
+from laporan_cetak import tulis_laporan_pdf
+from proyek_store import ProjectStore
+from item_store import ItemStore, jejak_memori_sesi
+from optimasi_usbr import optimasi_terjunan
+from validator_rab import validasi_proyek
+from skenario_harga import skenario_eskalasi, muat_skenario, hitung_skenario, ekspor_skenario_excel
+from potongan_memanjang import impor_potongan_memanjang
+from rekap_sumber_daya import hitung_sumber_daya, ekspor_sumber_daya_excel
+from profil_rerun import ProfilRerun
+from jadwal_besi import buat_bbs, optimasi_potong, ekspor_bbs_excel, PANJANG_STOK
+from portofolio import muat_portofolio, ekspor_portofolio_excel, folder_di_akar, FOLDER_PROYEK
+from graf_dependensi import RABInkremental
+from pustaka_harga import pustaka, HargaSesi, baca_harga, admin_sah, KUNCI_ADMIN
+from desain_hidrolis import desain_saluran, desain_ke_segmen, N_MANNING, V_MIN, V_MAKS, H_MAKS
+from risiko_biaya import simulasi_risiko, tabel_ketidakpastian, histogram_risiko, N_SAMPEL_DEFAULT
+from boq_tab import render_boq_tab
+from kurva_s import susun_jadwal, pendahulu_otomatis, pendahulu_dari_teks, ekspor_kurva_s_excel, KELOMPOK_TENAGA, REGU_DEFAULT, KAPASITAS_DEFAULT, HARI_KERJA_MINGGU, MODE_PENDAHULU
 
 # --- 1. CONFIGURASI & STATE MANAGEMENT ---
 st.set_page_config(page_title="Pro QS V.12: AHSP SDA Bengkulu", layout="wide", page_icon="🏗️")
 
-if 'data_proyek' not in st.session_state:
-    st.session_state['data_proyek'] = []
+# Profil waktu & memori per tahap rerun (opsional): panel Debug di sidebar atau env RAB_PROFIL=1
+profil = ProfilRerun(aktif=st.session_state.get('debug_profil', False) or os.environ.get("RAB_PROFIL") == "1",
+                     cprofile=st.session_state.pop('cprofile_berikut', False))
+try:
+    profil.tahap("init")
 
-# --- 2. LIBRARY AHSP & HARGA (DATABASE BENGKULU) ---
-class AHSP_Engine:
-    """
-    Engine Analisa Harga Satuan Pekerjaan (AHSP) Bidang SDA.
-    Referensi: SE Menteri PUPR Bidang SDA.
-    Lokasi Harga: Provinsi Bengkulu (Estimasi)
-    """
-    
-    @staticmethod
-    def get_analisa_detail(hsp_code, prices):
-        """Mengembalikan Rincian Analisa dalam format Dictionary"""
-        u_pekerja = prices['u_pekerja']
-        u_tukang = prices['u_tukang']
-        u_mandor = prices['u_mandor']
-        p_semen = prices['p_semen']
-        p_pasir = prices['p_pasir']
-        p_batu = prices['p_batu']
-        p_split = prices['p_split']
-        p_besi = prices['p_besi']
-        p_kayu = prices['p_kayu']
-        p_paku = prices['p_paku']
-        p_kawat = prices['p_kawat'] # Kawat beton
-
-        # --- A. PEKERJAAN TANAH (SDA) ---
-        if hsp_code == "T.06.a.1": # Galian Tanah Biasa (Manual) - T.06.a.1
-            koef = [
-                ("Pekerja", 0.750, u_pekerja),
-                ("Mandor", 0.025, u_mandor)
-            ]
-            return {"kode": "T.06.a.1", "uraian": "1 m3 Galian Tanah Biasa (Manual)", "items": koef}
-            
-        elif hsp_code == "T.14.a": # Timbunan Tanah Kembali (Manual)
-            koef = [
-                ("Pekerja", 0.330, u_pekerja),
-                ("Mandor", 0.010, u_mandor)
-            ]
-            return {"kode": "T.14.a", "uraian": "1 m3 Timbunan Kembali Dipadatkan", "items": koef}
-
-        # --- B. PEKERJAAN PASANGAN (SDA) ---
-        elif hsp_code == "P.01.a": # Pasangan Batu Kali 1:4 (SDA)
-            koef = [
-                # Tenaga
-                ("Pekerja", 1.200, u_pekerja),
-                ("Tukang Batu", 0.600, u_tukang),
-                ("Mandor", 0.060, u_mandor),
-                # Bahan
-                ("Batu Kali", 1.200, p_batu),
-                ("Semen (PC)", 163.00, p_semen),
-                ("Pasir Pasang", 0.520, p_pasir)
-            ]
-            return {"kode": "P.01.a (SDA)", "uraian": "1 m3 Pasangan Batu Camp. 1:4", "items": koef}
-            
-        elif hsp_code == "P.04.e": # Plesteran 1:3 + Acian (Tebal 15mm)
-            koef = [
-                ("Pekerja", 0.300, u_pekerja),
-                ("Tukang Batu", 0.150, u_tukang),
-                ("Mandor", 0.015, u_mandor),
-                ("Semen (PC)", 7.776, p_semen), # 6.24 plester + acian
-                ("Pasir Pasang", 0.024, p_pasir)
-            ]
-            return {"kode": "P.04.e", "uraian": "1 m2 Plesteran 1:3 + Acian", "items": koef}
-
-        elif hsp_code == "P.05.a": # Siaran 1:2
-            koef = [
-                ("Pekerja", 0.150, u_pekerja),
-                ("Tukang Batu", 0.075, u_tukang),
-                ("Mandor", 0.008, u_mandor),
-                ("Semen (PC)", 6.000, p_semen), # Estimasi Siaran
-                ("Pasir Pasang", 0.010, p_pasir)
-            ]
-            return {"kode": "P.05.a", "uraian": "1 m2 Siaran Camp. 1:2", "items": koef}
-
-        # --- C. PEKERJAAN BETON (SDA) ---
-        elif hsp_code == "B.05.a": # Beton K-225 (Manual/Molen Kecil)
-            koef = [
-                ("Pekerja", 1.650, u_pekerja),
-                ("Tukang Batu", 0.275, u_tukang),
-                ("Mandor", 0.083, u_mandor),
-                ("Semen (PC)", 371.0, p_semen),
-                ("Pasir Beton", 0.499, p_pasir),
-                ("Split/Kerikil", 0.776, p_split)
-            ]
-            return {"kode": "B.05.a", "uraian": "1 m3 Beton Mutu K-225 (f'c 19.3 MPa)", "items": koef}
-
-        elif hsp_code == "B.17.a": # Pembesian (Polos/Ulir)
-            koef = [
-                ("Pekerja", 0.007, u_pekerja),
-                ("Tukang Besi", 0.007, u_tukang),
-                ("Mandor", 0.0004, u_mandor),
-                ("Besi Beton", 1.050, p_besi), # Waste 5%
-                ("Kawat Beton", 0.015, p_kawat)
-            ]
-            return {"kode": "B.17.a", "uraian": "1 kg Pembesian Besi Polos/Ulir", "items": koef}
-            
-        elif hsp_code == "B.20.a": # Bekisting Kayu (Untuk Saluran/Struktur) - 2x Pakai
-            koef = [
-                ("Pekerja", 0.520, u_pekerja),
-                ("Tukang Kayu", 0.260, u_tukang),
-                ("Mandor", 0.026, u_mandor),
-                ("Kayu Kelas III", 0.045, p_kayu),
-                ("Paku", 0.300, p_paku),
-                ("Minyak Bekisting", 0.100, 25000) # Assumsi liter
-            ]
-            return {"kode": "B.20.a", "uraian": "1 m2 Pasang Bekisting (Kayu Kls III)", "items": koef}
-        
-        elif hsp_code == "T.15.a": # Bongkaran Pasangan
-            koef = [
-                ("Pekerja", 2.000, u_pekerja),
-                ("Mandor", 0.100, u_mandor)
-            ]
-            return {"kode": "T.15.a", "uraian": "1 m3 Bongkaran Pasangan", "items": koef}
-
-        return {"kode": "N/A", "uraian": "Item Tidak Ditemukan", "items": []}
-
-    @staticmethod
-    def hitung_harga_satuan(hsp_code, prices, overhead_pct):
-        analisa = AHSP_Engine.get_analisa_detail(hsp_code, prices)
-        total_dasar = sum([item[1] * item[2] for item in analisa['items']])
-        total_final = total_dasar * (1 + overhead_pct/100)
-        return total_final
-
-# --- 3. LIBRARY PERHITUNGAN VOLUME (ENGINEERING CORE - V.11) ---
-class Calculator:
-    
-    # 3.1 SALURAN BETON
-    @staticmethod
-    def hitung_beton_struktur(h, b, m, panjang, t_cm, dia, jarak, lapis, waste, fc, fy, is_rehab):
-        if h <= 0 or panjang <= 0: return {"vol_beton": 0, "rho_data": {"status": "DATA KOSONG"}}
-        gamma_air, selimut = 9.81, 40
-        t_mm = t_cm * 10
-        d_eff = max(1.0, t_mm - selimut - (dia/2))
-        Mu = 1.6 * (1/6) * gamma_air * (h**3)
-        sisi_miring = h * math.sqrt(1 + m**2)
-        t_rekom = max((Mu / (0.85 * 2000))**0.5, sisi_miring / 12, 0.10) * 100 
-        As_per_meter = (1000 / jarak) * (0.25 * math.pi * dia**2) * lapis
-        rho_actual = As_per_meter / (1000 * d_eff)
-        rho_min = 1.4 / fy if fy > 0 else 0.0014
-        rho_max = 0.75 * ((0.85 * (0.85 if fc<=28 else 0.65) * fc / fy) * (600/(600+fy)))
-        status_rho = "AMAN" if rho_min <= rho_actual <= rho_max else ("KURANG BESI" if rho_actual < rho_min else "BOROS BESI")
-        t_m = t_cm / 100
-        vol_beton = (b + 2*(h*math.sqrt(1+m**2)) + 2*t_m) * t_m * panjang
-        vol_galian = ((b + 2*t_m*math.sqrt(1+m**2) + 0.4 + (b + 2*t_m*math.sqrt(1+m**2) + 0.4 + 2*m*(h+t_m+0.2)))/2) * (h+t_m+0.2) * panjang
-        return {
-            "mu": Mu, "t_rekom": t_rekom,
-            "rho_data": {"act": rho_actual, "min": rho_min, "max": rho_max, "status": status_rho},
-            "vol_beton": vol_beton, "vol_galian": vol_galian, "vol_timbunan": max(0, (vol_galian-vol_beton)*0.45),
-            "berat_besi": (b + 2*(h*math.sqrt(1+m**2))) * ((panjang*100/jarak)+1) * lapis * (0.006165*dia**2) * 1.2 * (1+waste/100),
-            "luas_bekisting": (2 * sisi_miring * panjang) * 2, "vol_bongkaran": vol_beton if is_rehab else 0
-        }
-
-    # 3.2 SALURAN BATU
-    @staticmethod
-    def hitung_pasangan_batu(h, b, m, panjang, l_atas, l_bawah, t_lantai, is_rehab):
-        vol_batu = ((((l_atas+l_bawah)/2)*h)*2 + (b*t_lantai)) * panjang
-        return {
-            "mu": 0, "t_rekom": 0, "rho_data": None,
-            "vol_batu": vol_batu, "vol_galian": vol_batu*1.25, "vol_timbunan": max(0, (vol_batu*1.25 - vol_batu)*0.35),
-            "luas_plester": ((2*h*math.sqrt(1+m**2))+b)*panjang, "luas_siaran": (2*l_atas)*panjang, "vol_bongkaran": vol_batu if is_rehab else 0
-        }
-
-    # 3.3 BOX CULVERT
-    @staticmethod
-    def hitung_gorong_box_struktur(w, h, p, t_cm, dia, jarak, fc, fy, is_rehab):
-        if w<=0 or h<=0: return {"vol_beton": 0, "t_rekom": 0, "rho_data": {"status": "DATA 0"}}
-        t_m = t_cm / 100
-        Mu = (1/10) * ((18*1.5)+10) * ((w+t_m)**2)
-        d_eff = (t_cm*10) - 40 - (dia/2)
-        t_rekom = max((Mu/(0.85*2000))**0.5 * 100, (w+t_m)/12*100, 15.0)
-        rho_act = ((1000/jarak)*(0.25*math.pi*dia**2)*2) / (1000*d_eff)
-        status = "AMAN" if (1.4/fy) <= rho_act <= 0.025 else ("KURANG" if rho_act < 1.4/fy else "BOROS")
-        vol_beton = ((w+2*t_m)*(h+2*t_m)*p) - (w*h*p)
-        return {
-            "mu": Mu, "t_rekom": t_rekom, "rho_data": {"act": rho_act, "min": 1.4/fy, "max": 0.025, "status": status},
-            "vol_beton": vol_beton, "vol_galian": vol_beton/0.2, "vol_timbunan": vol_beton/0.5,
-            "berat_besi": 2*((w+2*t_m)+(h+2*t_m))*2 * ((p*100/jarak)+1) * (0.006165*dia**2) * 1.2,
-            "luas_bekisting": (2*w+2*h)*p, "vol_bongkaran": vol_beton if is_rehab else 0
-        }
-
-    # 3.4 TERJUNAN USBR + MODE HEMAT
-    @staticmethod
-    def hitung_terjunan_usbr(Q, H_total, H_step, B, t_lantai, t_dinding, qa_tanah, mode_hemat, is_rehab):
-        if H_step <= 0: H_step = 0.1
-        if B <= 0: B = 1.0
-        if Q <= 0: Q = 0.1 
-        g = 9.81
-        n_steps = math.ceil(H_total / H_step)
-        H_real = H_total / n_steps 
-        q = Q / B
-        V1 = math.sqrt(2 * g * H_real)
-        y1 = q / V1
-        Fr1 = V1 / math.sqrt(g * y1)
-        y2 = 0.5 * y1 * (math.sqrt(1 + 8 * Fr1**2) - 1)
-        
-        tipe_usbr = "Unknown"
-        k_length = 0
-        if Fr1 < 1.7: tipe_usbr, k_length = "Aliran Undular", 4.0
-        elif Fr1 < 2.5: tipe_usbr, k_length = "USBR Tipe I", 5.0
-        elif Fr1 <= 4.5: tipe_usbr, k_length = "USBR Tipe IV", 6.0 
-        else:
-            if V1 < 18.0: tipe_usbr, k_length = "USBR Tipe III", 2.7 
-            else: tipe_usbr, k_length = "USBR Tipe II", 4.3
-        
-        L_kolam_standard = k_length * y2
-        L_drop = 4.30 * H_real * ((q**2 / (g * H_real**3))**0.27)
-        
-        is_hemat_active = mode_hemat and (H_real <= 1.2)
-        L_kolam_inter = 0.5 if is_hemat_active else L_kolam_standard
-        tipe_desain = "Mode Hemat (Kolam Hilir Saja)" if is_hemat_active else "Standard (Full USBR)"
-        L_kolam_final = L_kolam_standard 
-        
-        jml_inter = max(0, n_steps - 1)
-        L_total_structure_linear = (jml_inter * (L_drop + L_kolam_inter)) + (1 * (L_drop + L_kolam_final))
-        
-        gamma_c, gamma_w = 24, 9.81
-        L_final_segment = L_drop + L_kolam_final
-        W_beton = L_final_segment * B * t_lantai * gamma_c
-        W_air = 0.5 * (y1 + y2) * L_final_segment * B * gamma_w
-        Total_Berat = W_beton + W_air
-        head_hulu = y2 + (0.5 * H_real)
-        Uplift_Force = 0.5 * (head_hulu + y2) * L_final_segment * B * gamma_w
-        SF_uplift = Total_Berat / Uplift_Force if Uplift_Force > 0 else 99
-        Tekanan_Netto = (Total_Berat - Uplift_Force) / (B * L_final_segment)
-        if Tekanan_Netto < 0: Tekanan_Netto = 0
-        
-        status_uplift = "AMAN" if SF_uplift >= 1.5 else "⚠️ BAHAYA (Mengapung)"
-        status_tanah = "AMAN" if Tekanan_Netto <= qa_tanah else "⚠️ BAHAYA (Amblas)"
-        
-        h_dinding = y2 + 0.6 
-        vol_lantai = L_total_structure_linear * B * t_lantai
-        vol_mercu = n_steps * (B * H_real * 0.4) 
-        vol_dinding = 2 * (L_total_structure_linear * h_dinding * t_dinding)
-        vol_beton_total = vol_lantai + vol_mercu + vol_dinding
-        
-        ratio_besi = 120.0
-        if SF_uplift < 1.5: ratio_besi += 10 
-        if "USBR Tipe III" in tipe_usbr: ratio_besi += 15
-        
-        return {
-            "info_struktur": f"{tipe_usbr} ({n_steps} Trap) - {tipe_desain}",
-            "detail_usbr": {"Fr": Fr1, "y1": y1, "y2": y2, "L_kolam_final": L_kolam_final, "L_total": L_total_structure_linear},
-            "stabilitas": {"sf_uplift": SF_uplift, "status_uplift": status_uplift, "sigma_tanah": Tekanan_Netto, "status_tanah": status_tanah},
-            "vol_beton": vol_beton_total, "vol_batu": 0, "vol_galian": vol_beton_total * 1.3, 
-            "vol_timbunan": vol_beton_total * 0.3, "berat_besi": vol_beton_total * ratio_besi, 
-            "luas_bekisting": (2 * L_total_structure_linear * h_dinding) + (n_steps*B*H_real),
-            "luas_plester": (2 * L_total_structure_linear * h_dinding), "luas_siaran": 0,
-            "vol_bongkaran": vol_beton_total if is_rehab else 0
-        }
-
-# --- 4. SIDEBAR (AHSP & INPUT HARGA) ---
-with st.sidebar:
-    st.title("📂 Manajemen Proyek")
-    col_save, col_load = st.columns(2)
-    json_str = json.dumps(st.session_state['data_proyek'], indent=2)
-    col_save.download_button("💾 Save", json_str, "rab_proyek.json", "application/json")
-    uploaded_file = st.file_uploader("📂 Open", type=["json"])
-    if uploaded_file:
-        try: st.session_state['data_proyek'] = json.load(uploaded_file); st.success("Loaded!")
-        except: st.error("Error")
+    # Item proyek disimpan di ItemStore (ID stabil, indeks tipe/nama); store.to_list() = skema rab_proyek.json
+    if 'store' not in st.session_state:
+        st.session_state['store'] = ItemStore()
+    store = st.session_state['store']
+
+    _list_rerun = {}
+    def data_proyek():
+        """List of dict seluruh item (skema rab_proyek.json); dibangun hanya bila ada hasil turunan yang harus dihitung ulang"""
+        if _list_rerun.get('versi') != store.versi: _list_rerun.update(versi=store.versi, data=store.to_list())
+        return _list_rerun['data']
+
+    def per_versi(nama, kunci, hitung):
+        """Hasil turunan data proyek (validasi, skenario, sumber daya, ...) di-cache di sesi selama store.versi & `kunci` sama"""
+        cache = st.session_state.setdefault('cache_versi', {})
+        kunci = (store.versi, *kunci)
+        if nama not in cache or cache[nama][0] != kunci: cache[nama] = (kunci, hitung())
+        return cache[nama][1]
+
+    # --- 2 & 3. LIBRARY AHSP & PERHITUNGAN VOLUME: lihat rab_engine.py ---
+
+    @st.cache_data(max_entries=8, show_spinner=False)
+    def buat_excel_rab(kunci, _excel_rows, _data_proyek, _prices, _overhead):
+        """Workbook RAB (Rekap, Detail, Analisa AHSP, Back-Up Volume); cache berdasarkan kunci (versi store + harga) saja"""
+        output = BytesIO()
+        formulir = [AHSP_Engine.get_formulir(kode, _prices, _overhead) for kode in AHSP_Engine.KODE]
+        tulis_rab_excel(output, _excel_rows, _data_proyek, formulir, _overhead)
+        return output.getvalue()
+
+    @st.cache_data(max_entries=4, show_spinner=False)
+    def buat_laporan_pdf(kunci, _data_proyek, _prices, _overhead):
+        """Laporan cetak PDF (Rekap, Detail, Analisa AHSP, Back-Up Volume) ditata di server; cache berdasarkan kunci"""
+        output = BytesIO()
+        tulis_laporan_pdf(output, _data_proyek, _prices, _overhead)
+        return output.getvalue()
+
+    # --- 4. SIDEBAR (AHSP & INPUT HARGA) ---
+    profil.tahap("sidebar")
+    with st.sidebar:
+        st.title("📂 Manajemen Proyek")
+        col_save, col_load = st.columns(2)
+        # Serialisasi hanya saat tombol diklik (callable), bukan di setiap rerun
+        col_save.download_button("💾 Save", lambda: json.dumps(store.to_list(), indent=2), "rab_proyek.json", "application/json")
+        col_load.download_button("🗜️ Save (.rabdb)", lambda: ProjectStore.dari_list(store.items()).to_bytes(), "rab_proyek.rabdb", "application/x-sqlite3")
+        uploaded_file = st.file_uploader("📂 Open", type=["json", "rabdb"])
+        # Parse file hanya sekali per upload (bukan setiap rerun selama file masih terpasang)
+        if uploaded_file and st.session_state.get('file_terbuka') != uploaded_file.file_id:
+            try:
+                # .rabdb dibaca per baris langsung ke ItemStore (generator), tanpa list of dict perantara
+                if uploaded_file.name.endswith(".rabdb"): data_baru = ProjectStore.dari_bytes(uploaded_file.getvalue()).items()
+                else: data_baru = json.load(uploaded_file)
+                st.session_state['store'] = store = ItemStore.dari_list(data_baru)
+                st.session_state['file_terbuka'] = uploaded_file.file_id
+                st.success("Loaded!")
+            except: st.error("Error")
+        with st.expander("🧠 Memori Sesi"):
+            if st.button("Ukur Memori"):
+                jejak = store.jejak_memori()
+                st.caption(f"Store: {jejak['jumlah_item']} item = {jejak['total']/1024:,.1f} KB "
+                           f"(record {jejak['record']/1024:,.1f} + indeks {jejak['indeks']/1024:,.1f}); "
+                           f"list of dict biasa: {jejak['list_of_dict']/1024:,.1f} KB")
+                df_memori = pd.DataFrame(jejak_memori_sesi(st.session_state))
+                st.dataframe(df_memori.assign(KB=df_memori["byte"] / 1024).drop(columns="byte"), hide_index=True)
             
-    st.markdown("---")
-    st.header("💰 Harga Satuan (Bengkulu)")
-    st.caption("Referensi: Harga Pasar Prov. Bengkulu (Estimasi 2024/2025)")
+        st.markdown("---")
+        st.header("💰 Harga Satuan")
+        # Daftar harga referensi & HSP-nya dipakai bersama semua sesi (pustaka_harga); sesi hanya menyimpan override
+        pustaka_bersama = pustaka()
+        harga_sesi = st.session_state.setdefault('harga_sesi', HargaSesi())
+        harga_sesi.nama = st.selectbox("Daftar Harga Referensi", pustaka_bersama.daftar(), key="daftar_harga")
+        dasar = pustaka_bersama.ambil(harga_sesi.nama)
+        st.caption(f"Referensi: {dasar.sumber} (versi {dasar.versi})")
+
+        def input_harga(label, kunci):
+            # Key ikut versi daftar: daftar diperbarui -> input kembali ke harga baru, kecuali yang di-override sesi ini
+            nilai = st.number_input(label, value=float(harga_sesi.override.get(kunci, dasar.prices[kunci])), key=f"harga_{kunci}_{dasar.nama}_{dasar.versi}")
+            harga_sesi.catat(dasar, kunci, nilai)
+            return nilai
     
-    with st.expander("1. Upah Tenaga Kerja", expanded=True):
-        u_pekerja = st.number_input("Pekerja (OH)", value=115000.0)
-        u_tukang = st.number_input("Tukang (OH)", value=140000.0) # Tukang Batu/Kayu
-        u_mandor = st.number_input("Mandor (OH)", value=165000.0)
-        overhead = st.number_input("Overhead & Profit (%)", value=15.0) # SDA biasanya 10-15%
+        with st.expander("1. Upah Tenaga Kerja", expanded=True):
+            input_harga("Pekerja (OH)", 'u_pekerja')
+            input_harga("Tukang (OH)", 'u_tukang') # Tukang Batu/Kayu
+            input_harga("Mandor (OH)", 'u_mandor')
+            overhead = st.number_input("Overhead & Profit (%)", value=harga_sesi.overhead_pct(dasar), key=f"overhead_{dasar.nama}_{dasar.versi}") # SDA biasanya 10-15%
+            harga_sesi.catat_overhead(dasar, overhead)
         
-    with st.expander("2. Bahan Bangunan", expanded=False):
-        p_semen = st.number_input("Semen PC (kg)", value=1650.0) # ~82.500 per sak
-        p_pasir = st.number_input("Pasir Pasang/Beton (m3)", value=215000.0)
-        p_batu = st.number_input("Batu Kali (m3)", value=265000.0)
-        p_split = st.number_input("Kerikil/Split (m3)", value=325000.0)
-        p_besi = st.number_input("Besi Beton (kg)", value=15500.0)
-        p_kawat = st.number_input("Kawat Beton (kg)", value=22000.0)
-        p_kayu = st.number_input("Kayu Kls III (m3)", value=2850000.0)
-        p_paku = st.number_input("Paku (kg)", value=20000.0)
-
-    # Dictionary Harga untuk AHSP Engine
-    prices_bengkulu = {
-        'u_pekerja': u_pekerja, 'u_tukang': u_tukang, 'u_mandor': u_mandor,
-        'p_semen': p_semen, 'p_pasir': p_pasir, 'p_batu': p_batu,
-        'p_split': p_split, 'p_besi': p_besi, 'p_kayu': p_kayu,
-        'p_paku': p_paku, 'p_kawat': p_kawat
-    }
-
-    # Hitung Harga Satuan Pekerjaan (HSP) Final menggunakan AHSP Engine
-    hsp_galian = AHSP_Engine.hitung_harga_satuan("T.06.a.1", prices_bengkulu, overhead)
-    hsp_timbunan = AHSP_Engine.hitung_harga_satuan("T.14.a", prices_bengkulu, overhead)
-    hsp_bongkaran = AHSP_Engine.hitung_harga_satuan("T.15.a", prices_bengkulu, overhead)
-    hsp_beton = AHSP_Engine.hitung_harga_satuan("B.05.a", prices_bengkulu, overhead)
-    hsp_besi = AHSP_Engine.hitung_harga_satuan("B.17.a", prices_bengkulu, overhead)
-    hsp_bekisting = AHSP_Engine.hitung_harga_satuan("B.20.a", prices_bengkulu, overhead)
-    hsp_batu = AHSP_Engine.hitung_harga_satuan("P.01.a", prices_bengkulu, overhead)
-    hsp_plester = AHSP_Engine.hitung_harga_satuan("P.04.e", prices_bengkulu, overhead)
-    hsp_siaran = AHSP_Engine.hitung_harga_satuan("P.05.a", prices_bengkulu, overhead)
-
-# --- 5. MAIN UI ---
-st.title("🏗️ Pro QS V.12: AHSP SDA Bengkulu")
-st.caption("Standar: SE Menteri PUPR Bidang SDA | Harga: Provinsi Bengkulu")
-
-tab1, tab2, tab3, tab4 = st.tabs(["➕ Input", "📋 List", "📊 RAB Detail", "📑 Analisa Harga (Formulir)"])
-
-# === TAB 1: INPUT (TETAP SAMA 100%) ===
-with tab1:
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("1. Identitas")
-        kategori = st.radio("Kategori", ["Saluran (Linear)", "Bangunan Pelengkap (Unit)"], horizontal=True)
-        nama_item = st.text_input("Nama Item", placeholder="Cth: Terjunan Km 2+100")
-        is_rehab = st.checkbox("🚧 Pekerjaan Rehab?", help="Hitung bongkaran otomatis")
+        with st.expander("2. Bahan Bangunan", expanded=False):
+            input_harga("Semen PC (kg)", 'p_semen') # ~82.500 per sak
+            input_harga("Pasir Pasang/Beton (m3)", 'p_pasir')
+            input_harga("Batu Kali (m3)", 'p_batu')
+            input_harga("Kerikil/Split (m3)", 'p_split')
+            input_harga("Besi Beton (kg)", 'p_besi')
+            input_harga("Kawat Beton (kg)", 'p_kawat')
+            input_harga("Kayu Kls III (m3)", 'p_kayu')
+            input_harga("Paku (kg)", 'p_paku')
+            input_harga("Minyak Bekisting (liter)", 'p_minyak')
+
+        if harga_sesi.override or harga_sesi.overhead is not None:
+            st.caption(f"✏️ Override sesi ini: {', '.join(harga_sesi.override) or '-'}{' + overhead' if harga_sesi.overhead is not None else ''}")
+            if st.button("↩️ Kembali ke Daftar Harga"):
+                harga_sesi.reset()
+                for k in [k for k in st.session_state if str(k).startswith(("harga_u_", "harga_p_", "overhead_"))]: del st.session_state[k]
+                st.rerun()
+
+        # Upload harga hanya berlaku untuk sesi ini (override HargaSesi); daftar bersama tidak berubah
+        file_harga_sesi = st.file_uploader("Pakai Daftar Harga di Sesi Ini (.json / .csv)", type=["json", "csv"], key="file_harga_sesi")
+        if file_harga_sesi and st.button("📥 Pakai Harga Upload"):
+            try:
+                harga_sesi.muat(dasar, *baca_harga(file_harga_sesi, file_harga_sesi.name))
+                for k in [k for k in st.session_state if str(k).startswith(("harga_u_", "harga_p_", "overhead_"))]: del st.session_state[k]
+                st.rerun()
+            except Exception as e: st.error(f"❌ {type(e).__name__}: {e}")
+
+        with st.expander("🗄️ Pustaka Harga Bersama"):
+            st.caption("Dipakai semua sesi di server ini. Memperbarui daftar langsung berlaku untuk semua estimator (override pribadi tetap).")
+            st.dataframe(pustaka_bersama.ringkasan(), hide_index=True)
+            for nama_gagal, pesan in pustaka_bersama.gagal.items(): st.error(f"❌ {nama_gagal}: {pesan}")
+            # Mengubah daftar bersama berdampak ke semua sesi: hanya admin (env RAB_ADMIN_HARGA)
+            if not KUNCI_ADMIN:
+                st.caption("🔒 Penerbitan dinonaktifkan. Atur env RAB_ADMIN_HARGA untuk mengaktifkan, atau taruh file di folder harga lalu restart server.")
+            elif not admin_sah(st.text_input("Kunci Admin Harga", type="password", key="kunci_admin_harga")):
+                st.caption("🔒 Masukkan kunci admin untuk memuat ulang / menerbitkan daftar harga.")
+            else:
+                if st.button("🔄 Muat Ulang Folder Harga", help="Folder env RAB_FOLDER_HARGA (default ./harga), file .json / .csv"):
+                    berubah = pustaka_bersama.muat_ulang()
+                    st.success(f"Diperbarui: {', '.join(berubah)}" if berubah else "Tidak ada perubahan")
+                file_harga = st.file_uploader("Terbitkan Daftar Harga (.json / .csv)", type=["json", "csv"], key="file_harga")
+                if file_harga and st.button("📢 Terbitkan ke Semua Sesi"):
+                    try:
+                        prices_baru, overhead_baru = baca_harga(file_harga, file_harga.name)
+                        baru = pustaka_bersama.perbarui(os.path.splitext(file_harga.name)[0], prices_baru, overhead_baru, sumber=f"Upload {file_harga.name}")
+                        st.success(f"'{baru.nama}' versi {baru.versi} diterbitkan")
+                    except Exception as e: st.error(f"❌ {type(e).__name__}: {e}")
+
+        # Dictionary Harga untuk AHSP Engine (dibangun per rerun dari daftar bersama + override, tidak disimpan di sesi)
+        prices_bengkulu = harga_sesi.prices(dasar)
+
+        # Hitung Harga Satuan Pekerjaan (HSP) lewat graf dependensi: hanya kode (dan item RAB) yang memakai
+        # harga yang berubah dihitung ulang. Tanpa override: HSP diambil dari tabel bersama (tidak disalin per sesi).
+        if 'rab_inkremental' not in st.session_state:
+            st.session_state['rab_inkremental'] = RABInkremental()
+        rab_ink = st.session_state['rab_inkremental']
+        rab_ink.set_harga(prices_bengkulu, overhead, harga_sesi.turunan(pustaka_bersama, dasar))
+        tabel_hsp = rab_ink.hsp
+        kunci_harga = (tuple(prices_bengkulu.values()), overhead) # Bagian kunci cache per_versi yang bergantung harga
+
+    # --- 5. MAIN UI ---
+    st.title("🏗️ Pro QS V.12: AHSP SDA Bengkulu")
+    st.caption("Standar: SE Menteri PUPR Bidang SDA | Harga: Provinsi Bengkulu")
+
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs(["➕ Input", "📋 List", "📊 RAB Detail", "📑 Analisa Harga (Formulir)", "📈 Skenario Harga", "🧱 Sumber Daya", "🔩 Jadwal Besi", "🗂️ Portofolio", "📉 Kurva S", "🧾 Back-Up BoQ"])
+
+    # === TAB 1: INPUT (TETAP SAMA 100%) ===
+    profil.tahap("tab1_input")
+    with tab1:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("1. Identitas")
+            kategori = st.radio("Kategori", ["Saluran (Linear)", "Bangunan Pelengkap (Unit)"], horizontal=True)
+            nama_item = st.text_input("Nama Item", placeholder="Cth: Terjunan Km 2+100")
+            is_rehab = st.checkbox("🚧 Pekerjaan Rehab?", help="Hitung bongkaran otomatis")
         
-    with col2:
-        st.subheader("2. Spesifikasi")
-        if kategori == "Saluran (Linear)":
-            tipe_kons = st.selectbox("Konstruksi", ["Beton Bertulang", "Pasangan Batu"])
-            panjang = st.number_input("Panjang (m')", value=50.0)
-            if tipe_kons == "Beton Bertulang":
-                h = st.number_input("Tinggi H (m)", value=0.8)
-                b = st.number_input("Lebar B (m)", value=0.6)
-                m = st.number_input("Talud m", value=0.0)
-                t_cm = st.number_input("Tebal (cm)", value=15.0)
-                dia = st.number_input("Dia Besi (mm)", value=10.0)
-                jarak = st.number_input("Jarak (cm)", value=15.0)
-                calc = Calculator.hitung_beton_struktur(h, b, m, panjang, t_cm, dia, jarak, 2, 5, 20, 280, is_rehab)
+        with col2:
+            st.subheader("2. Spesifikasi")
+            if kategori == "Saluran (Linear)":
+                tipe_kons = st.selectbox("Konstruksi", ["Beton Bertulang", "Pasangan Batu"])
+                panjang = st.number_input("Panjang (m')", value=50.0)
+                if tipe_kons == "Beton Bertulang":
+                    h = st.number_input("Tinggi H (m)", value=0.8)
+                    b = st.number_input("Lebar B (m)", value=0.6)
+                    m = st.number_input("Talud m", value=0.0)
+                    t_cm = st.number_input("Tebal (cm)", value=15.0)
+                    dia = st.number_input("Dia Besi (mm)", value=10.0)
+                    jarak = st.number_input("Jarak (cm)", value=15.0)
+                    calc = Calculator.hitung_beton_struktur(h, b, m, panjang, t_cm, dia, jarak, 2, 5, 20, 280, is_rehab)
+                    dimensi = {"h": h, "b": b, "m": m, "panjang": panjang, "t_cm": t_cm, "dia": dia, "jarak": jarak}
+                else:
+                    h = st.number_input("Tinggi H", value=0.8)
+                    l_atas = st.number_input("L. Atas", value=0.3)
+                    l_bawah = st.number_input("L. Bawah", value=0.4)
+                    t_lantai = st.number_input("T. Lantai", value=0.2)
+                    calc = Calculator.hitung_pasangan_batu(h, 0.5, 0.2, panjang, l_atas, l_bawah, t_lantai, is_rehab)
+                    dimensi = {"h": h, "panjang": panjang, "l_atas": l_atas, "l_bawah": l_bawah, "t_lantai": t_lantai}
+
             else:
-                h = st.number_input("Tinggi H", value=0.8)
-                l_atas = st.number_input("L. Atas", value=0.3)
-                l_bawah = st.number_input("L. Bawah", value=0.4)
-                t_lantai = st.number_input("T. Lantai", value=0.2)
-                calc = Calculator.hitung_pasangan_batu(h, 0.5, 0.2, panjang, l_atas, l_bawah, t_lantai, is_rehab)
+                jenis_bang = st.selectbox("Jenis", ["Gorong-Gorong Box", "Terjunan USBR (Integrated)"])
+                if "Gorong" in jenis_bang:
+                    w = st.number_input("Lebar (m)", value=1.0)
+                    h_box = st.number_input("Tinggi (m)", value=1.0)
+                    p_box = st.number_input("Panjang (m)", value=6.0)
+                    t_cm = st.number_input("Tebal Beton (cm)", value=20.0)
+                    dia = st.number_input("Dia. Besi (mm)", value=13.0)
+                    jarak = st.number_input("Jarak (cm)", value=15.0)
+                    calc = Calculator.hitung_gorong_box_struktur(w, h_box, p_box, t_cm, dia, jarak, 25, 400, is_rehab)
+                    dimensi = {"w": w, "h": h_box, "panjang": p_box, "t_cm": t_cm, "dia": dia, "jarak": jarak}
+                else: 
+                    mode_hemat = st.checkbox("✅ Aktifkan Mode Hemat?", value=True)
+                    c_h1, c_h2, c_h3 = st.columns(3)
+                    Q_debit = c_h1.number_input("Debit Q (m3/s)", value=1.5)
+                    H_total = c_h2.number_input("Total Tinggi (m)", value=3.0)
+                    H_step = c_h3.number_input("Max Tinggi/Trap (m)", value=1.5)
+                    c_d1, c_d2 = st.columns(2)
+                    B_terjun = c_d1.number_input("Lebar Saluran B (m)", value=1.5)
+                    qa_tanah = c_d2.number_input("Daya Dukung Tanah (kN/m2)", value=150.0)
+                    t_lantai = st.number_input("Tebal Lantai (m)", value=0.25)
+                    t_dinding = st.number_input("Tebal Dinding (m)", value=0.25)
+                    calc = Calculator.hitung_terjunan_usbr(Q_debit, H_total, H_step, B_terjun, t_lantai, t_dinding, qa_tanah, mode_hemat, is_rehab)
+                    dimensi = {"Q": Q_debit, "H_total": H_total, "H_step": H_step, "B": B_terjun, "qa_tanah": qa_tanah,
+                               "t_lantai": t_lantai, "t_dinding": t_dinding, "mode_hemat": mode_hemat}
+                    st.divider()
+                    st.write(f"**Analisa: {calc['info_struktur']}**")
+                    with st.expander("🔎 Optimasi Desain (Termurah & Aman)"):
+                        st.caption(f"Sapu H_step, tebal lantai/dinding & mode hemat. Syarat: SF uplift ≥ {SF_UPLIFT_MIN} dan σ netto ≤ daya dukung tanah. Biaya = HSP aktif (sebelum PPN).")
+                        if st.button("Cari Desain Optimal"):
+                            opt = optimasi_terjunan(Q_debit, H_total, B_terjun, qa_tanah, tabel_hsp, is_rehab)
+                            best = opt["terbaik"]
+                            if best is None: st.error("Tidak ada kombinasi yang memenuhi cek stabilitas.")
+                            else:
+                                st.success(f"Termurah: H_step {best['H_step']:.2f} m | Lantai {best['t_lantai']:.2f} m | Dinding {best['t_dinding']:.2f} m | "
+                                           f"{'Mode Hemat' if best['mode_hemat'] else 'Standard'} → Rp {best['biaya']:,.0f} (SF {best['sf_uplift']:.2f})")
+                                st.caption(f"Front Pareto Biaya vs SF Uplift ({len(opt['pareto'])} dari {len(opt['grid'])} kombinasi)")
+                                st.dataframe(opt["pareto"][["H_step", "t_lantai", "t_dinding", "mode_hemat", "info_struktur", "sf_uplift", "sigma_tanah", "biaya"]].style.format(
+                                    {"H_step": "{:.2f}", "t_lantai": "{:.2f}", "t_dinding": "{:.2f}", "sf_uplift": "{:.2f}", "sigma_tanah": "{:.1f}", "biaya": "{:,.0f}"}), use_container_width=True)
 
-        else:
-            jenis_bang = st.selectbox("Jenis", ["Gorong-Gorong Box", "Terjunan USBR (Integrated)"])
-            if "Gorong" in jenis_bang:
-                w = st.number_input("Lebar (m)", value=1.0)
-                h_box = st.number_input("Tinggi (m)", value=1.0)
-                p_box = st.number_input("Panjang (m)", value=6.0)
-                t_cm = st.number_input("Tebal Beton (cm)", value=20.0)
-                dia = st.number_input("Dia. Besi (mm)", value=13.0)
-                jarak = st.number_input("Jarak (cm)", value=15.0)
-                calc = Calculator.hitung_gorong_box_struktur(w, h_box, p_box, t_cm, dia, jarak, 25, 400, is_rehab)
-            else: 
-                mode_hemat = st.checkbox("✅ Aktifkan Mode Hemat?", value=True)
-                c_h1, c_h2, c_h3 = st.columns(3)
-                Q_debit = c_h1.number_input("Debit Q (m3/s)", value=1.5)
-                H_total = c_h2.number_input("Total Tinggi (m)", value=3.0)
-                H_step = c_h3.number_input("Max Tinggi/Trap (m)", value=1.5)
-                c_d1, c_d2 = st.columns(2)
-                B_terjun = c_d1.number_input("Lebar Saluran B (m)", value=1.5)
-                qa_tanah = c_d2.number_input("Daya Dukung Tanah (kN/m2)", value=150.0)
-                t_lantai = st.number_input("Tebal Lantai (m)", value=0.25)
-                t_dinding = st.number_input("Tebal Dinding (m)", value=0.25)
-                calc = Calculator.hitung_terjunan_usbr(Q_debit, H_total, H_step, B_terjun, t_lantai, t_dinding, qa_tanah, mode_hemat, is_rehab)
-                st.divider()
-                st.write(f"**Analisa: {calc['info_struktur']}**")
-
-    if st.button("Simpan Item", type="primary"):
-        if not nama_item: st.warning("Isi Nama!")
-        else:
-            tipe_final = jenis_bang if kategori != "Saluran (Linear)" else ("Saluran Beton" if tipe_kons == "Beton Bertulang" else "Saluran Batu")
-            if is_rehab: nama_item += " (REHAB)"
-            item_data = {"nama": nama_item, "tipe": tipe_final, "panjang": 0, "vol": calc}
-            if kategori == "Saluran (Linear)": item_data["panjang"] = panjang
-            st.session_state['data_proyek'].append(item_data)
-            st.success("Tersimpan!")
-
-# === TAB 2 & 3 (LIST & RAB DETAIL) ===
-with tab2:
-    if st.session_state['data_proyek']:
-        st.dataframe(pd.DataFrame(st.session_state['data_proyek'])[["nama", "tipe"]])
-        if st.button("Hapus Semua"): st.session_state['data_proyek'] = []; st.rerun()
-
-with tab3:
-    st.header("📊 Detail Engineering Estimate (EE)")
-    if st.session_state['data_proyek']:
-        excel_rows = []
-        grand_total = 0
+        if st.button("Simpan Item", type="primary"):
+            if not nama_item: st.warning("Isi Nama!")
+            else:
+                tipe_final = jenis_bang if kategori != "Saluran (Linear)" else ("Saluran Beton" if tipe_kons == "Beton Bertulang" else "Saluran Batu")
+                if is_rehab: nama_item += " (REHAB)"
+                item_data = {"nama": nama_item, "tipe": tipe_final, "panjang": 0, "vol": calc, "dimensi": dimensi}
+                if kategori == "Saluran (Linear)": item_data["panjang"] = panjang
+                store.tambah(item_data)
+                st.success("Tersimpan!")
+
+        with st.expander("📏 Impor Potongan Memanjang (STA)"):
+            st.caption("CSV/Excel, 1 baris = penampang di 1 STA. Kolom: sta, h, b, m (+ t_cm, dia, jarak) untuk Saluran Beton; "
+                       "sta, h, l_atas, l_bawah, t_lantai untuk Saluran Batu. Opsional: tipe, ruas, is_rehab.")
+            file_sta = st.file_uploader("File Potongan Memanjang", type=["csv", "xlsx"], key="file_sta")
+            c_p1, c_p2, c_p3 = st.columns(3)
+            tipe_sta = c_p1.selectbox("Tipe (bila tidak ada kolom tipe)", ["Saluran Beton", "Saluran Batu"])
+            panjang_ruas = c_p2.number_input("Panjang per Ruas (m)", value=100.0, min_value=1.0, help="Dipakai bila tidak ada kolom ruas")
+            metode_sta = c_p3.radio("Rumus Volume", ["rata2", "prismoida"], format_func={"rata2": "Luas Ujung Rata-rata", "prismoida": "Prismoida"}.get)
+            nama_ruas = st.text_input("Awalan Nama Item", value="Ruas")
+            if file_sta and st.button("Impor STA"):
+                try:
+                    items_sta = impor_potongan_memanjang(file_sta, tipe_sta, panjang_ruas, metode_sta, nama_ruas, is_rehab)
+                except (KeyError, ValueError) as e: st.error(f"Gagal impor: {e}")
+                else:
+                    for item in items_sta: store.tambah(item)
+                    st.success(f"{len(items_sta)} ruas ditambahkan dari {file_sta.name}")
+
+        with st.expander("💧 Desain Hidrolis Otomatis (Manning)"):
+            st.caption("Per ruas: kedalaman normal dari Q, S, n → tinggi + jagaan, cek kecepatan & tebal struktur, "
+                       "lalu penampang (b, m, h, tebal) termurah dengan HSP aktif. Saluran Batu: b & m tetap, hanya h dicari.")
+            tipe_hidro = st.selectbox("Tipe Saluran", ["Saluran Beton", "Saluran Batu"], key="tipe_hidro")
+            file_ruas = st.file_uploader("File Ruas (CSV/Excel: nama, Q, S, panjang; opsional n, is_rehab)", type=["csv", "xlsx"], key="file_ruas")
+            if file_ruas is not None:
+                df_ruas = pd.read_excel(file_ruas) if file_ruas.name.endswith(".xlsx") else pd.read_csv(file_ruas)
+            else:
+                df_ruas = st.data_editor(pd.DataFrame({"nama": ["Ruas 1"], "Q": [1.5], "S": [0.001], "panjang": [100.0]}),
+                                         num_rows="dynamic", key="editor_ruas", use_container_width=True)
+            c_h1, c_h2, c_h3 = st.columns(3)
+            v_min_hidro = c_h1.number_input("V min (m/s)", value=V_MIN)
+            v_maks_hidro = c_h2.number_input("V maks (m/s)", value=V_MAKS[tipe_hidro])
+            h_maks_hidro = c_h3.number_input("H maks (m)", value=H_MAKS)
+            st.caption(f"n Manning default {N_MANNING[tipe_hidro]} (kolom n menimpa per ruas)")
+            if st.button("🔍 Cari Penampang Termurah"):
+                try:
+                    hasil_hidro = desain_saluran(df_ruas.dropna(subset=["Q", "S", "panjang"]), tipe_hidro, tabel_hsp, v_min_hidro, v_maks_hidro, h_maks_hidro)
+                except (KeyError, ValueError) as e: st.error(f"Gagal: {e}")
+                else: st.session_state['desain_hidrolis'] = (tipe_hidro, hasil_hidro)
+            if 'desain_hidrolis' in st.session_state:
+                tipe_desain, hasil_hidro = st.session_state['desain_hidrolis']
+                n_ok = int((hasil_hidro["biaya"].notna()).sum())
+                st.write(f"**{tipe_desain}: {n_ok} dari {len(hasil_hidro)} ruas punya penampang layak**")
+                st.dataframe(hasil_hidro.style.format({"Q": "{:.3f}", "S": "{:.5f}", "panjang": "{:,.1f}", "b": "{:.2f}", "m": "{:.2f}", "h": "{:.2f}", "t_cm": "{:.0f}",
+                                                       "y_normal": "{:.3f}", "jagaan": "{:.2f}", "v": "{:.2f}", "biaya": "{:,.0f}", "biaya_per_m": "{:,.0f}"}, na_rep="-"),
+                             hide_index=True, use_container_width=True)
+                if n_ok and st.button("➕ Tambahkan Ruas OK ke Proyek"):
+                    items_hidro = segmen_ke_items(desain_ke_segmen(hasil_hidro, tipe_desain))
+                    for item in items_hidro: store.tambah(item)
+                    del st.session_state['desain_hidrolis']
+                    st.success(f"{len(items_hidro)} ruas ditambahkan")
+
+    # === TAB 2 & 3 (LIST & RAB DETAIL) ===
+    profil.tahap("tab2_list")
+    with tab2:
+        if store:
+            c_f1, c_f2 = st.columns(2)
+            filter_tipe = c_f1.multiselect("Filter Tipe", store.tipe(), key="filter_tipe_list")
+            cari_nama = c_f2.text_input("Cari Nama")
+            ids_tampil = store.ids(filter_tipe or None, cari_nama)
+            posisi = store.posisi()
+            daftar = {i: store.ambil(i) for i in ids_tampil}
+            st.dataframe(pd.DataFrame(
+                [{"ID": i, "No": posisi[i], "nama": item['nama'], "tipe": item['tipe'], "panjang": item['panjang']} for i, item in daftar.items()],
+                columns=["ID", "No", "nama", "tipe", "panjang"]), hide_index=True)
+            st.caption(f"{len(ids_tampil)} dari {len(store)} item")
+
+            with st.expander("✏️ Edit / Hapus Item"):
+                if daftar:
+                    pilih_id = st.selectbox("Item", ids_tampil, format_func=lambda i: f"{posisi[i]}. {daftar[i]['nama']} ({daftar[i]['tipe']})")
+                    item = daftar[pilih_id]
+                    dimensi = item.get('dimensi')
+                    nama_dasar = item['nama'].removesuffix(" (REHAB)")
+                    nama_baru = st.text_input("Nama", nama_dasar if dimensi else item['nama'], key=f"edit_nama_{pilih_id}")
+                    if dimensi:
+                        rehab_baru = st.checkbox("Rehabilitasi (Bongkar)", item['nama'] != nama_dasar, key=f"edit_rehab_{pilih_id}")
+                        kolom = st.columns(4)
+                        dimensi_baru = {
+                            k: kolom[n % 4].checkbox(k, v, key=f"edit_{k}_{pilih_id}") if isinstance(v, bool)
+                            else kolom[n % 4].number_input(k, value=float(v), key=f"edit_{k}_{pilih_id}")
+                            for n, (k, v) in enumerate(dimensi.items())
+                        }
+                    else:
+                        st.caption("Item tanpa data dimensi (file versi lama): hanya nama yang bisa diubah.")
+                    c_e1, c_e2 = st.columns(2)
+                    if c_e1.button("💾 Simpan Perubahan"):
+                        item_baru = item_dari_dimensi(nama_baru, item['tipe'], dimensi_baru, rehab_baru) if dimensi else {**item, "nama": nama_baru}
+                        store.ubah(pilih_id, item_baru); st.rerun()
+                    if c_e2.button("🗑️ Hapus Item"): store.hapus(pilih_id); st.rerun()
+
+            if st.button("Hapus Semua"): store.kosongkan(); st.rerun()
+
+            st.markdown("#### 🔍 Validasi Otomatis")
+            temuan = per_versi('validasi', (), lambda: validasi_proyek(data_proyek()))
+            if temuan.empty:
+                st.success("Semua item lolos validasi.")
+            else:
+                kritis = (temuan["Tingkat"] == "⛔ KRITIS").sum()
+                c1, c2 = st.columns(2)
+                c1.metric("Temuan Kritis", int(kritis))
+                c2.metric("Peringatan", int(len(temuan) - kritis))
+                st.dataframe(temuan, hide_index=True, use_container_width=True)
+
+    profil.tahap("tab3_rab")
+    with tab3:
+        st.header("📊 Detail Engineering Estimate (EE)")
+        if store:
+            tipe_tampil = st.multiselect("Tampilkan Tipe", store.tipe(), key="filter_tipe_rab", help="Kosong = semua. Total & Excel tetap mencakup seluruh item.")
+            ids_tampil = store.ids(tipe_tampil or None)
         
-        map_pekerjaan = {
-            "vol_bongkaran": ("Bongkaran Pasangan Eksisting", "m3", "T.15.a", hsp_bongkaran),
-            "vol_galian": ("Galian Tanah Biasa", "m3", "T.06.a.1", hsp_galian),
-            "vol_timbunan": ("Timbunan Kembali Dipadatkan", "m3", "T.14.a", hsp_timbunan),
-            "vol_beton": ("Beton K-225 (Struktur)", "m3", "B.05.a", hsp_beton),
-            "vol_batu": ("Pasangan Batu Kali 1:4", "m3", "P.01.a", hsp_batu),
-            "berat_besi": ("Pembesian Ulir/Polos", "kg", "B.17.a", hsp_besi),
-            "luas_bekisting": ("Pasang Bekisting", "m2", "B.20.a", hsp_bekisting),
-            "luas_plester": ("Plesteran 1:3 + Acian", "m2", "P.04.e", hsp_plester),
-            "luas_siaran": ("Siaran 1:2", "m2", "P.05.a", hsp_siaran),
-        }
-
-        for i, item in enumerate(st.session_state['data_proyek']):
-            nama = item['nama']
-            vol_data = item['vol']
-            
-            with st.expander(f"📍 {i+1}. {nama} ({item['tipe']})", expanded=True):
-                item_rows = []
-                for key, val in vol_data.items():
-                    if key in map_pekerjaan and val > 0.001:
-                        uraian, sat, kode_ahsp, harga = map_pekerjaan[key]
-                        jumlah = val * harga
-                        item_rows.append({"Kode": kode_ahsp, "Uraian": uraian, "Vol": val, "Sat": sat, "H.Sat": harga, "Total": jumlah})
-                        excel_rows.append({"No": i+1, "Item": nama, "Kode": kode_ahsp, "Uraian": uraian, "Vol": val, "Sat": sat, "H.Sat": harga, "Total": jumlah})
-                
-                df_item = pd.DataFrame(item_rows)
-                if not df_item.empty:
-                    subtotal = df_item["Total"].sum()
-                    grand_total += subtotal
-                    st.dataframe(df_item.style.format({"Vol": "{:.3f}", "H.Sat": "{:,.0f}", "Total": "{:,.0f}"}), use_container_width=True)
-                    st.markdown(f"**Subtotal: Rp {subtotal:,.0f}**")
-
-        st.divider()
-        ppn = grand_total * 0.11 # Tarif PPN 11%
-        st.success(f"### Total Akhir: Rp {grand_total + ppn:,.0f} (Termasuk PPN 11%)")
+            # Baris RAB per item disimpan di RABInkremental: hanya item baru/berubah (dan item yang terdampak
+            # perubahan harga, lihat set_harga di sidebar) yang dihitung ulang.
+            rab_ink.sinkron(store)
+
+            # Hanya item di halaman aktif yang digambar (expander + tabel), jadi rerun O(halaman), bukan O(item)
+            c_n1, c_n2 = st.columns(2)
+            per_hal = c_n1.selectbox("Item / Halaman", [10, 25, 50, 100], index=1, key="rab_per_hal")
+            n_hal = max(1, math.ceil(len(ids_tampil) / per_hal))
+            hal = c_n2.number_input(f"Halaman (dari {n_hal})", min_value=1, max_value=n_hal, value=1)
+            halaman = ids_tampil[(hal-1) * per_hal:hal * per_hal]
+            if halaman: st.caption(f"Menampilkan item {(hal-1) * per_hal + 1}–{(hal-1) * per_hal + len(halaman)} dari {len(ids_tampil)}")
+            posisi = store.posisi()
+            for item_id in halaman:
+                item = store.ambil(item_id)
+                item_rows, subtotal = rab_ink.hasil[item_id]
+                with st.expander(f"📍 {posisi[item_id]}. {item['nama']} ({item['tipe']}) — Rp {subtotal:,.0f}"):
+                    if item_rows:
+                        st.dataframe(rab_ink.tampilan(item_id), use_container_width=True)
+                        st.markdown(f"**Subtotal: Rp {subtotal:,.0f}**")
+
+            st.divider()
+            grand_total = rab_ink.grand_total()
+            ppn = grand_total * TARIF_PPN
+            st.success(f"### Total Akhir: Rp {grand_total + ppn:,.0f} (Termasuk PPN {TARIF_PPN:.0%})")
         
-        def generate_excel():
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                pd.DataFrame(excel_rows).to_excel(writer, index=False, sheet_name='RAB Detail')
-            return output.getvalue()
-        st.download_button("📥 Download RAB Excel", generate_excel(), "RAB_V12_Bengkulu.xlsx")
-
-# === TAB 4: FORMULIR ANALISA HARGA (FITUR BARU) ===
-with tab4:
-    st.header("📑 Rincian Analisa Harga Satuan (AHSP)")
-    st.caption("Format Standar Formulir Analisa Harga Satuan - Bidang SDA")
+            # Excel dibangun hanya saat tombol diklik (callable), di-cache per versi store + harga
+            # (versi unik per proses, jadi aman sebagai kunci cache_data lintas sesi)
+            kunci_unduh = (store.versi, *kunci_harga)
+            def generate_excel():
+                excel_rows = [{"No": i, "Item": rec.nama, **row} for i, (item_id, rec) in enumerate(store.records(), 1) for row in rab_ink.hasil[item_id][0]]
+                return buat_excel_rab(kunci_unduh, excel_rows, data_proyek(), prices_bengkulu, overhead)
+            col_xlsx, col_pdf = st.columns(2)
+            col_xlsx.download_button("📥 Download RAB Excel", generate_excel, "RAB_V12_Bengkulu.xlsx")
+            # Laporan resmi tanpa Ctrl + P: halaman A4 ditata di server, aman untuk ribuan halaman
+            col_pdf.download_button("🖨️ Download Laporan Cetak (PDF)", lambda: buat_laporan_pdf(kunci_unduh, data_proyek(), prices_bengkulu, overhead),
+                                    "Laporan_RAB_V12_Bengkulu.pdf", "application/pdf")
+
+            with st.expander("🕸️ Dependensi Harga → AHSP → Item"):
+                terakhir = rab_ink.terakhir
+                st.caption(f"Rerun ini: {len(terakhir['kunci_harga'])} kunci harga berubah → {terakhir['kode']} HSP & "
+                           f"{terakhir['item']} item dihitung ulang; {terakhir['item_baru']} item baru/berubah")
+                kunci_cek = st.multiselect("Jika harga ini berubah...", list(rab_ink.graf.harga_ke_kode), key="kunci_dependensi")
+                if kunci_cek:
+                    terdampak = rab_ink.graf.item_terdampak(kunci_cek)
+                    st.dataframe(rab_ink.graf.jalur(kunci_cek), hide_index=True, use_container_width=True)
+                    st.markdown(f"**{len(terdampak)} dari {len(store)} item terdampak**")
+                    posisi_rab = store.posisi()
+                    st.dataframe(pd.DataFrame([{"No": posisi_rab[i], "Item": store.ambil(i)['nama'], "Subtotal": rab_ink.hasil[i][1]} for i in terdampak],
+                                              columns=["No", "Item", "Subtotal"]).style.format({"Subtotal": "{:,.0f}"}), hide_index=True, use_container_width=True)
+
+            with st.expander("🎲 Analisa Risiko Biaya (Monte Carlo)"):
+                st.caption("Faktor acak segitiga (Bawah %, mode 0 = nilai RAB, Atas %) per kunci harga & volume; volume berlaku sistematis seluruh proyek")
+                tabel_risiko = st.data_editor(tabel_ketidakpastian(), key="tabel_risiko", hide_index=True, use_container_width=True, disabled=["Jenis", "Kunci", "Uraian"])
+                c_r1, c_r2 = st.columns(2)
+                n_sampel = c_r1.number_input("Jumlah Sampel", value=N_SAMPEL_DEFAULT, min_value=1000, max_value=2_000_000, step=10_000)
+                seed_risiko = c_r2.number_input("Seed", value=0, min_value=0)
+                kunci_risiko = (store.versi, *kunci_harga)
+                if st.button("🎲 Jalankan Simulasi"):
+                    st.session_state['hasil_risiko'] = (kunci_risiko, simulasi_risiko(data_proyek(), prices_bengkulu, overhead, tabel_risiko, int(n_sampel), int(seed_risiko)))
+                if 'hasil_risiko' in st.session_state:
+                    kunci_lama, risiko = st.session_state['hasil_risiko']
+                    if kunci_lama != kunci_risiko: st.warning("⚠️ Item / harga sudah berubah sejak simulasi terakhir. Jalankan ulang.")
+                    p_risiko = risiko['persentil'].set_index("Ukuran")["Total Akhir (Rp)"]
+                    c_p50, c_p80, c_p90 = st.columns(3)
+                    for kol, p in zip((c_p50, c_p80, c_p90), ("P50", "P80", "P90")):
+                        kol.metric(p, f"Rp {p_risiko[p]:,.0f}", f"{(p_risiko[p] / risiko['dasar'] - 1) * 100:+.1f}% vs RAB", delta_color="inverse")
+                    st.caption(f"{len(risiko['sampel']):,} sampel dalam {risiko['detik']:.2f} detik. Cadangan risiko P80 = Rp {p_risiko['P80'] - risiko['dasar']:,.0f}")
+                    st.bar_chart(histogram_risiko(risiko['sampel'])["Frekuensi"])
+                    st.markdown("**Pemicu Biaya Dominan**")
+                    st.dataframe(risiko['pemicu'].style.format({"Spearman": "{:.3f}", "Kontribusi Varian (%)": "{:.1f}", "Total @P10 Faktor": "{:,.0f}", "Total @P90 Faktor": "{:,.0f}", "Ayunan (Rp)": "{:,.0f}"}), hide_index=True, use_container_width=True)
+
+    # === TAB 4: FORMULIR ANALISA HARGA (FITUR BARU) ===
+    profil.tahap("tab4_ahsp")
+    with tab4:
+        st.header("📑 Rincian Analisa Harga Satuan (AHSP)")
+        st.caption("Format Standar Formulir Analisa Harga Satuan - Bidang SDA")
     
-    # List Kode AHSP yang digunakan
-    list_kode = [
-        "T.06.a.1", "T.14.a", "T.15.a", "P.01.a", 
-        "P.04.e", "P.05.a", "B.05.a", "B.17.a", "B.20.a"
-    ]
+        # List Kode AHSP yang digunakan
+        list_kode = AHSP_Engine.KODE
     
-    selected_ahsp = st.selectbox("Pilih Analisa:", list_kode)
+        selected_ahsp = st.selectbox("Pilih Analisa:", list_kode)
     
-    # Get Detail
-    detail_ahsp = AHSP_Engine.get_analisa_detail(selected_ahsp, prices_bengkulu)
+        # Get Detail (Formulir Standar)
+        formulir = AHSP_Engine.get_formulir(selected_ahsp, prices_bengkulu, overhead)
     
-    st.subheader(f"Analisa: {detail_ahsp['uraian']}")
-    st.text(f"Kode: {detail_ahsp['kode']}")
+        st.subheader(f"Analisa: {formulir['uraian']}")
+        st.text(f"Kode: {formulir['kode']}")
     
-    # Buat Tampilan Formulir Standar
-    data_form = []
-    total_upah = 0
-    total_bahan = 0
+        df_form = pd.DataFrame(formulir['rows'])
     
-    # Proses Data
-    for uraian, koef, harga in detail_ahsp['items']:
-        jumlah = koef * harga
-        kategori_item = "Upah" if "Pekerja" in uraian or "Tukang" in uraian or "Mandor" in uraian else "Bahan"
-        
-        if kategori_item == "Upah": total_upah += jumlah
-        else: total_bahan += jumlah
-            
-        data_form.append({
-            "Uraian": uraian,
-            "Koefisien": koef,
-            "Satuan": "OH" if kategori_item == "Upah" else ("kg" if "Semen" in uraian or "Besi" in uraian else "m3"),
-            "Harga Satuan (Rp)": harga,
-            "Jumlah Harga (Rp)": jumlah,
-            "Kategori": kategori_item
-        })
+        # Tampilkan Tabel
+        st.table(df_form.style.format({
+            "Koefisien": "{:.4f}", 
+            "Harga Satuan (Rp)": "{:,.2f}", 
+            "Jumlah Harga (Rp)": "{:,.2f}"
+        }))
     
-    df_form = pd.DataFrame(data_form)
+        # Rekap Bawah
+        total_upah, total_bahan = formulir['total_upah'], formulir['total_bahan']
+        jum_dasar, ovr_val, jum_final = formulir['jum_dasar'], formulir['ovr_val'], formulir['jum_final']
     
-    # Tampilkan Tabel
-    st.table(df_form.style.format({
-        "Koefisien": "{:.4f}", 
-        "Harga Satuan (Rp)": "{:,.2f}", 
-        "Jumlah Harga (Rp)": "{:,.2f}"
-    }))
+        c_f1, c_f2 = st.columns([3, 1])
+        with c_f2:
+            st.markdown(f"""
+            | Komponen | Nilai (Rp) |
+            | :--- | :--- |
+            | **A. Tenaga** | **{total_upah:,.2f}** |
+            | **B. Bahan** | **{total_bahan:,.2f}** |
+            | **C. Jumlah (A+B)** | **{jum_dasar:,.2f}** |
+            | **D. Overhead ({overhead}%)** | **{ovr_val:,.2f}** |
+            | **E. Harga Satuan** | **{jum_final:,.2f}** |
+            """)
+
+    # === TAB 5: SKENARIO HARGA (SENSITIVITAS) ===
+    profil.tahap("tab5_skenario")
+    with tab5:
+        st.header("📈 Analisa Sensitivitas Skenario Harga")
+        st.caption("Semua skenario (tahun / wilayah / eskalasi) dihitung sekaligus: Volume Proyek x Koefisien AHSP x Harga")
     
-    # Rekap Bawah
-    jum_dasar = total_upah + total_bahan
-    ovr_val = jum_dasar * (overhead/100)
-    jum_final = jum_dasar + ovr_val
+        if not store:
+            st.warning("Belum ada data. Silakan input di Tab 1.")
+        else:
+            sumber = st.radio("Sumber Skenario", ["Eskalasi ±% Harga Sidebar", "Upload File (CSV/Excel)"], horizontal=True)
+            df_skenario = None
+            if sumber.startswith("Eskalasi"):
+                c_e1, c_e2, c_e3 = st.columns(3)
+                e_min = c_e1.number_input("Eskalasi Min (%)", value=-10.0)
+                e_max = c_e2.number_input("Eskalasi Max (%)", value=10.0)
+                e_step = c_e3.number_input("Langkah (%)", value=5.0, min_value=0.1)
+                persen = [round(e_min + i*e_step, 4) for i in range(int((e_max - e_min) / e_step + 1e-9) + 1)]
+                df_skenario = skenario_eskalasi(prices_bengkulu, persen)
+            else:
+                file_skenario = st.file_uploader("File Skenario", type=["csv", "xlsx"], help="Kolom 1 = nama skenario, kolom lain = kunci harga (u_pekerja, p_semen, ...) & opsional 'overhead'. Kunci kosong = harga sidebar.")
+                if file_skenario: df_skenario = muat_skenario(file_skenario, prices_bengkulu)
+        
+            if df_skenario is not None and len(df_skenario):
+                # Matriks skenario x item dihitung ulang hanya bila item, harga sidebar atau tabel skenario berubah
+                hasil_skenario = per_versi('skenario', (*kunci_harga, df_skenario.to_csv()),
+                                           lambda: hitung_skenario(data_proyek(), df_skenario, overhead, prices_bengkulu))
+                st.subheader(f"Perbandingan {len(df_skenario)} Skenario")
+                st.dataframe(hasil_skenario['total'].style.format({"Jumlah": "{:,.0f}", "PPN": "{:,.0f}", "Total Akhir": "{:,.0f}", "Selisih vs Harga Dasar (%)": "{:+.2f}"}), use_container_width=True)
+                st.bar_chart(hasil_skenario['total']["Total Akhir"])
+                with st.expander("Harga Satuan Pekerjaan per Skenario"):
+                    st.dataframe(hasil_skenario['hsp'].style.format("{:,.0f}"), use_container_width=True)
+                with st.expander("Subtotal per Item per Skenario"):
+                    st.dataframe(hasil_skenario['subtotal'].style.format("{:,.0f}"), use_container_width=True)
+                st.download_button("📥 Download Skenario (Excel)", lambda: ekspor_skenario_excel(hasil_skenario, df_skenario), "Skenario_Harga_RAB.xlsx")
+
+    # === TAB 6: REKAP SUMBER DAYA (BAHAN & TENAGA) ===
+    profil.tahap("tab6_sumber_daya")
+    with tab6:
+        st.header("🧱 Rekap Kebutuhan Sumber Daya")
+        st.caption("Kuantitas seluruh item x Koefisien AHSP: total bahan (Semen, Besi, ...) & tenaga (OH) untuk pengadaan dan rencana tenaga kerja")
     
-    c_f1, c_f2 = st.columns([3, 1])
-    with c_f2:
-        st.markdown(f"""
-        | Komponen | Nilai (Rp) |
-        | :--- | :--- |
-        | **A. Tenaga** | **{total_upah:,.2f}** |
-        | **B. Bahan** | **{total_bahan:,.2f}** |
-        | **C. Jumlah (A+B)** | **{jum_dasar:,.2f}** |
-        | **D. Overhead ({overhead}%)** | **{ovr_val:,.2f}** |
-        | **E. Harga Satuan** | **{jum_final:,.2f}** |
-        """)
+        if not store:
+            st.warning("Belum ada data. Silakan input di Tab 1.")
+        else:
+            hasil_sd = per_versi('sumber_daya', kunci_harga, lambda: hitung_sumber_daya(data_proyek(), prices_bengkulu))
+            df_sd = hasil_sd['total']
+            c_s1, c_s2, c_s3 = st.columns(3)
+            kuantitas_sd = df_sd.set_index("Sumber Daya")["Kuantitas"]
+            c_s1.metric("Semen (PC)", f"{kuantitas_sd.get('Semen (PC)', 0) / 50:,.0f} sak", f"{kuantitas_sd.get('Semen (PC)', 0):,.0f} kg", delta_color="off")
+            c_s2.metric("Besi Beton", f"{kuantitas_sd.get('Besi Beton', 0) / 1000:,.2f} ton", delta_color="off")
+            c_s3.metric("Total Tenaga", f"{df_sd.loc[df_sd['Kategori'] == 'Upah', 'Kuantitas'].sum():,.0f} OH")
+            st.dataframe(df_sd.style.format({"Kuantitas": "{:,.2f}", "Harga Satuan (Rp)": "{:,.0f}", "Jumlah Harga (Rp)": "{:,.0f}"}), hide_index=True, use_container_width=True)
+            st.caption("Jumlah Harga = kuantitas x harga dasar (sebelum Overhead & PPN)")
+            with st.expander("Sumber Daya per Kode AHSP"):
+                st.dataframe(hasil_sd['per_kode'].style.format("{:,.2f}"), use_container_width=True)
+            with st.expander("Sumber Daya per Item"):
+                st.dataframe(hasil_sd['per_item'].style.format("{:,.2f}"), use_container_width=True)
+            st.download_button("📥 Download Rekap Sumber Daya (Excel)", lambda: ekspor_sumber_daya_excel(hasil_sd), "Rekap_Sumber_Daya_RAB.xlsx")
+
+    # === TAB 7: JADWAL PEMBESIAN (BBS) & OPTIMASI POTONG ===
+    profil.tahap("tab7_jadwal_besi")
+    with tab7:
+        st.header("🔩 Jadwal Pembesian & Optimasi Potong")
+        st.caption("Bar mark, panjang potong & jumlah batang dari dimensi item (dia, jarak, lapis), lalu dipotong dari besi stok dengan Best Fit Decreasing")
+
+        c_b1, c_b2 = st.columns(2)
+        panjang_stok = c_b1.number_input("Panjang Besi Stok (m)", value=PANJANG_STOK, min_value=6.0, max_value=18.0, step=0.5)
+        kerf = c_b2.number_input("Tebal Potong / Kerf (mm)", value=0, min_value=0, max_value=20)
+
+        def hitung_jadwal_besi():
+            bbs = buat_bbs(data_proyek(), panjang_stok)
+            if bbs.empty: return bbs, None, 0
+            berat_rab = sum(item['vol'].get('berat_besi', 0) for item in data_proyek() if item.get('dimensi'))
+            return bbs, optimasi_potong(bbs, panjang_stok, kerf), berat_rab
+        # BBS (sekali, dengan panjang stok terpilih) & pola potong dihitung ulang hanya bila item, stok atau kerf berubah
+        bbs, hasil_potong, berat_rab = per_versi('jadwal_besi', (panjang_stok, kerf), hitung_jadwal_besi)
+        if bbs.empty:
+            st.warning("Belum ada item Saluran Beton / Gorong-Gorong Box dengan data dimensi (item lama / impor STA tidak menyimpan dimensi).")
+        else:
+            ringkasan_potong = hasil_potong['ringkasan']
+            berat_stok = ringkasan_potong["Berat Stok (kg)"].sum()
+            c_m1, c_m2, c_m3, c_m4 = st.columns(4)
+            c_m1.metric("Batang Stok", f"{ringkasan_potong['Batang Stok'].sum():,}")
+            c_m2.metric("Berat Bersih (BBS)", f"{bbs['Berat (kg)'].sum() / 1000:,.2f} ton")
+            c_m3.metric("Berat Stok Dibeli", f"{berat_stok / 1000:,.2f} ton")
+            c_m4.metric("Waste Potong", f"{(1 - ringkasan_potong['Panjang Terpakai (m)'].sum() / ringkasan_potong['Panjang Stok (m)'].sum()) * 100:,.2f} %")
+            st.caption(f"Pembanding: berat besi di RAB (asumsi faktor 1.2 + waste) untuk item yang sama = {berat_rab / 1000:,.2f} ton")
+
+            st.dataframe(ringkasan_potong.style.format({"Panjang Stok (m)": "{:,.2f}", "Panjang Terpakai (m)": "{:,.2f}", "Sisa Potong (m)": "{:,.2f}", "Waste (%)": "{:.2f}", "Berat Stok (kg)": "{:,.1f}"}), hide_index=True, use_container_width=True)
+            with st.expander("✂️ Pola Potong per Batang Stok"):
+                st.dataframe(hasil_potong['pola'], hide_index=True, use_container_width=True)
+            with st.expander("📋 Bar Bending Schedule (per Item)"):
+                st.dataframe(bbs.style.format({"Panjang Potong (m)": "{:.3f}", "Jumlah": "{:,.0f}", "Panjang Total (m)": "{:,.2f}", "Berat (kg)": "{:,.2f}"}), hide_index=True, use_container_width=True)
+            st.download_button("📥 Download Jadwal Besi (Excel)", lambda: ekspor_bbs_excel(bbs, hasil_potong), "Jadwal_Besi_BBS.xlsx")
+
+    # === TAB 8: PORTOFOLIO MULTI-PROYEK ===
+    profil.tahap("tab8_portofolio")
+    with tab8:
+        st.header("🗂️ Portofolio Multi-Proyek")
+        st.caption("Banyak file proyek dimuat paralel & dihitung dengan harga sidebar yang sama (data proyek aktif tidak diganti)")
+        files_porto = st.file_uploader("Upload File Proyek", type=["json", "rabdb", "csv"], accept_multiple_files=True, key="file_porto")
+        # Folder server hanya di bawah RAB_FOLDER_PROYEK (tanpa env: upload saja, folder bebas lewat CLI)
+        folder_porto = st.text_input(f"atau Subfolder di {FOLDER_PROYEK}", placeholder="mis. paket_sda_2025",
+                                     help="Semua .json / .rabdb / .csv di folder (tidak rekursif); kosong = folder akar") if FOLDER_PROYEK else None
+        if st.button("🚀 Muat & Hitung Portofolio", type="primary"):
+            sumber_porto = [(f.name, f.getvalue()) for f in files_porto or []]
+            if folder_porto is not None and (folder_porto or not sumber_porto):
+                try: sumber_porto.append(folder_di_akar(folder_porto))
+                except ValueError as e: st.error(f"❌ {e}")
+            if sumber_porto:
+                with st.spinner("Menghitung portofolio..."):
+                    st.session_state['portofolio'] = muat_portofolio(sumber_porto, prices_bengkulu, overhead)
+            else: st.warning("Pilih file atau folder proyek dulu.")
+
+        porto = st.session_state.get('portofolio')
+        if porto:
+            for nama_gagal, pesan in porto['gagal']: st.error(f"❌ {nama_gagal}: {pesan}")
+        if porto and not porto['proyek'].empty:
+            df_porto = porto['proyek']
+            c_p1, c_p2, c_p3 = st.columns(3)
+            c_p1.metric("Jumlah Proyek", len(df_porto))
+            c_p2.metric("Total Portofolio (+PPN)", f"Rp {df_porto['total_akhir'].sum():,.0f}")
+            c_p3.metric("Total Panjang Saluran", f"{df_porto['panjang'].sum():,.0f} m")
+            st.subheader("Rekap per Proyek")
+            st.caption("biaya_per_m = biaya saluran / panjang saluran; biaya bangunan (Box, Terjunan) ada di jumlah, tidak di Rp/m")
+            st.dataframe(df_porto.style.format({"panjang": "{:,.1f}", "jumlah": "{:,.0f}", "biaya_saluran": "{:,.0f}", "total_akhir": "{:,.0f}", "biaya_per_m": "{:,.0f}"}, na_rep="-"), hide_index=True, use_container_width=True)
+            st.subheader("Biaya Satuan per Tipe (Rp/m Saluran, Rp/bh Bangunan)")
+            st.caption("proyek_* = sebaran biaya satuan antar proyek; item_* = sebaran antar item seluruh portofolio. CV tinggi = harga satuan tidak konsisten")
+            st.dataframe(porto['sebaran'].style.format("{:,.0f}", subset=porto['sebaran'].select_dtypes("number").columns, na_rep="-"), hide_index=True, use_container_width=True)
+            with st.expander("Proyek x Tipe"):
+                st.dataframe(porto['per_tipe'].style.format({"panjang": "{:,.1f}", "biaya": "{:,.0f}", "biaya_satuan": "{:,.0f}"}), hide_index=True, use_container_width=True)
+            with st.expander("🧱 Total Sumber Daya Portofolio"):
+                st.dataframe(porto['sumber_daya'].style.format({"Kuantitas": "{:,.2f}"}), hide_index=True, use_container_width=True)
+            st.download_button("📥 Download Rekap Portofolio (Excel)", lambda: ekspor_portofolio_excel(porto), "Rekap_Portofolio_RAB.xlsx")
+
+    # === TAB 9: JADWAL PELAKSANAAN & KURVA S ===
+    profil.tahap("tab9_kurva_s")
+    with tab9:
+        st.header("📉 Jadwal Pelaksanaan & Kurva S")
+        st.caption("Durasi item = OH tenaga AHSP (Pekerja, Tukang, Mandor) / orang per regu; jumlah regu paralel dibatasi kapasitas tenaga lapangan")
+
+        if not store:
+            st.warning("Belum ada data. Silakan input di Tab 1.")
+        else:
+            c_j1, c_j2, c_j3, c_j4 = st.columns(4)
+            mode_jadwal = c_j1.selectbox("Ketergantungan", MODE_PENDAHULU, key="mode_jadwal", help="Paralel: item bebas mulai bila ada regu kosong. Berurutan per Tipe: item menunggu item sebelumnya yang bertipe sama.")
+            hari_minggu = c_j1.number_input("Hari Kerja / Minggu", min_value=5, max_value=7, value=HARI_KERJA_MINGGU)
+            regu_input, kapasitas_input = {}, {}
+            for kolom, k in zip((c_j2, c_j3, c_j4), KELOMPOK_TENAGA):
+                regu_input[k] = kolom.number_input(f"{k} per Regu (org)", min_value=0, value=REGU_DEFAULT[k], key=f"regu_{k}")
+                kapasitas_input[k] = kolom.number_input(f"Kapasitas {k} (org/hari)", min_value=1, value=KAPASITAS_DEFAULT[k], key=f"kapasitas_{k}")
+            with st.expander("🔗 Ketergantungan Manual (tambahan)"):
+                st.caption("Isi No item & No pendahulunya (pisah koma), mis. No 5, Pendahulu 2, 3: item 5 baru mulai setelah item 2 & 3 selesai")
+                df_dep = st.data_editor(pd.DataFrame({"No": pd.Series(dtype="Int64"), "Pendahulu": pd.Series(dtype="str")}), num_rows="dynamic", hide_index=True, key="editor_pendahulu")
+
+            def hitung_jadwal():
+                # Biaya per item dari RABInkremental (sama dengan Tab 3)
+                rab_ink.sinkron(store)
+                biaya_item = [rab_ink.hasil[i][1] for i in store.ids()]
+                pendahulu = pendahulu_otomatis(data_proyek(), mode_jadwal)
+                for no, teks in zip(df_dep["No"], df_dep["Pendahulu"]):
+                    if pd.isna(no): continue
+                    if not 1 <= int(no) <= len(pendahulu): raise ValueError(f"No item {no} tidak ada (1-{len(pendahulu)})")
+                    pendahulu[int(no) - 1] += pendahulu_dari_teks(teks)
+                return susun_jadwal(data_proyek(), tabel_hsp, pendahulu, regu_input, kapasitas_input, biaya_item, hari_minggu)
+            # Jadwal disusun ulang hanya bila item, harga, regu/kapasitas atau ketergantungan berubah (input salah tidak di-cache)
+            kunci_jadwal = (*kunci_harga, mode_jadwal, hari_minggu, tuple(regu_input.values()), tuple(kapasitas_input.values()), df_dep.to_csv())
+            try:
+                hasil_jadwal = per_versi('kurva_s', kunci_jadwal, hitung_jadwal)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                hasil_jadwal = None
+
+            if hasil_jadwal:
+                mingguan = hasil_jadwal['mingguan']
+                c_k1, c_k2, c_k3, c_k4 = st.columns(4)
+                c_k1.metric("Durasi", f"{hasil_jadwal['durasi_minggu']:,} minggu", f"{hasil_jadwal['durasi_hari']:,} hari kerja", delta_color="off")
+                c_k2.metric("Regu Paralel", hasil_jadwal['regu'])
+                c_k3.metric("Puncak Pekerja", f"{mingguan['Pekerja Maks (org/hari)'].max():,.0f} org/hari")
+                c_k4.metric("Bobot Mingguan Maks", f"{mingguan['Bobot (%)'].max():.2f} %")
+                st.subheader("Kurva S (Kumulatif %)")
+                st.line_chart(mingguan.set_index("Minggu")["Kumulatif (%)"])
+                st.subheader("Bobot per Minggu (%)")
+                st.bar_chart(mingguan.set_index("Minggu")["Bobot (%)"])
+                with st.expander("📅 Tabel Mingguan (Biaya, Bobot & Tenaga)"):
+                    st.dataframe(mingguan.style.format("{:,.2f}", subset=mingguan.columns[1:]), hide_index=True, use_container_width=True)
+                with st.expander("🗓️ Jadwal per Item"):
+                    st.dataframe(hasil_jadwal['jadwal'].style.format({"Biaya (Rp)": "{:,.0f}", "Pekerja (OH)": "{:,.2f}", "Tukang (OH)": "{:,.2f}", "Mandor (OH)": "{:,.2f}"}), hide_index=True, use_container_width=True)
+                st.download_button("📥 Download Kurva S (Excel)", lambda: ekspor_kurva_s_excel(hasil_jadwal), "Kurva_S_RAB.xlsx")
+
+    # === TAB 10: BACK-UP VOLUME (BoQ) & ASISTEN VALIDASI ===
+    profil.tahap("tab10_boq")
+    with tab10:
+        # Urutan lazy: hanya item di halaman aktif yang dibangun; list penuh hanya saat AI dipanggil
+        render_boq_tab(store.urutan())
+
+finally:
+    # Juga saat rerun terpotong (st.rerun / error): cProfile & tracemalloc selalu dilepas
+    profil.selesai(len(st.session_state.get('store', ())))
+
+# === PANEL DEBUG: PROFIL RERUN ===
+with st.sidebar.expander("🐞 Debug: Profil Rerun"):
+    st.checkbox("Catat waktu & memori per tahap", key="debug_profil", help="Berlaku mulai rerun berikutnya. Env RAB_PROFIL_CSV=path untuk menulis CSV.")
+    if profil.aktif:
+        riwayat = st.session_state.setdefault('riwayat_profil', [])
+        riwayat.extend(profil.hasil)
+        del riwayat[:-2000] # Batasi riwayat per sesi
+        st.caption(f"Rerun terakhir: {profil.total_detik()*1000:,.1f} ms, {len(store)} item")
+        st.dataframe(profil.tabel().style.format({"detik": "{:.4f}", "persen": "{:.1f}", "alokasi_kb": "{:,.1f}", "puncak_kb": "{:,.1f}"}, na_rep="-"), hide_index=True)
+        st.download_button("📥 Riwayat Profil (CSV)", lambda: pd.DataFrame(riwayat).to_csv(index=False), "profil_rerun.csv", "text/csv")
+    if st.button("Rekam cProfile 1 Rerun"):
+        st.session_state['cprofile_berikut'] = True
+        st.rerun()
+    if profil.profiler:
+        st.text(profil.laporan_cprofile(n_baris=25))
+        st.download_button("📥 cProfile (.prof)", profil.cprofile_bytes(), "rerun.prof")
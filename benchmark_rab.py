@@ -0,0 +1,180 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, Calculator, HARGA_DEFAULT, generate_breakdown, hitung_rab, segmen_ke_items
+from rab_cli import proses_proyek
+from proyek_store import ProjectStore
+from item_store import ItemStore
+from rekap_sumber_daya import hitung_sumber_daya
+from jadwal_besi import buat_bbs, optimasi_potong
+from risiko_biaya import simulasi_risiko
+from graf_dependensi import RABInkremental
+from desain_hidrolis import desain_saluran
+from boq_tab import build_item_html
+from laporan_cetak import tulis_laporan_pdf
+from kurva_s import susun_jadwal, pendahulu_otomatis
+from pustaka_harga import PustakaHarga, NAMA_DEFAULT
+
+# ==========================================
+# BENCHMARK HOT PATH (KALKULASI & RENDER)
+# ==========================================
+# Contoh:
+#   python benchmark_rab.py --sizes 10,1000,100000 --output bench_v13.json --compare bench_v12.json
+# Hasil ditulis ke JSON (1 record = 1 kasus x 1 ukuran proyek) agar bisa dibandingkan antar versi.
+
+UKURAN_DEFAULT = "10,100,1000,10000,100000"
+
+def proyek_sintetis(n_item, seed=0):
+    """Segmen acak (seed tetap) merata di 4 tipe konstruksi -> (DataFrame segmen, list item proyek)"""
+    rng = np.random.default_rng(seed)
+    tipe = np.array(["Saluran Beton", "Saluran Batu", "Gorong-Gorong Box", "Terjunan USBR (Integrated)"])[np.arange(n_item) % 4]
+    u = lambda a, b: rng.uniform(a, b, n_item).round(2)
+    df = pd.DataFrame({
+        "nama": [f"Seg {i+1}" for i in range(n_item)], "tipe": tipe, "is_rehab": rng.random(n_item) < 0.2,
+        "panjang": u(10, 200), "h": u(0.4, 2.0), "b": u(0.4, 2.0), "m": u(0, 1), "t_cm": u(15, 30),
+        "dia": rng.choice([10.0, 13.0, 16.0], n_item), "jarak": u(10, 25),
+        "l_atas": u(0.3, 0.5), "l_bawah": u(0.4, 0.8), "t_lantai": u(0.2, 0.4),
+        "w": u(0.8, 3.0), "p": u(4, 12),
+        "Q": u(0.5, 10), "H_total": u(1, 6), "H_step": u(0.5, 1.5), "B": u(1, 4),
+        "t_dinding": u(0.2, 0.4), "qa_tanah": u(100, 250), "mode_hemat": rng.random(n_item) < 0.5,
+    })
+    return df, segmen_ke_items(df)
+
+def ukur(fungsi, repeat):
+    """Waktu terbaik (detik) dari `repeat` kali eksekusi"""
+    terbaik = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fungsi()
+        terbaik = min(terbaik, time.perf_counter() - t0)
+    return terbaik
+
+def kasus_benchmark(df, items, excel_max):
+    """Daftar (nama kasus, callable) untuk 1 proyek sintetis"""
+    grup = {t: g for t, g in df.groupby("tipe")}
+    beton, batu, box, usbr = (grup.get(t, df.iloc[:0]) for t in
+                              ["Saluran Beton", "Saluran Batu", "Gorong-Gorong Box", "Terjunan USBR (Integrated)"])
+    tabel_hsp = AHSP_Engine.tabel_harga_satuan(HARGA_DEFAULT, 15)
+    pustaka_lokal = PustakaHarga(folder=None) # Tanpa folder: hanya daftar default
+    json_str = json.dumps(items, indent=2)
+    item_store = ItemStore.dari_list(items)
+
+    ruas_hidro = beton[["nama", "panjang"]].assign(Q=beton["b"] * 2, S=0.001) # Debit sintetis per ruas
+    rab_ink = RABInkremental()
+    rab_ink.set_harga(HARGA_DEFAULT, 15)
+    rab_ink.sinkron(item_store)
+    harga_besi = [dict(HARGA_DEFAULT, p_besi=HARGA_DEFAULT['p_besi'] * f) for f in (1.1, 1.0)]
+
+    def rab_tab3_halaman():
+        # Jalur Tab 3 per rerun: sinkron (tanpa perubahan) + 1 halaman 25 item, tabel ter-format dibangun ulang
+        rab_ink.sinkron(item_store)
+        posisi, halaman = item_store.posisi(), []
+        for item_id in item_store.ids()[:25]:
+            item = item_store.ambil(item_id)
+            rab_ink._tampilan.pop(item_id, None)
+            halaman.append((f"{posisi[item_id]}. {item['nama']} — Rp {rab_ink.hasil[item_id][1]:,.0f}", rab_ink.tampilan(item_id)))
+        return halaman, rab_ink.grand_total()
+
+    def inkremental_ubah_besi():
+        for prices in harga_besi: rab_ink.set_harga(prices, 15)
+
+    def sinkron_penuh():
+        baru = RABInkremental()
+        baru.set_harga(HARGA_DEFAULT, 15)
+        baru.sinkron(item_store)
+
+    def ahsp_tanpa_cache():
+        AHSP_Engine._tabel_harga_satuan.cache_clear()
+        for kode in AHSP_Engine.KODE: AHSP_Engine.hitung_harga_satuan(kode, HARGA_DEFAULT, 15)
+
+    kasus = {
+        "calc.beton.skalar": lambda: [Calculator.hitung_beton_struktur(r.h, r.b, r.m, r.panjang, r.t_cm, r.dia, r.jarak, 2, 5, 20, 280, r.is_rehab) for r in beton.itertuples()],
+        "calc.beton.batch": lambda: Calculator.hitung_beton_struktur_batch(beton, lapis=2, waste=5, fc=20, fy=280),
+        "calc.batu.skalar": lambda: [Calculator.hitung_pasangan_batu(r.h, 0.5, 0.2, r.panjang, r.l_atas, r.l_bawah, r.t_lantai, r.is_rehab) for r in batu.itertuples()],
+        "calc.batu.batch": lambda: Calculator.hitung_pasangan_batu_batch(batu, b=0.5, m=0.2),
+        "calc.box.skalar": lambda: [Calculator.hitung_gorong_box_struktur(r.w, r.h, r.p, r.t_cm, r.dia, r.jarak, 25, 400, r.is_rehab) for r in box.itertuples()],
+        "calc.box.batch": lambda: Calculator.hitung_gorong_box_struktur_batch(box, fc=25, fy=400),
+        "calc.usbr.skalar": lambda: [Calculator.hitung_terjunan_usbr(r.Q, r.H_total, r.H_step, r.B, r.t_lantai, r.t_dinding, r.qa_tanah, r.mode_hemat, r.is_rehab) for r in usbr.itertuples()],
+        "calc.usbr.batch": lambda: Calculator.hitung_terjunan_usbr_batch(usbr),
+        "segmen_ke_items": lambda: segmen_ke_items(df),
+        "ahsp.harga_satuan.tanpa_cache": ahsp_tanpa_cache,
+        "ahsp.harga_satuan.cache": lambda: [AHSP_Engine.hitung_harga_satuan(k, HARGA_DEFAULT, 15) for k in AHSP_Engine.KODE],
+        "rab.hitung_rab": lambda: hitung_rab(items, HARGA_DEFAULT, 15),
+        "boq.generate_breakdown": lambda: [generate_breakdown(item) for item in items],
+        "boq.html": lambda: [build_item_html(i, item) for i, item in enumerate(items)],
+        "json.save": lambda: json.dumps(items, indent=2),
+        "json.load": lambda: json.loads(json_str),
+        "store.save": lambda: ProjectStore.dari_list(items).to_bytes(),
+        "itemstore.load": lambda: ItemStore.dari_list(items),
+        "itemstore.to_list": item_store.to_list,
+        "itemstore.filter": lambda: item_store.ids("Saluran Beton", "seg 1"),
+        "sumber_daya": lambda: hitung_sumber_daya(items),
+        "besi.bbs_potong": lambda: optimasi_potong(buat_bbs(items)),
+        "rab.inkremental_sinkron": sinkron_penuh,
+        "rab.inkremental_ubah_besi": inkremental_ubah_besi,
+        "rab.tab3_halaman": rab_tab3_halaman,
+        "hidrolis.desain_beton": lambda: desain_saluran(ruas_hidro, "Saluran Beton", tabel_hsp),
+        "risiko.monte_carlo_100k": lambda: simulasi_risiko(items, HARGA_DEFAULT, 15),
+        "jadwal.kurva_s": lambda: susun_jadwal(items, tabel_hsp, pendahulu_otomatis(items, "Berurutan per Tipe")),
+        "harga.pustaka_1000_sesi": lambda: [pustaka_lokal.turunan(NAMA_DEFAULT, 10.0 + i % 6) for i in range(1000)],
+    }
+    if len(items) <= excel_max:
+        kasus["excel"] = lambda: proses_proyek(items, HARGA_DEFAULT, 15, BytesIO())
+        kasus["laporan.pdf"] = lambda: tulis_laporan_pdf(BytesIO(), items, HARGA_DEFAULT, 15)
+    return kasus
+
+def versi_git():
+    try: return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception: return None
+
+def bandingkan(hasil, path_lama):
+    """Cetak rasio waktu terhadap file benchmark lama (>1 = lebih lambat)"""
+    with open(path_lama, encoding="utf-8") as f: lama = json.load(f)
+    acuan = {(r["kasus"], r["n_item"]): r["detik"] for r in lama["hasil"]}
+    for r in hasil:
+        dulu = acuan.get((r["kasus"], r["n_item"]))
+        if dulu:
+            rasio = r["detik"] / dulu
+            tanda = "⚠️" if rasio > 1.2 else ""
+            print(f"{r['kasus']:<32} n={r['n_item']:<7} {dulu:.4f}s -> {r['detik']:.4f}s  x{rasio:.2f} {tanda}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hot path kalkulasi & render RAB")
+    parser.add_argument("--sizes", default=UKURAN_DEFAULT, help="Jumlah item per proyek sintetis, dipisah koma")
+    parser.add_argument("--repeat", type=int, default=3, help="Ulangan per kasus (diambil waktu terbaik)")
+    parser.add_argument("--excel-max", type=int, default=20000, help="Lewati Excel untuk proyek lebih besar dari ini")
+    parser.add_argument("--filter", default="", help="Hanya kasus yang namanya mengandung teks ini")
+    parser.add_argument("--output", default="bench_rab.json", help="File hasil (JSON)")
+    parser.add_argument("--compare", help="File hasil versi sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+
+    hasil = []
+    for n_item in [int(x) for x in args.sizes.split(",")]:
+        df, items = proyek_sintetis(n_item)
+        for nama, fungsi in kasus_benchmark(df, items, args.excel_max).items():
+            if args.filter not in nama: continue
+            detik = ukur(fungsi, args.repeat)
+            hasil.append({"kasus": nama, "n_item": n_item, "detik": detik, "us_per_item": detik / n_item * 1e6})
+            print(f"{nama:<32} n={n_item:<7} {detik:.4f}s")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "waktu": datetime.now().isoformat(timespec="seconds"), "git": versi_git(),
+            "python": sys.version.split()[0], "platform": platform.platform(),
+            "numpy": np.__version__, "pandas": pd.__version__,
+            "repeat": args.repeat, "hasil": hasil,
+        }, f, indent=2)
+    if args.compare: bandingkan(hasil, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,31 +2,156 @@ import streamlit as st
 import pandas as pd
 import google.generativeai as genai
 import json
+import html
+import math
+import re
+import time
+import queue
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from types import SimpleNamespace
+
+from rab_engine import generate_breakdown
+from validator_rab import validasi_proyek, ringkasan_validasi
 
 # ==========================================
 # 1. ENGINE AI (VALIDATOR STANDAR PUPR)
 # ==========================================
+# --- BACKEND MODEL (PLUGGABLE) ---
+MODEL_CACHE_TTL = 3600 # Detik; daftar model per API key di-cache agar tidak list_models() tiap rerun
+AI_TIMEOUT = 90 # Detik maksimum menunggu jawaban AI
+
+class ModelBackend(ABC):
+    """Interface backend AI: cukup implementasikan stream(prompt) -> iterator potongan teks (gagal saat dibuat bila belum)."""
+    name = "base"
+
+    @abstractmethod
+    def stream(self, prompt):
+        """Iterator potongan teks jawaban untuk `prompt`"""
+
+    def generate_content(self, prompt):
+        return SimpleNamespace(text="".join(self.stream(prompt)))
+
+class GeminiBackend(ModelBackend):
+    """Google Gemini (google.generativeai) dengan output streaming"""
+    def __init__(self, model, name):
+        self.model, self.name = model, name
+
+    def stream(self, prompt):
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.text: yield chunk.text
+
+@st.cache_resource(ttl=MODEL_CACHE_TTL, show_spinner=False)
+def _discover_model(api_key):
+    genai.configure(api_key=api_key)
+    models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+    priority = ['models/gemini-1.5-flash', 'models/gemini-1.5-pro', 'models/gemini-1.0-pro']
+    selected = next((m for m in priority if m in models), models[0] if models else None)
+    return (GeminiBackend(genai.GenerativeModel(selected), selected), selected) if selected else (None, None)
+
 def get_best_model(api_key):
-    """Koneksi ke Google Gemini AI"""
+    """Koneksi ke Google Gemini AI (hasil discovery di-cache per API key selama MODEL_CACHE_TTL; error tidak di-cache)"""
     try:
-        genai.configure(api_key=api_key)
-        models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
-        priority = ['models/gemini-1.5-flash', 'models/gemini-1.5-pro', 'models/gemini-1.0-pro']
-        selected = next((m for m in priority if m in models), models[0] if models else None)
-        return (genai.GenerativeModel(selected), selected) if selected else (None, None)
+        return _discover_model(api_key)
     except Exception as e:
         return None, str(e)
 
-def build_system_context(data_proyek):
-    """Mengirim Data ke AI untuk Validasi"""
-    json_data = json.dumps(data_proyek, indent=2)
+# --- DIGEST PROYEK (RINGKAS, DALAM BATAS TOKEN) ---
+DIGEST_TOKEN_BUDGET = 6000 # Estimasi kasar: 1 token ~ 4 karakter
+KOLOM_VOLUME = ["vol_beton", "vol_batu", "vol_galian", "vol_timbunan", "berat_besi", "luas_bekisting", "luas_plester", "vol_bongkaran"]
+BATAS_OUTLIER = 3.5 # Robust z-score (median/MAD) per tipe
+
+def _estimasi_token(teks):
+    return len(teks) // 4
+
+def _tabel_item(data_proyek):
+    rows = []
+    for i, item in enumerate(data_proyek):
+        vol = item['vol']
+        row = {"no": i+1, "nama": item['nama'], "tipe": item['tipe'], "panjang": item.get('panjang', 0) or 0}
+        row.update({k: vol.get(k, 0) or 0 for k in KOLOM_VOLUME})
+        rows.append(row)
+    df = pd.DataFrame(rows, columns=["no", "nama", "tipe", "panjang"] + KOLOM_VOLUME)
+    struktur = df["vol_beton"] + df["vol_batu"]
+    df["rasio_besi"] = (df["berat_besi"] / df["vol_beton"]).where(df["vol_beton"] > 0)
+    df["rasio_galian"] = (df["vol_galian"] / struktur).where(struktur > 0)
+    df["rasio_timbunan"] = (df["vol_timbunan"] / df["vol_galian"]).where(df["vol_galian"] > 0)
+    return df
+
+def _outlier(df):
+    """Item dengan rasio menyimpang jauh dari median tipe-nya (robust z-score)"""
+    temuan = []
+    for kolom in ["rasio_besi", "rasio_galian", "rasio_timbunan"]:
+        grup = df.groupby("tipe")[kolom]
+        median = grup.transform("median")
+        mad = grup.transform(lambda x: (x - x.median()).abs().median())
+        z = 0.6745 * (df[kolom] - median) / mad.where(mad > 0)
+        for idx in z[z.abs() > BATAS_OUTLIER].index:
+            temuan.append((abs(z[idx]), f"#{df.at[idx, 'no']} {df.at[idx, 'nama']} ({df.at[idx, 'tipe']}): {kolom}={df.at[idx, kolom]:.2f} (median tipe {median[idx]:.2f})"))
+    return [t for _, t in sorted(temuan, reverse=True)]
+
+def _item_dirujuk(data_proyek, query):
+    """Index item yang disebut di pertanyaan: nomor (#3 / item 3 / no 3) atau nama item"""
+    q = (query or "").lower()
+    nomor = {int(n) - 1 for n in re.findall(r"(?:#|item\s*|no\.?\s*|nomor\s*)(\d+)", q)}
+    dirujuk = [i for i in sorted(nomor) if 0 <= i < len(data_proyek)]
+    if q:
+        dirujuk += [i for i, item in enumerate(data_proyek)
+                    if i not in nomor and item['nama'].lower() in q and re.search(rf"(?<!\w){re.escape(item['nama'].lower())}(?!\w)", q)]
+    return dirujuk
+
+def build_project_digest(data_proyek, query="", token_budget=DIGEST_TOKEN_BUDGET):
+    """Ringkasan proyek untuk prompt: agregat per tipe, outlier, dan hanya item yang dirujuk pertanyaan"""
+    df = _tabel_item(data_proyek)
+    agg = df.groupby("tipe").agg(
+        jumlah_item=("no", "count"), panjang_m=("panjang", "sum"),
+        **{k: (k, "sum") for k in KOLOM_VOLUME},
+        rasio_besi_median=("rasio_besi", "median"), rasio_galian_median=("rasio_galian", "median"),
+        rasio_timbunan_median=("rasio_timbunan", "median"),
+    )
+    agg = agg.loc[:, (agg != 0).any()].round(2)
+    bagian = [f"JUMLAH ITEM: {len(df)}", "AGREGAT PER TIPE (CSV):", agg.to_csv()]
+
+    temuan = validasi_proyek(data_proyek)
+    if not temuan.empty:
+        bagian += [f"TEMUAN VALIDASI OTOMATIS ({len(temuan)} temuan, sudah dicek lokal):", ringkasan_validasi(temuan).to_csv(index=False)]
+
+    outlier = _outlier(df)
+    bagian.append(f"OUTLIER ({len(outlier)} temuan):")
+    sisa = token_budget - _estimasi_token("\n".join(bagian))
+    for i, teks in enumerate(outlier):
+        if _estimasi_token(teks) + 20 > sisa // 2:
+            bagian.append(f"... {len(outlier) - i} outlier lain tidak ditampilkan")
+            break
+        bagian.append("- " + teks)
+        sisa -= _estimasi_token(teks) + 1
+
+    dirujuk = _item_dirujuk(data_proyek, query)
+    if dirujuk:
+        bagian.append("ITEM YANG DIRUJUK (JSON):")
+        sisa = token_budget - _estimasi_token("\n".join(bagian))
+        for i in dirujuk:
+            teks = f"#{i+1} " + json.dumps(data_proyek[i], separators=(',', ':'), default=str)
+            if _estimasi_token(teks) > sisa:
+                bagian.append("... (item lain dipotong: batas token)")
+                break
+            bagian.append(teks)
+            sisa -= _estimasi_token(teks) + 1
+    return "\n".join(bagian)
+
+def build_system_context(data_proyek, query=""):
+    """Mengirim Data ke AI untuk Validasi (digest ringkas, bukan JSON utuh)"""
+    digest = build_project_digest(data_proyek, query)
     return f"""
     ROLE: Ahli Quantity Surveyor (QS) & Estimator Proyek Sipil.
     STANDAR: Permen PUPR No. 1 Tahun 2022 / No. 182 Tahun 2025.
     TUGAS: Validasi perhitungan volume back-up data (BoQ).
     
-    DATA PROYEK (JSON):
-    {json_data}
+    RINGKASAN DATA PROYEK:
+    {digest}
     
     INSTRUKSI:
     1. Validasi apakah koefisien galian dan timbunan masuk akal.
@@ -34,120 +159,165 @@ def build_system_context(data_proyek):
     3. Jawab pertanyaan user dengan bahasa teknis yang sopan.
     """
 
+# --- MODEL LOKAL, JOB STREAMING & CACHE JAWABAN ---
+class LocalModel(ModelBackend):
+    """Pengganti model Gemini tanpa jaringan (offline/uji), BUKAN AI: hanya menyalin temuan outlier dari digest proyek."""
+    name = "local/digest"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay # Jeda antar potongan, untuk menguji streaming/timeout
+
+    def stream(self, prompt):
+        ringkasan = prompt.split("RINGKASAN DATA PROYEK:", 1)[-1].split("INSTRUKSI:", 1)[0]
+        temuan = [l.strip() for l in ringkasan.splitlines() if l.strip().startswith(("- ", "OUTLIER", "#"))]
+        query = prompt.rsplit("USER QUERY:", 1)[-1].strip()
+        yield f"[Model Lokal — bukan AI] Pertanyaan: {query}\n\n"
+        for baris in (temuan or ["Tidak ada outlier rasio yang terdeteksi."]):
+            if self.delay: time.sleep(self.delay)
+            yield baris + "\n"
+
+_SELESAI = object()
+
+class GenerationJob:
+    """Jalankan backend.stream() di thread terpisah; potongan teks dikirim lewat antrian (bisa dibatalkan)."""
+    def __init__(self, backend, prompt):
+        self.status = "berjalan"
+        self._antrian = queue.Queue()
+        self._batal = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(backend, prompt), daemon=True)
+        self._thread.start()
+
+    def _run(self, backend, prompt):
+        try:
+            for chunk in backend.stream(prompt):
+                if self._batal.is_set(): break
+                self._antrian.put(chunk)
+        except Exception as e:
+            self._antrian.put(e)
+        finally:
+            self._antrian.put(_SELESAI)
+
+    def cancel(self):
+        self._batal.set()
+        if self.status == "berjalan": self.status = "dibatalkan"
+
+    def chunks(self, timeout=AI_TIMEOUT):
+        batas = time.monotonic() + timeout
+        while self.status == "berjalan":
+            try:
+                chunk = self._antrian.get(timeout=max(0.0, batas - time.monotonic()))
+            except queue.Empty:
+                self.cancel(); self.status = "timeout"
+                yield f"\n\n⏱️ Waktu habis ({timeout} detik), jawaban dihentikan."
+                return
+            if chunk is _SELESAI:
+                if self.status == "berjalan": self.status = "selesai"
+            elif isinstance(chunk, Exception):
+                self.cancel(); self.status = "error"
+                yield f"\n\n⚠️ Error AI: {chunk}"
+            else:
+                yield chunk
+
+_RESPONSE_CACHE = OrderedDict()
+RESPONSE_CACHE_MAX = 256
+
+def _cache_key(model_name, data_proyek, query):
+    return hashlib.sha256(json.dumps([model_name, data_proyek, query.strip().lower()], sort_keys=True, default=str).encode()).hexdigest()
+
+def _simpan_cache(kunci, jawaban):
+    _RESPONSE_CACHE[kunci] = jawaban
+    if len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX: _RESPONSE_CACHE.popitem(last=False)
+
+def stream_answer(backend, data_proyek, query, timeout=AI_TIMEOUT, on_start=None):
+    """
+    Generator potongan jawaban AI (untuk st.write_stream). Generasi berjalan di thread lain;
+    jawaban yang selesai di-cache berdasarkan hash (model, proyek, pertanyaan) agar pertanyaan berulang instan.
+    """
+    kunci = _cache_key(backend.name, data_proyek, query)
+    if kunci in _RESPONSE_CACHE:
+        _RESPONSE_CACHE.move_to_end(kunci)
+        yield _RESPONSE_CACHE[kunci]
+        return
+    ctx = build_system_context(data_proyek, query)
+    job = GenerationJob(backend, f"{ctx}\nUSER QUERY: {query}")
+    if on_start: on_start(job)
+    parts = []
+    try:
+        for chunk in job.chunks(timeout):
+            parts.append(chunk)
+            yield chunk
+    finally:
+        job.cancel() # Rerun/stop di tengah stream -> hentikan thread generasi
+    if job.status == "selesai": _simpan_cache(kunci, "".join(parts))
+
+def ask_model(backend, data_proyek, query, timeout=AI_TIMEOUT):
+    """Versi blocking stream_answer (untuk skrip/uji)"""
+    return "".join(stream_answer(backend, data_proyek, query, timeout))
+
 # ==========================================
-# 2. LOGIKA PERHITUNGAN (BREAKDOWN ITEM)
+# 2. HTML BACK-UP VOLUME (rincian per item: rab_engine.generate_breakdown)
 # ==========================================
-def generate_breakdown(item):
-    """
-    Memecah 1 Item Pekerjaan menjadi Sub-Item Analisa 
-    Sesuai Struktur AHSP (Galian, Timbunan, Struktur, Finishing)
+BOQ_TABLE_HEAD = """
+    <table class="boq-table">
+        <thead>
+            <tr>
+                <th width="10%">Kode</th>
+                <th width="35%">Uraian Pekerjaan</th>
+                <th width="35%">Perhitungan / Rumus</th>
+                <th width="10%">Volume</th>
+                <th width="10%">Satuan</th>
+            </tr>
+        </thead>
+        <tbody>
     """
-    vol = item['vol']
-    dim = item.get('dimensi', {})
-    tipe = item['tipe']
-    panjang = dim.get('panjang', 1)
-    
-    breakdown = []
-    
-    # A. PEKERJAAN PERSIAPAN / BONGKARAN
-    if vol.get('vol_bongkaran', 0) > 0:
-        breakdown.append({
-            "kode": "T.15.a", 
-            "uraian": "Bongkaran Pasangan Eksisting",
-            "rumus": "V = Volume Struktur Lama (Asumsi sama dengan baru)",
-            "volume": f"{vol['vol_bongkaran']:.3f}",
-            "satuan": "m3"
-        })
-        
-    # B. PEKERJAAN TANAH
-    if vol.get('vol_galian', 0) > 0:
-        luas_galian = vol['vol_galian'] / panjang if panjang > 0 else 0
-        breakdown.append({
-            "kode": "T.06.a.1", 
-            "uraian": "Galian Tanah Biasa",
-            "rumus": f"V = Luas Penampang Galian ({luas_galian:.2f} m2) x Panjang",
-            "volume": f"{vol['vol_galian']:.3f}",
-            "satuan": "m3"
-        })
-        
-    if vol.get('vol_timbunan', 0) > 0:
-        breakdown.append({
-            "kode": "T.14.a", 
-            "uraian": "Timbunan Kembali Dipadatkan",
-            "rumus": "V = (Vol. Galian - Vol. Struktur) x 0.45 (Faktor Gembur)",
-            "volume": f"{vol['vol_timbunan']:.3f}",
-            "satuan": "m3"
-        })
-
-    # C. PEKERJAAN STRUKTUR BETON/BATU
-    if vol.get('vol_beton', 0) > 0:
-        ket_rumus = "V = Luas Penampang x Panjang"
-        if "Saluran Beton" in tipe:
-            b, h, t = dim.get('b',0), dim.get('h',0), dim.get('t_cm',0)
-            ket_rumus = f"V = ((L.Luar - L.Dalam) x Panjang) | Dimensi: {b}x{h} t={t}cm"
-            
-        breakdown.append({
-            "kode": "B.05.a", 
-            "uraian": "Beton Mutu K-225 (Struktur)",
-            "rumus": ket_rumus,
-            "volume": f"{vol['vol_beton']:.3f}",
-            "satuan": "m3"
-        })
-    
-    if vol.get('vol_batu', 0) > 0:
-        breakdown.append({
-            "kode": "P.01.a", 
-            "uraian": "Pasangan Batu Kali Camp. 1:4",
-            "rumus": "V = Luas Penampang Trapesium x Panjang",
-            "volume": f"{vol['vol_batu']:.3f}",
-            "satuan": "m3"
-        })
-
-    # D. PEKERJAAN BESI & BEKISTING
-    if vol.get('berat_besi', 0) > 0:
-        ratio = vol['berat_besi'] / vol['vol_beton'] if vol['vol_beton'] > 0 else 0
-        breakdown.append({
-            "kode": "B.17.a", 
-            "uraian": "Pembesian (Polos/Ulir)",
-            "rumus": f"Berat = Vol. Beton x Ratio Besi ({ratio:.1f} kg/m3)",
-            "volume": f"{vol['berat_besi']:.2f}",
-            "satuan": "kg"
-        })
-        
-    if vol.get('luas_bekisting', 0) > 0:
-        breakdown.append({
-            "kode": "B.20.a", 
-            "uraian": "Pasang Bekisting (2x Pakai)",
-            "rumus": "Luas = Keliling Sisi Vertikal Beton x Panjang",
-            "volume": f"{vol['luas_bekisting']:.3f}",
-            "satuan": "m2"
-        })
-        
-    # E. PEKERJAAN FINISHING (TERJUNAN USBR)
-    if vol.get('luas_plester', 0) > 0:
-        breakdown.append({
-            "kode": "P.04.e", 
-            "uraian": "Plesteran 1:3 + Acian",
-            "rumus": "Luas = Luas Bidang Basah / Ekspos",
-            "volume": f"{vol['luas_plester']:.3f}",
-            "satuan": "m2"
-        })
-
-    return breakdown
+BOQ_ROW = """
+        <tr>
+            <td>{kode}</td>
+            <td>{uraian}</td>
+            <td style="font-family:'Consolas', monospace; color:#555;">{rumus}</td>
+            <td style="font-weight:bold;">{volume}</td>
+            <td>{satuan}</td>
+        </tr>
+        """
+
+@lru_cache(maxsize=4096)
+def _item_html(idx, payload):
+    item = json.loads(payload)
+    parts = [f"""
+    <div class="boq-container">
+        <div class="boq-header">
+            #{idx+1}. {html.escape(item['nama'])} <span style="font-weight:normal; font-size:0.9em; opacity:0.8;">({html.escape(item['tipe'])})</span>
+        </div>
+        """, BOQ_TABLE_HEAD]
+    parts.extend(BOQ_ROW.format(**{k: html.escape(str(v)) for k, v in r.items()}) for r in generate_breakdown(item))
+    parts.append("</tbody></table>\n    </div>\n    ")
+    return "".join(parts)
+
+def build_item_html(idx, item):
+    """HTML Tabel Back-Up Volume untuk 1 item (Format Resmi); di-cache berdasarkan nomor urut + isi item"""
+    return _item_html(idx, json.dumps(item, sort_keys=True, separators=(',', ':'), default=str))
 
 # ==========================================
 # 3. TAMPILAN UTAMA (RENDERER)
 # ==========================================
 def render_boq_tab(data_proyek):
+    """Tab Back-Up BoQ; `data_proyek` = list of dict item atau Sequence lazy (ItemStore.urutan()): hanya halaman aktif yang dibaca"""
     
     # --- A. SETUP & INPUT KEY ---
-    api_key = st.secrets.get("GOOGLE_API_KEY")
+    try:
+        api_key = st.secrets.get("GOOGLE_API_KEY")
+    except FileNotFoundError: # Tanpa secrets.toml
+        api_key = None
     if not api_key:
         api_key = st.text_input("🔑 Masukkan Google API Key (Opsional untuk AI):", type="password")
     
     model_ai = None
     if api_key:
         model_ai, _ = get_best_model(api_key)
+    # Tanpa Gemini tidak ada AI; Model Lokal (ringkasan outlier, bukan AI) hanya bila dipilih user
+    if model_ai is None and st.checkbox("Pakai Model Lokal tanpa AI (hanya ringkasan outlier rasio)", key="ai_model_lokal"):
+        model_ai = LocalModel()
+        st.caption("⚠️ Model Lokal bukan AI: jawaban hanya daftar outlier dari data proyek, pertanyaan tidak dianalisis.")
 
     # --- B. CHATBOT AI ---
     st.markdown("### 🤖 Asisten Validasi Data")
@@ -159,16 +329,19 @@ def render_boq_tab(data_proyek):
         last_msg = st.session_state.messages[-1]
         st.chat_message(last_msg["role"]).write(last_msg["content"])
 
+    # Tombol batal memicu rerun -> stream lama dihentikan; job juga dibatalkan eksplisit di sini
+    if st.session_state.get("ai_cancel") and st.session_state.get("ai_job"):
+        st.session_state["ai_job"].cancel()
+
     if prompt := st.chat_input("Contoh: 'Cek apakah koefisien galian Saluran 1 sudah benar?'"):
         st.session_state.messages.append({"role": "user", "content": prompt})
         st.chat_message("user").write(prompt)
         
         if model_ai and data_proyek:
-            with st.spinner("Sedang memvalidasi dengan standar PUPR..."):
-                ctx = build_system_context(data_proyek)
-                res = model_ai.generate_content(f"{ctx}\nUSER QUERY: {prompt}")
-                st.chat_message("assistant").write(res.text)
-                st.session_state.messages.append({"role": "assistant", "content": res.text})
+            st.button("⏹️ Batalkan Jawaban AI", key="ai_cancel")
+            with st.chat_message("assistant"):
+                jawaban = st.write_stream(stream_answer(model_ai, list(data_proyek), prompt, on_start=lambda job: st.session_state.__setitem__("ai_job", job)))
+            st.session_state.messages.append({"role": "assistant", "content": jawaban})
         else:
             st.warning("Perlu API Key dan Data Proyek untuk menggunakan AI.")
 
@@ -200,45 +373,19 @@ def render_boq_tab(data_proyek):
         st.warning("Belum ada data. Silakan input di Tab 1.")
         return
 
-    # GENERATE TABEL PER ITEM
-    for idx, item in enumerate(data_proyek):
-        rows = generate_breakdown(item)
-        
-        # HTML Table Construction
-        table_html = """
-        <table class="boq-table">
-            <thead>
-                <tr>
-                    <th width="10%">Kode</th>
-                    <th width="35%">Uraian Pekerjaan</th>
-                    <th width="35%">Perhitungan / Rumus</th>
-                    <th width="10%">Volume</th>
-                    <th width="10%">Satuan</th>
-                </tr>
-            </thead>
-            <tbody>
-        """
-        
-        for r in rows:
-            table_html += f"""
-            <tr>
-                <td>{r['kode']}</td>
-                <td>{r['uraian']}</td>
-                <td style="font-family:'Consolas', monospace; color:#555;">{r['rumus']}</td>
-                <td style="font-weight:bold;">{r['volume']}</td>
-                <td>{r['satuan']}</td>
-            </tr>
-            """
-        table_html += "</tbody></table>"
-        
-        # Render Container
-        st.markdown(f"""
-        <div class="boq-container">
-            <div class="boq-header">
-                #{idx+1}. {item['nama']} <span style="font-weight:normal; font-size:0.9em; opacity:0.8;">({item['tipe']})</span>
-            </div>
-            {table_html}
-        </div>
-        """, unsafe_allow_html=True)
+    # GENERATE TABEL PER HALAMAN (hanya halaman aktif yang dikirim ke browser)
+    n_item = len(data_proyek)
+    c_mode, c_size, c_page = st.columns([2, 1, 1])
+    mode = c_mode.radio("Tampilan", ["Per Halaman", "Laporan Lengkap (Cetak)"], horizontal=True, key="boq_mode")
+    if mode == "Per Halaman":
+        per_hal = c_size.selectbox("Item / Halaman", [10, 25, 50, 100], index=1, key="boq_per_hal")
+        n_hal = max(1, math.ceil(n_item / per_hal))
+        hal = c_page.number_input(f"Halaman (dari {n_hal})", min_value=1, max_value=n_hal, value=1, key="boq_hal")
+        rentang = range((hal-1) * per_hal, min(hal * per_hal, n_item))
+        st.caption(f"Menampilkan item {rentang.start+1}–{rentang.stop} dari {n_item}")
+    else:
+        rentang = range(n_item)
+    
+    st.markdown("".join(build_item_html(idx, item) for idx, item in zip(rentang, data_proyek[rentang.start:rentang.stop])), unsafe_allow_html=True)
     
-    st.info("💡 Tips: Tekan Ctrl + P untuk mencetak laporan resmi ini.")
+    st.info("💡 Tips: Tekan Ctrl + P untuk mencetak halaman ini. Untuk proyek besar gunakan 🖨️ Download Laporan Cetak (PDF) di tab RAB Detail.")
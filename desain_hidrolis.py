@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from rab_engine import TIPE_SEGMEN, biaya_batch
+
+# ==========================================
+# DESAIN HIDROLIS OTOMATIS PENAMPANG SALURAN (MANNING)
+# ==========================================
+# Untuk tiap ruas (Q, kemiringan S, n Manning, panjang) & tiap kombinasi lebar dasar b x talud m:
+#   1. Kedalaman normal y dari Q = 1/n x A x R^(2/3) x S^(1/2) (biseksi vektor, semua ruas x kombinasi sekaligus)
+#   2. Tinggi saluran h = y + tinggi jagaan (tabel per Q), dibulatkan ke atas per KELIPATAN_H
+#   3. Cek kecepatan V_MIN <= Q/A <= V_MAKS & h <= h_maks; beton: tebal t_cm >= t_rekom (Calculator)
+# Kombinasi yang lolos dihitung volumenya dengan Calculator.*_batch & dihargai dengan HSP aktif (biaya_batch),
+# lalu dipilih yang termurah per ruas. Saluran Batu memakai b & m tetap (TIPE_SEGMEN), jadi hanya h yang dicari.
+
+GRID_HIDROLIS = {
+    "Saluran Beton": {"b": np.round(np.arange(0.3, 3.01, 0.1), 2), "m": (0.0, 0.5, 1.0), "t_cm": (12.0, 15.0, 20.0, 25.0, 30.0)},
+    "Saluran Batu": {"b": (TIPE_SEGMEN["Saluran Batu"][1]["b"],), "m": (TIPE_SEGMEN["Saluran Batu"][1]["m"],), "t_cm": (0.0,)},
+}
+N_MANNING = {"Saluran Beton": 0.015, "Saluran Batu": 0.020}
+V_MAKS = {"Saluran Beton": 3.0, "Saluran Batu": 2.0} # m/s, batas gerusan pasangan
+V_MIN = 0.3                                          # m/s, batas endapan
+# Tinggi jagaan saluran pasangan per debit (mengacu KP-03): (Q maks m3/s, jagaan m)
+TINGGI_JAGAAN = ((0.5, 0.20), (1.5, 0.20), (5.0, 0.25), (10.0, 0.30), (15.0, 0.40), (np.inf, 0.50))
+KELIPATAN_H = 0.05
+H_MAKS = 3.0
+Y_MAKS = 6.0        # Batas atas biseksi kedalaman normal
+ITERASI_BISEKSI = 50
+UKURAN_CHUNK_DESAIN = 200000 # Baris kandidat (ruas x b x m x t) per batch
+DEFAULT_DESAIN = {"dia": 10.0, "jarak": 15.0, "l_atas": 0.3, "l_bawah": 0.4, "t_lantai": 0.2} # Sama dengan form Input
+KOLOM_DESAIN = ["nama", "Q", "S", "n", "panjang", "status", "b", "m", "h", "t_cm", "y_normal", "jagaan", "v", "biaya", "biaya_per_m", "n_layak"]
+
+def tinggi_jagaan(Q, tabel=TINGGI_JAGAAN):
+    batas, jagaan = np.array([t[0] for t in tabel]), np.array([t[1] for t in tabel])
+    return jagaan[np.minimum(np.searchsorted(batas, np.asarray(Q, dtype=float)), len(jagaan) - 1)]
+
+def debit_manning(y, b, m, S, n):
+    """Q = 1/n x A x R^(2/3) x S^(1/2) penampang trapesium (m = 0: persegi)"""
+    A = (b + m * y) * y
+    P = b + 2 * y * np.sqrt(1 + m**2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R = np.where(P > 0, A / P, 0.0)
+    return A * R**(2/3) * np.sqrt(S) / n
+
+def kedalaman_normal(Q, b, m, S, n, y_maks=Y_MAKS, iterasi=ITERASI_BISEKSI):
+    """Kedalaman normal (biseksi vektor, argumen di-broadcast); NaN bila Q > kapasitas pada y_maks"""
+    Q, b, m, S, n = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (Q, b, m, S, n)))
+    bawah, atas = np.zeros(Q.shape), np.full(Q.shape, float(y_maks))
+    for _ in range(iterasi):
+        tengah = (bawah + atas) / 2
+        kurang = debit_manning(tengah, b, m, S, n) < Q
+        bawah = np.where(kurang, tengah, bawah)
+        atas = np.where(kurang, atas, tengah)
+    return np.where(debit_manning(y_maks, b, m, S, n) >= Q, atas, np.nan)
+
+def _kandidat_hidrolis(ruas, tipe, grid, v_min, v_maks, h_maks):
+    """Kandidat (ruas x b x m x t) yang lolos cek hidrolis, sebagai DataFrame input Calculator.*_batch"""
+    bm = np.array([(b, m) for b in grid["b"] for m in grid["m"]])
+    Q, S, n = (ruas[k].to_numpy(dtype=float)[:, None] for k in ("Q", "S", "n"))
+    y = kedalaman_normal(Q, bm[:, 0], bm[:, 1], S, n)
+    jagaan = tinggi_jagaan(Q)
+    h = np.round(np.ceil(np.round((y + jagaan) / KELIPATAN_H, 6)) * KELIPATAN_H, 3)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v = Q / ((bm[:, 0] + bm[:, 1] * y) * y)
+    r, g = np.nonzero(np.isfinite(y) & (h <= h_maks + 1e-9) & (v >= v_min) & (v <= v_maks))
+    if len(r) == 0: return None
+    t = np.asarray(grid["t_cm"], dtype=float)
+    r, g, t = np.repeat(r, len(t)), np.repeat(g, len(t)), np.tile(t, len(r))
+    kolom_ruas = ruas.iloc[r].reset_index(drop=True)
+    return kolom_ruas.assign(b=bm[g, 0], m=bm[g, 1], h=h[r, g], t_cm=t, y_normal=y[r, g], jagaan=jagaan[r, 0], v=v[r, g], tipe=tipe)
+
+def desain_saluran(df_ruas, tipe, tabel_hsp, v_min=V_MIN, v_maks=None, h_maks=H_MAKS, **grid):
+    """
+    Penampang termurah yang layak hidrolis & struktur untuk setiap ruas.
+    df_ruas: kolom nama, Q (m3/s), S (kemiringan dasar, m/m), panjang (m); opsional n, is_rehab, dia, jarak, l_atas, ...
+    `grid` menimpa GRID_HIDROLIS[tipe] (b, m, t_cm). Biaya = HSP aktif (sebelum PPN).
+    Return: DataFrame 1 baris per ruas (kolom KOLOM_DESAIN + kolom input), status "❌ ..." bila tidak ada yang layak
+    """
+    if tipe not in GRID_HIDROLIS: raise ValueError(f"Tipe tidak didukung untuk desain hidrolis: {tipe}")
+    grid = {**GRID_HIDROLIS[tipe], **grid}
+    v_maks = V_MAKS[tipe] if v_maks is None else v_maks
+    ruas = df_ruas.reset_index(drop=True)
+    ruas = ruas.assign(
+        **{k: v for k, v in DEFAULT_DESAIN.items() if k not in ruas},
+        n=ruas["n"].fillna(N_MANNING[tipe]) if "n" in ruas else N_MANNING[tipe],
+        is_rehab=ruas["is_rehab"].fillna(False).astype(bool) if "is_rehab" in ruas else False,
+        ruas=np.arange(len(ruas)),
+    )
+    if (ruas[["Q", "S", "n"]] <= 0).any().any(): raise ValueError("Q, S dan n harus > 0")
+    fungsi, konstan = TIPE_SEGMEN[tipe]
+    konstan = {k: v for k, v in konstan.items() if k not in ("b", "m")}
+    n_kombinasi = len(grid["b"]) * len(grid["m"]) * len(grid["t_cm"])
+    per_chunk = max(1, UKURAN_CHUNK_DESAIN // n_kombinasi)
+
+    terpilih = []
+    for awal in range(0, len(ruas), per_chunk):
+        kandidat = _kandidat_hidrolis(ruas.iloc[awal:awal + per_chunk], tipe, grid, v_min, v_maks, h_maks)
+        if kandidat is None: continue
+        calc = fungsi(kandidat, **konstan)
+        kandidat["biaya"] = biaya_batch(calc, tabel_hsp)
+        if "t_rekom" in calc and tipe == "Saluran Beton": kandidat = kandidat[kandidat["t_cm"] >= calc["t_rekom"]]
+        if kandidat.empty: continue
+        idx = kandidat.groupby("ruas")["biaya"].idxmin()
+        terpilih.append(kandidat.loc[idx].assign(n_layak=kandidat.groupby("ruas").size().loc[idx.index].to_numpy()))
+
+    hasil = ruas.drop(columns=["b", "m", "h", "t_cm"], errors="ignore")
+    if terpilih:
+        pilih = pd.concat(terpilih).set_index("ruas")[["b", "m", "h", "t_cm", "y_normal", "jagaan", "v", "biaya", "n_layak"]]
+        hasil = hasil.join(pilih, on="ruas")
+    else:
+        hasil = hasil.assign(**{k: np.nan for k in ["b", "m", "h", "t_cm", "y_normal", "jagaan", "v", "biaya", "n_layak"]})
+    hasil["n_layak"] = hasil["n_layak"].fillna(0).astype(int)
+    hasil["status"] = np.where(hasil["biaya"].notna(), "✅ OK", "❌ Tidak ada penampang layak")
+    hasil["biaya_per_m"] = hasil["biaya"] / hasil["panjang"]
+    if tipe == "Saluran Batu": hasil["t_cm"] = np.nan
+    lain = [k for k in hasil.columns if k not in KOLOM_DESAIN and k != "ruas"]
+    return hasil[KOLOM_DESAIN + lain]
+
+def desain_ke_segmen(hasil, tipe):
+    """Ruas yang OK -> DataFrame segmen (untuk rab_engine.segmen_ke_items)"""
+    ok = hasil[hasil["biaya"].notna()]
+    kolom = ["nama", "panjang", "h", "b", "m", "t_cm", "dia", "jarak", "is_rehab"] if tipe == "Saluran Beton" else \
+            ["nama", "panjang", "h", "b", "m", "l_atas", "l_bawah", "t_lantai", "is_rehab"]
+    return ok[kolom].assign(tipe=tipe)
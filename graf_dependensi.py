@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, AHSP_REGISTRY, MAP_PEKERJAAN, baris_rincian_rab, tabel_rincian_rab
+
+# ==========================================
+# GRAF DEPENDENSI HARGA -> AHSP -> VOLUME -> ITEM
+# ==========================================
+# Dibangun dari koefisien AHSP (koef != 0) & MAP_PEKERJAAN:
+#   kunci harga (p_besi) -> kode AHSP (B.17.a) -> kunci volume (berat_besi) -> item (id ItemStore)
+# RABInkremental menyimpan HSP & baris RAB per item; perubahan 1 harga hanya menghitung ulang HSP kode
+# yang memakai harga tsb dan item yang punya volume di kode itu. Overhead mempengaruhi semua kode.
+# Perubahan item dideteksi dari identitas record ItemStore (ubah() selalu membuat record baru).
+
+KUNCI_OVERHEAD = "overhead"
+
+class GrafDependensi:
+    def __init__(self):
+        koef = AHSP_Engine.MATRIKS_KOEF
+        self.harga_ke_kode = {}
+        for j, kunci in enumerate(AHSP_Engine.KUNCI_HARGA):
+            for i in np.flatnonzero(koef[:, j]):
+                self.harga_ke_kode.setdefault(kunci, {})[AHSP_Engine.KODE[i]] = None
+        self.harga_ke_kode[KUNCI_OVERHEAD] = dict.fromkeys(AHSP_Engine.KODE)
+        self.kode_ke_volume = {}
+        for key, (_, _, kode) in MAP_PEKERJAAN.items():
+            self.kode_ke_volume.setdefault(kode, []).append(key)
+        self.volume_ke_item = {} # kunci volume -> {id: None}
+        self.item_ke_volume = {} # id -> tuple kunci volume (vol > 0.001)
+
+    # --- ITEM ---
+    def pasang_item(self, item_id, vol):
+        self.lepas_item(item_id)
+        kunci = tuple(key for key, val in vol.items() if key in MAP_PEKERJAAN and val > 0.001)
+        self.item_ke_volume[item_id] = kunci
+        for key in kunci: self.volume_ke_item.setdefault(key, {})[item_id] = None
+
+    def lepas_item(self, item_id):
+        for key in self.item_ke_volume.pop(item_id, ()):
+            grup = self.volume_ke_item[key]
+            del grup[item_id]
+            if not grup: del self.volume_ke_item[key]
+
+    # --- QUERY ---
+    @staticmethod
+    def _daftar(kunci):
+        return [kunci] if isinstance(kunci, str) else list(kunci)
+
+    def kode_terdampak(self, kunci_harga):
+        """Kode AHSP yang HSP-nya berubah bila `kunci_harga` (str / list) berubah"""
+        return list(dict.fromkeys(k for h in self._daftar(kunci_harga) for k in self.harga_ke_kode.get(h, ())))
+
+    def volume_terdampak(self, kunci_harga):
+        return [v for k in self.kode_terdampak(kunci_harga) for v in self.kode_ke_volume.get(k, ())]
+
+    def item_terdampak(self, kunci_harga):
+        """Id item yang subtotalnya berubah bila `kunci_harga` berubah (urut id = urut RAB)"""
+        return sorted({i for v in self.volume_terdampak(kunci_harga) for i in self.volume_ke_item.get(v, ())})
+
+    def jalur(self, kunci_harga):
+        """Tabel jalur dependensi: kunci harga -> kode AHSP -> kunci volume -> jumlah item"""
+        baris = [{"Kunci Harga": h, "Kode": k, "Uraian AHSP": AHSP_REGISTRY[k]['uraian'], "Kunci Volume": v,
+                  "Jumlah Item": len(self.volume_ke_item.get(v, ()))}
+                 for h in self._daftar(kunci_harga) for k in self.kode_terdampak(h) for v in self.kode_ke_volume.get(k, ())]
+        return pd.DataFrame(baris, columns=["Kunci Harga", "Kode", "Uraian AHSP", "Kunci Volume", "Jumlah Item"])
+
+class RABInkremental:
+    """HSP & rincian RAB per item yang diperbarui sebagian sesuai graf dependensi"""
+
+    def __init__(self):
+        self.graf = GrafDependensi()
+        self.vektor = None      # Vektor harga per sumber daya (urutan AHSP_Engine.SUMBER_DAYA)
+        self.prices = {}
+        self.overhead = None
+        self.hsp = {}           # kode -> HSP
+        self.map_pekerjaan = {} # kunci volume -> (uraian, sat, kode, HSP), format baris_rincian_rab
+        self.hasil = {}         # id -> (rows, subtotal)
+        self._tampilan = {}     # id -> Styler, dibangun saat item ditampilkan (bagian paling mahal)
+        self._rec = {}          # id -> record ItemStore saat terakhir dihitung
+        self._vol = {}          # id -> dict volume
+        self.terakhir = {"kunci_harga": [], "kode": 0, "item": 0, "item_baru": 0} # Jumlah yang dihitung ulang terakhir
+
+    def _hitung_item(self, item_id):
+        vol = self._vol[item_id]
+        kunci = tuple((key, vol[key], self.map_pekerjaan[key][3]) for key in self.graf.item_ke_volume[item_id])
+        self.hasil[item_id] = baris_rincian_rab(kunci, self.map_pekerjaan)
+        self._tampilan.pop(item_id, None)
+
+    def tampilan(self, item_id):
+        """Tabel ter-format item (None bila item tanpa pekerjaan); di-cache sampai item / harganya berubah"""
+        if item_id not in self._tampilan:
+            rows = self.hasil[item_id][0]
+            self._tampilan[item_id] = tabel_rincian_rab(rows) if rows else None
+        return self._tampilan[item_id]
+
+    def set_harga(self, prices, overhead_pct, turunan=None):
+        """
+        Perbarui harga; hanya HSP & item yang bergantung pada kunci harga yang berubah dihitung ulang.
+        turunan: TurunanHarga bersama (pustaka_harga) untuk harga yang sama -> vektor/HSP dipakai langsung, tidak disalin.
+        """
+        overhead_pct = float(overhead_pct)
+        berubah = [k for k in dict.fromkeys([*prices, *self.prices]) if prices.get(k) != self.prices.get(k)]
+        if overhead_pct != self.overhead: berubah.append(KUNCI_OVERHEAD)
+        self.prices, self.overhead = dict(prices), overhead_pct
+        kode = self.graf.kode_terdampak(berubah)
+        if turunan is not None:
+            self.vektor, self.hsp, self.map_pekerjaan = turunan.vektor, turunan.hsp, turunan.map_pekerjaan
+        elif kode or not isinstance(self.hsp, dict): # Lepas dari tabel bersama (read-only) saat harga sesi di-override
+            self.vektor = np.asarray(AHSP_Engine.vektor_harga(prices))
+            idx = [AHSP_Engine.KODE.index(k) for k in kode]
+            hsp = {**self.hsp, **dict(zip(kode, (AHSP_Engine.MATRIKS_KOEF[idx] @ self.vektor * (1 + overhead_pct/100)).tolist()))}
+            self.hsp = {k: hsp[k] for k in AHSP_Engine.KODE} # Urutan sama dengan tabel_harga_satuan
+            self.map_pekerjaan = {key: (uraian, sat, k, self.hsp[k]) for key, (uraian, sat, k) in MAP_PEKERJAAN.items()}
+        items = [i for i in self.graf.item_terdampak(berubah) if i in self.hasil]
+        for item_id in items: self._hitung_item(item_id)
+        self.terakhir = {"kunci_harga": berubah, "kode": len(kode), "item": len(items), "item_baru": 0}
+        return self.terakhir
+
+    def sinkron(self, store):
+        """Samakan dengan isi ItemStore: hitung item baru/berubah, buang item yang dihapus"""
+        if self.overhead is None: raise RuntimeError("set_harga() harus dipanggil sebelum sinkron()")
+        baru = 0
+        for item_id, rec in store.records():
+            if self._rec.get(item_id) is rec: continue
+            self._rec[item_id] = rec
+            self._vol[item_id] = rec.as_dict()['vol']
+            self.graf.pasang_item(item_id, self._vol[item_id])
+            self._hitung_item(item_id)
+            baru += 1
+        for item_id in [i for i in self._rec if i not in store]:
+            del self._rec[item_id], self._vol[item_id], self.hasil[item_id]
+            self._tampilan.pop(item_id, None)
+            self.graf.lepas_item(item_id)
+        self.terakhir["item_baru"] = baru
+        return baru
+
+    def grand_total(self):
+        return sum(subtotal for _, subtotal in self.hasil.values())
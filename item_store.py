@@ -0,0 +1,220 @@
+import itertools
+import sys
+from collections.abc import Sequence
+
+# ==========================================
+# STORE ITEM PROYEK (DALAM MEMORI, PER SESI)
+# ==========================================
+# Pengganti list of dict di session_state: record ringkas (__slots__) dengan ID stabil,
+# indeks per tipe & nama, ubah/hapus per item O(1). Dict volume/dimensi disimpan sebagai tuple nilai
+# + tuple kunci yang dipakai bersama semua item dengan kunci yang sama (bukan 1 dict per item).
+# Konsumen lama (hitung_rab, Excel, validasi, ...) tetap menerima list of dict lewat to_list();
+# list itu cukup dibangun sekali per rerun dan tidak ikut disimpan di sesi.
+# dari_list menerima iterable apa pun (mis. generator ProjectStore.items()), jadi file besar dimuat
+# per item tanpa list perantara.
+
+_SKEMA = {} # tuple kunci -> instance tuple yang sama (dipakai bersama)
+_VERSI = itertools.count(1) # Versi unik per proses: store lain (mis. file baru dibuka) tidak pernah berbagi versi
+
+class _DictRingkas:
+    __slots__ = ("kunci", "nilai")
+
+    def __init__(self, kunci, nilai):
+        self.kunci, self.nilai = kunci, nilai
+
+def _ringkas(obj):
+    if isinstance(obj, dict):
+        kunci = tuple(obj)
+        return _DictRingkas(_SKEMA.setdefault(kunci, kunci), tuple(_ringkas(v) for v in obj.values()))
+    return obj
+
+def _buka(obj):
+    if isinstance(obj, _DictRingkas): return dict(zip(obj.kunci, map(_buka, obj.nilai)))
+    return obj
+
+class ItemRAB:
+    """1 item proyek (skema rab_proyek.json) dalam bentuk record ringkas"""
+    __slots__ = ("id", "nama", "tipe", "panjang", "vol", "dimensi")
+
+    def __init__(self, item_id, item):
+        self.id = item_id
+        self.nama = item['nama']
+        self.tipe = item['tipe']
+        self.panjang = item.get('panjang', 0) or 0
+        self.vol = _ringkas(item['vol'])
+        self.dimensi = _ringkas(item.get('dimensi'))
+
+    def as_dict(self):
+        item = {"nama": self.nama, "tipe": self.tipe, "panjang": self.panjang, "vol": _buka(self.vol)}
+        if self.dimensi is not None: item["dimensi"] = _buka(self.dimensi)
+        return item
+
+class ItemStore:
+    def __init__(self):
+        self._items = {}     # id -> ItemRAB (urutan sisip = urutan item di RAB)
+        self._per_tipe = {}  # tipe -> {id: None} (set berurutan)
+        self._per_nama = {}  # nama -> [id, ...] (nama hampir selalu unik: list lebih hemat dari dict)
+        self._id_berikut = 1
+        self.versi = next(_VERSI) # Berganti setiap ada perubahan (kunci cache hasil turunan per versi)
+
+    @classmethod
+    def dari_list(cls, data_proyek):
+        store = cls()
+        for item in data_proyek: store.tambah(item)
+        return store
+
+    # --- INDEKS ---
+    @staticmethod
+    def _indeks_tambah(indeks, kunci, item_id):
+        indeks.setdefault(kunci, {})[item_id] = None
+
+    @staticmethod
+    def _indeks_hapus(indeks, kunci, item_id):
+        grup = indeks[kunci]
+        del grup[item_id]
+        if not grup: del indeks[kunci]
+
+    def _nama_tambah(self, nama, item_id):
+        self._per_nama.setdefault(nama, []).append(item_id)
+
+    def _nama_hapus(self, nama, item_id):
+        grup = self._per_nama[nama]
+        grup.remove(item_id)
+        if not grup: del self._per_nama[nama]
+
+    def _berubah(self):
+        self.versi = next(_VERSI)
+
+    # --- OPERASI PER ITEM ---
+    def tambah(self, item):
+        """Append 1 item, kembalikan id-nya (id tidak pernah dipakai ulang)"""
+        item_id = self._id_berikut
+        self._id_berikut += 1
+        rec = ItemRAB(item_id, item)
+        self._items[item_id] = rec
+        self._indeks_tambah(self._per_tipe, rec.tipe, item_id)
+        self._nama_tambah(rec.nama, item_id)
+        self._berubah()
+        return item_id
+
+    def ubah(self, item_id, item):
+        """Ganti isi item `item_id` (posisi di RAB tetap)"""
+        lama = self._items[item_id]
+        baru = ItemRAB(item_id, item)
+        if baru.tipe != lama.tipe:
+            self._indeks_hapus(self._per_tipe, lama.tipe, item_id)
+            self._indeks_tambah(self._per_tipe, baru.tipe, item_id)
+        if baru.nama != lama.nama:
+            self._nama_hapus(lama.nama, item_id)
+            self._nama_tambah(baru.nama, item_id)
+        self._items[item_id] = baru
+        self._berubah()
+
+    def hapus(self, item_id):
+        rec = self._items.pop(item_id)
+        self._indeks_hapus(self._per_tipe, rec.tipe, item_id)
+        self._nama_hapus(rec.nama, item_id)
+        self._berubah()
+
+    def kosongkan(self):
+        self._items.clear(); self._per_tipe.clear(); self._per_nama.clear()
+        self._berubah()
+
+    def ambil(self, item_id):
+        return self._items[item_id].as_dict()
+
+    # --- TAMPILAN TERFILTER ---
+    def tipe(self):
+        return list(self._per_tipe)
+
+    def ids(self, tipe=None, cari=""):
+        """ID item berurutan; filter tipe (str / list) & potongan nama (tanpa beda huruf besar/kecil)"""
+        # id naik sesuai urutan sisip & posisi tidak pernah berubah, jadi urut id = urut RAB
+        if tipe is None and not cari: return list(self._items)
+        if tipe is None: pilih = None
+        else:
+            daftar = [tipe] if isinstance(tipe, str) else tipe
+            pilih = set().union(*(self._per_tipe.get(t, {}) for t in daftar))
+        if cari:
+            teks = cari.lower()
+            cocok = set().union(*(grup for nama, grup in self._per_nama.items() if teks in nama.lower()))
+            pilih = cocok if pilih is None else pilih & cocok
+        return sorted(pilih)
+
+    def records(self):
+        """(id, ItemRAB) berurutan; ubah() selalu mengganti record, jadi identitas objek menandai perubahan"""
+        return self._items.items()
+
+    def posisi(self):
+        """id -> nomor urut item di RAB (1, 2, ...)"""
+        return {item_id: n for n, item_id in enumerate(self._items, 1)}
+
+    def items(self, ids=None):
+        """Iterasi dict item (skema rab_proyek.json) berurutan, semua item atau hanya `ids`; dibangun saat dibaca"""
+        if ids is None: return (rec.as_dict() for rec in self._items.values())
+        return (self._items[i].as_dict() for i in ids)
+
+    def to_list(self, ids=None):
+        """List of dict (skema rab_proyek.json), semua item atau hanya `ids`"""
+        return list(self.items(ids))
+
+    def urutan(self):
+        """Sequence dict item read-only (len, indeks, slice) tanpa membangun list; item dibangun saat dibaca"""
+        return UrutanItem(self)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def __bool__(self):
+        return bool(self._items)
+
+    # --- JEJAK MEMORI ---
+    def jejak_memori(self):
+        """Ukuran (byte) record & indeks store; dibandingkan dengan list of dict biasa (skema lama)"""
+        seen = set(map(id, _SKEMA.values())) # Skema kunci dipakai bersama, tidak dihitung per sesi
+        record = ukuran_objek(self._items, seen)
+        indeks = ukuran_objek(self._per_tipe, seen) + ukuran_objek(self._per_nama, seen)
+        return {"jumlah_item": len(self), "record": record, "indeks": indeks,
+                "total": record + indeks, "list_of_dict": ukuran_objek(self.to_list())}
+
+class UrutanItem(Sequence):
+    """Tampilan urutan ItemStore untuk konsumen yang butuh data_proyek[i] / data_proyek[a:b] (mis. tabel per halaman)"""
+    __slots__ = ("_store",)
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __iter__(self):
+        return self._store.items()
+
+    def __getitem__(self, i):
+        rentang = range(len(self._store))[i] # Indeks negatif / slice dinormalisasi, IndexError seperti list
+        if isinstance(rentang, int): return next(itertools.islice(self._store._items.values(), rentang, None)).as_dict()
+        if rentang.step < 0: return [self[j] for j in rentang]
+        return [rec.as_dict() for rec in itertools.islice(self._store._items.values(), rentang.start, rentang.stop, rentang.step)]
+
+def ukuran_objek(obj, seen=None):
+    """Perkiraan ukuran (byte) objek beserta isinya; objek yang sama hanya dihitung sekali"""
+    seen = set() if seen is None else seen
+    total, tumpukan = 0, [obj]
+    while tumpukan:
+        o = tumpukan.pop()
+        if id(o) in seen: continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict): tumpukan.extend(o.keys()); tumpukan.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)): tumpukan.extend(o)
+        elif hasattr(o, "__slots__"): tumpukan.extend(getattr(o, s) for s in o.__slots__ if hasattr(o, s))
+    return total
+
+def jejak_memori_sesi(state):
+    """Ukuran tiap kunci session_state (byte), terbesar dulu"""
+    seen = set()
+    baris = [{"kunci": k, "byte": ukuran_objek(v, seen)} for k, v in state.items()]
+    return sorted(baris, key=lambda r: r["byte"], reverse=True)
@@ -0,0 +1,179 @@
+import bisect
+from collections import Counter
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# JADWAL PEMBESIAN (BAR BENDING SCHEDULE) & OPTIMASI POTONG
+# ==========================================
+# 1. Bar mark, panjang potong & jumlah batang per item dari item['dimensi'] (dia, jarak, lapis)
+#    untuk Saluran Beton (tulangan U melintang + memanjang) dan Gorong-Gorong Box (sengkang keliling + memanjang).
+# 2. Cutting stock 1D terhadap besi stok 12 m per diameter: Best Fit Decreasing yang dikelompokkan per panjang
+#    potong (potongan identik diisi sekaligus ke batang yang paling pas), sehingga ratusan ribu batang selesai
+#    dalam hitungan milidetik. Hasilnya sisa potong (waste) nyata, bukan asumsi faktor 1.2 / waste %.
+
+PANJANG_STOK = 12.0   # m
+KAIT_D = 12           # Panjang kait tiap ujung = 12 x diameter
+SAMBUNGAN_D = 40      # Panjang sambungan lewatan = 40 x diameter
+LAPIS_SALURAN = 2     # Sama dengan konstanta lapis Saluran Beton (rab_engine.TIPE_SEGMEN)
+LAPIS_BOX = 2
+KOLOM_BBS = ["No", "Item", "Tipe", "Mark", "Uraian", "Dia (mm)", "Panjang Potong (m)", "Jumlah", "Panjang Total (m)", "Berat (kg)"]
+
+def berat_per_m(dia):
+    """kg/m besi beton (0.006165 x d^2, sama dengan rab_engine)"""
+    return 0.006165 * np.asarray(dia, dtype=float)**2
+
+def _tabel_dimensi(data_proyek, tipe):
+    baris = [{"No": i + 1, "Item": item['nama'], "Tipe": tipe, **item['dimensi']}
+             for i, item in enumerate(data_proyek) if item['tipe'] == tipe and item.get('dimensi')]
+    return pd.DataFrame(baris)
+
+def _mark(df, mark, uraian, panjang, jumlah):
+    jumlah = np.asarray(jumlah, dtype=float)
+    ok = (jumlah > 0) & (np.asarray(panjang) > 0)
+    return pd.DataFrame({
+        "No": df["No"], "Item": df["Item"], "Tipe": df["Tipe"], "Mark": mark, "Uraian": uraian,
+        "Dia (mm)": df["dia"].astype(float), "Panjang Potong (m)": panjang, "Jumlah": jumlah,
+    })[ok]
+
+def _pecah_sambungan(df, panjang_stok):
+    """Batang lebih panjang dari stok dipecah: (n-1) batang penuh + 1 sisa, tiap sambungan lewatan 40d"""
+    panjang = df["Panjang Potong (m)"].to_numpy()
+    lewat = SAMBUNGAN_D * df["Dia (mm)"].to_numpy() / 1000
+    panjang_bersih = panjang_stok - lewat
+    n = np.where(panjang > panjang_stok, np.ceil((panjang - lewat) / panjang_bersih), 1).astype(int)
+    akhir = panjang - (n - 1) * panjang_bersih
+    penuh = df[n > 1].assign(**{"Mark": lambda d: d["Mark"] + "-a", "Panjang Potong (m)": panjang_stok,
+                                "Jumlah": df["Jumlah"][n > 1] * (n[n > 1] - 1)})
+    sisa = df.assign(**{"Mark": np.where(n > 1, df["Mark"] + "-b", df["Mark"]), "Panjang Potong (m)": akhir})
+    return pd.concat([penuh, sisa]).sort_index(kind="stable")
+
+def buat_bbs(data_proyek, panjang_stok=PANJANG_STOK):
+    """
+    Bar bending schedule seluruh proyek (1 baris = 1 bar mark per item), kolom KOLOM_BBS.
+    Hanya item dengan data dimensi (Saluran Beton, Gorong-Gorong Box); batang > panjang stok dipecah dengan sambungan.
+    """
+    bagian = []
+    beton = _tabel_dimensi(data_proyek, "Saluran Beton")
+    if not beton.empty:
+        d = beton["dia"] / 1000
+        keliling = beton["b"] + 2 * beton["h"] * np.sqrt(1 + beton["m"]**2)
+        n_melintang = np.floor(beton["panjang"] * 100 / beton["jarak"] + 1) * LAPIS_SALURAN
+        n_memanjang = np.floor(keliling * 100 / beton["jarak"] + 1) * LAPIS_SALURAN
+        bagian += [
+            _mark(beton, "S1", "Tulangan U melintang", keliling + 2 * KAIT_D * d, n_melintang),
+            _mark(beton, "S2", "Tulangan memanjang", beton["panjang"], n_memanjang),
+        ]
+    box = _tabel_dimensi(data_proyek, "Gorong-Gorong Box")
+    if not box.empty:
+        d = box["dia"] / 1000
+        t_m = box["t_cm"] / 100
+        keliling = 2 * ((box["w"] + 2 * t_m) + (box["h"] + 2 * t_m))
+        n_sengkang = np.floor(box["panjang"] * 100 / box["jarak"] + 1) * LAPIS_BOX
+        n_memanjang = np.floor(keliling * 100 / box["jarak"]) * LAPIS_BOX
+        bagian += [
+            _mark(box, "K1", "Tulangan keliling (tertutup)", keliling + SAMBUNGAN_D * d, n_sengkang),
+            _mark(box, "K2", "Tulangan memanjang", box["panjang"], n_memanjang),
+        ]
+    if not bagian: return pd.DataFrame(columns=KOLOM_BBS)
+    df = _pecah_sambungan(pd.concat(bagian, ignore_index=True), panjang_stok)
+    df["Panjang Potong (m)"] = np.ceil(df["Panjang Potong (m)"].to_numpy() * 1000 - 1e-6) / 1000 # Dibulatkan ke atas per mm
+    df["Panjang Total (m)"] = df["Panjang Potong (m)"] * df["Jumlah"]
+    df["Berat (kg)"] = df["Panjang Total (m)"] * berat_per_m(df["Dia (mm)"])
+    return df.sort_values(["No", "Mark"], kind="stable")[KOLOM_BBS].reset_index(drop=True)
+
+# --- CUTTING STOCK 1D ---
+def _bfd_kelompok(potongan, stok, kerf):
+    """
+    Best Fit Decreasing untuk {panjang potong (mm): jumlah}. Batang terbuka dikelompokkan per sisa panjang:
+    sisa -> [[pola, jumlah batang], ...]. Potongan identik diisi sekaligus (q = (sisa + kerf) // (panjang + kerf)),
+    setara BFD satu per satu karena batang yang sama tetap paling pas sampai tidak muat lagi.
+    Sisa dicatat dengan kerf setelah tiap potongan; potongan terakhir tidak perlu kerf, jadi batang masih muat
+    1 potongan L selama sisa >= L (sama dengan batang baru: (stok + kerf) // (L + kerf)).
+    Return: list (pola tuple panjang potong, jumlah batang stok, sisa mm)
+    """
+    sisa = {}
+    kunci = [] # sisa panjang terurut (untuk bisect)
+
+    def simpan(r, pola, n):
+        if r not in sisa:
+            sisa[r] = []
+            bisect.insort(kunci, r)
+        sisa[r].append([pola, n])
+
+    for L, c in sorted(potongan.items(), reverse=True):
+        Lk = L + kerf
+        if Lk > stok + kerf: raise ValueError(f"Potongan {L} mm lebih panjang dari stok {stok} mm")
+        while c > 0:
+            j = bisect.bisect_left(kunci, L)
+            if j == len(kunci):
+                # Buka batang stok baru: q potongan per batang
+                q = (stok + kerf) // Lk
+                penuh, lebih = divmod(c, q)
+                if penuh: simpan(stok - q * Lk, (L,) * q, penuh)
+                if lebih: simpan(stok - lebih * Lk, (L,) * lebih, 1)
+                break
+            r = kunci[j]
+            q = (r + kerf) // Lk
+            grup = sisa[r]
+            pola, n = grup[-1]
+            pakai = min(n, -(-c // q))
+            if pakai == n:
+                grup.pop()
+                if not grup:
+                    del sisa[r]
+                    kunci.pop(j)
+            else:
+                grup[-1][1] -= pakai
+            # pakai batang: semua terisi q potongan, kecuali mungkin yang terakhir
+            isi_akhir = c - (pakai - 1) * q if c < pakai * q else q
+            if pakai > 1 or isi_akhir == q: simpan(r - q * Lk, pola + (L,) * q, pakai - (isi_akhir != q))
+            if isi_akhir != q: simpan(r - isi_akhir * Lk, pola + (L,) * isi_akhir, 1)
+            c -= min(c, pakai * q)
+    # Sisa negatif (-kerf) = potongan terakhir pas di ujung batang, tidak perlu kerf
+    return [(pola, n, max(r, 0)) for r, grup in sisa.items() for pola, n in grup]
+
+def optimasi_potong(df_bbs, panjang_stok=PANJANG_STOK, kerf_mm=0):
+    """
+    Cutting stock per diameter terhadap batang stok `panjang_stok` m.
+    Return: {"ringkasan": per diameter (jumlah stok, panjang terpakai, sisa, waste %, berat),
+             "pola": pola potong (potongan per batang, jumlah batang, sisa per batang)}
+    """
+    stok = int(round(panjang_stok * 1000))
+    ringkasan, pola_semua = [], []
+    for dia, grup in df_bbs.groupby("Dia (mm)"):
+        mm = np.rint(grup["Panjang Potong (m)"].to_numpy() * 1000).astype(int)
+        jumlah = grup["Jumlah"].to_numpy().astype(int)
+        potongan = pd.Series(jumlah).groupby(mm).sum()
+        hasil = _bfd_kelompok(dict(zip(potongan.index.tolist(), potongan.tolist())), stok, int(kerf_mm))
+        n_stok = sum(n for _, n, _ in hasil)
+        terpakai = float((mm * jumlah).sum()) / 1000
+        total_stok = n_stok * panjang_stok
+        ringkasan.append({
+            "Dia (mm)": dia, "Jumlah Potongan": int(jumlah.sum()), "Batang Stok": n_stok,
+            "Panjang Stok (m)": total_stok, "Panjang Terpakai (m)": terpakai, "Sisa Potong (m)": total_stok - terpakai,
+            "Waste (%)": (1 - terpakai / total_stok) * 100 if total_stok else 0.0,
+            "Berat Stok (kg)": total_stok * float(berat_per_m(dia)),
+        })
+        for pola, n, r in hasil:
+            hitung = Counter(pola)
+            pola_semua.append({
+                "Dia (mm)": dia, "Pola Potong": " + ".join(f"{k}x{L/1000:.3f}" for L, k in sorted(hitung.items(), reverse=True)),
+                "Jumlah Batang": n, "Sisa per Batang (m)": r / 1000,
+            })
+    kolom_pola = ["Dia (mm)", "Pola Potong", "Jumlah Batang", "Sisa per Batang (m)"]
+    pola = pd.DataFrame(pola_semua, columns=kolom_pola)
+    if not pola.empty:
+        pola = pola.groupby(["Dia (mm)", "Pola Potong", "Sisa per Batang (m)"], as_index=False)["Jumlah Batang"].sum()[kolom_pola]
+        pola = pola.sort_values(["Dia (mm)", "Jumlah Batang"], ascending=[True, False], ignore_index=True)
+    return {"ringkasan": pd.DataFrame(ringkasan), "pola": pola}
+
+def ekspor_bbs_excel(df_bbs, hasil_potong):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        hasil_potong["ringkasan"].to_excel(writer, sheet_name='Ringkasan Potong', index=False)
+        hasil_potong["pola"].to_excel(writer, sheet_name='Pola Potong', index=False)
+        df_bbs.to_excel(writer, sheet_name='Bar Bending Schedule', index=False)
+    return output.getvalue()
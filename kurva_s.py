@@ -0,0 +1,186 @@
+import heapq
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, matriks_volume
+
+# ==========================================
+# PENJADWALAN & KURVA S (BOBOT BIAYA MINGGUAN)
+# ==========================================
+# 1. Kebutuhan tenaga per item = Kuantitas [item x kode] @ Koefisien AHSP (kolom Pekerja, Tukang *, Mandor) dalam OH.
+# 2. Durasi item (hari kerja) = OH / orang per regu, diambil yang terlama antar jenis tenaga (1 item = 1 regu).
+# 3. Jumlah regu paralel dibatasi kapasitas tenaga lapangan per hari; item dijadwalkan berurutan topologis
+#    (pendahulu harus selesai) ke regu yang paling cepat kosong (list scheduling, heap).
+# 4. Biaya & OH tiap item dibagi rata selama durasinya: array selisih per hari (np.add.at) -> cumsum -> jumlah
+#    per minggu -> bobot (%) & kumulatif (%) Kurva S. Tanpa loop per hari / per minggu.
+# Penjadwalan ulang (item berubah) cukup memanggil susun_jadwal lagi: O(n log regu), ribuan item < 0.1 detik.
+
+HARI_KERJA_MINGGU = 6
+# Jenis tenaga -> nama sumber daya AHSP
+KELOMPOK_TENAGA = {
+    "Pekerja": ("Pekerja",),
+    "Tukang": ("Tukang Batu", "Tukang Besi", "Tukang Kayu"),
+    "Mandor": ("Mandor",),
+}
+REGU_DEFAULT = {"Pekerja": 10, "Tukang": 4, "Mandor": 1}        # orang per regu
+KAPASITAS_DEFAULT = {"Pekerja": 60, "Tukang": 24, "Mandor": 6}  # orang di lapangan per hari
+MODE_PENDAHULU = ("Paralel", "Berurutan per Tipe", "Berurutan")
+KOLOM_JADWAL = ["No", "Item", "Tipe", "Biaya (Rp)", "Pekerja (OH)", "Tukang (OH)", "Mandor (OH)",
+                "Durasi (hari)", "Mulai (hari)", "Selesai (hari)", "Minggu Mulai", "Minggu Selesai", "Regu", "Pendahulu"]
+
+_IDX_TENAGA = {k: [AHSP_Engine.SUMBER_DAYA.index(n) for n in nama if n in AHSP_Engine.SUMBER_DAYA]
+               for k, nama in KELOMPOK_TENAGA.items()}
+
+def kebutuhan_tenaga(data_proyek, kuantitas=None):
+    """OH per item [item x KELOMPOK_TENAGA] dari koefisien AHSP"""
+    kuantitas = matriks_volume(data_proyek) if kuantitas is None else kuantitas
+    sumber_daya = kuantitas @ AHSP_Engine.MATRIKS_KOEF
+    return np.column_stack([sumber_daya[:, idx].sum(axis=1) for idx in _IDX_TENAGA.values()])
+
+def pendahulu_otomatis(data_proyek, mode="Paralel"):
+    """Pendahulu (indeks 0-based) per item: Paralel = tanpa; Berurutan per Tipe = item sebelumnya bertipe sama"""
+    if mode not in MODE_PENDAHULU: raise ValueError(f"Mode tidak dikenal: {mode} (pilihan: {', '.join(MODE_PENDAHULU)})")
+    if mode == "Paralel": return [[] for _ in data_proyek]
+    if mode == "Berurutan": return [[i - 1] if i else [] for i in range(len(data_proyek))]
+    terakhir, hasil = {}, []
+    for i, item in enumerate(data_proyek):
+        hasil.append([terakhir[item['tipe']]] if item['tipe'] in terakhir else [])
+        terakhir[item['tipe']] = i
+    return hasil
+
+def pendahulu_dari_teks(teks):
+    """Teks pendahulu dari tabel UI: "1, 3" (No item, 1-based) -> [0, 2]"""
+    if teks is None or (isinstance(teks, float) and np.isnan(teks)): return []
+    try:
+        return [int(float(t)) - 1 for t in str(teks).replace(";", ",").split(",") if t.strip()]
+    except ValueError:
+        raise ValueError(f"Pendahulu harus No item dipisah koma, bukan '{teks}'") from None
+
+def _urutan_topologis(pendahulu):
+    """Urutan item (Kahn, prioritas No terkecil); ValueError bila ada ketergantungan melingkar"""
+    n = len(pendahulu)
+    sisa = [len(p) for p in pendahulu]
+    penerus = [[] for _ in range(n)]
+    for i, p in enumerate(pendahulu):
+        for j in p: penerus[j].append(i)
+    antre = [i for i in range(n) if sisa[i] == 0]
+    heapq.heapify(antre)
+    urut = []
+    while antre:
+        i = heapq.heappop(antre)
+        urut.append(i)
+        for k in penerus[i]:
+            sisa[k] -= 1
+            if sisa[k] == 0: heapq.heappush(antre, k)
+    if len(urut) < n:
+        melingkar = [i + 1 for i in range(n) if sisa[i] > 0]
+        raise ValueError(f"Ketergantungan melingkar pada item No: {', '.join(map(str, melingkar[:10]))}")
+    return urut
+
+def jumlah_regu(regu=REGU_DEFAULT, kapasitas=KAPASITAS_DEFAULT):
+    """Regu yang bisa bekerja paralel = min(kapasitas / orang per regu) antar jenis tenaga (minimal 1)"""
+    return max(1, min(int(kapasitas[k] // regu[k]) for k in KELOMPOK_TENAGA if regu.get(k, 0) > 0))
+
+def susun_jadwal(data_proyek, tabel_hsp, pendahulu=None, regu=REGU_DEFAULT, kapasitas=KAPASITAS_DEFAULT,
+                 biaya=None, hari_kerja_minggu=HARI_KERJA_MINGGU):
+    """
+    Jadwal item + seri mingguan Kurva S.
+    pendahulu: list (per item) indeks item 0-based yang harus selesai dulu (default: tanpa ketergantungan).
+    biaya: biaya per item (mis. subtotal RABInkremental); default Kuantitas @ HSP (sebelum PPN).
+    Return: {"jadwal": DataFrame KOLOM_JADWAL, "mingguan": DataFrame, "durasi_hari", "durasi_minggu", "regu"}
+    """
+    n = len(data_proyek)
+    pendahulu = [[] for _ in range(n)] if pendahulu is None else [sorted(set(p)) for p in pendahulu]
+    if len(pendahulu) != n: raise ValueError("Panjang daftar pendahulu harus sama dengan jumlah item")
+    for i, p in enumerate(pendahulu):
+        salah = [j + 1 for j in p if not 0 <= j < n or j == i]
+        if salah: raise ValueError(f"Pendahulu tidak valid untuk item No {i + 1}: {salah}")
+
+    kuantitas = matriks_volume(data_proyek)
+    oh = kebutuhan_tenaga(data_proyek, kuantitas)
+    if biaya is None: biaya = kuantitas @ np.array([tabel_hsp[k] for k in AHSP_Engine.KODE])
+    biaya = np.asarray(biaya, dtype=float).reshape(n)
+    per_regu = np.array([regu[k] for k in KELOMPOK_TENAGA], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hari = np.where(per_regu > 0, oh / per_regu, 0.0).max(axis=1) if n else np.zeros(0)
+    ada = (biaya > 0) | (oh.sum(axis=1) > 0) if n else np.zeros(0, dtype=bool)
+    durasi = np.where(ada, np.maximum(1, np.ceil(hari - 1e-9)), 0).astype(int)
+
+    # List scheduling: regu paling cepat kosong, mulai setelah semua pendahulu selesai
+    n_regu = jumlah_regu(regu, kapasitas)
+    kosong = [(0, r) for r in range(n_regu)]
+    mulai, selesai, nomor_regu = np.zeros(n, dtype=int), np.zeros(n, dtype=int), np.zeros(n, dtype=int)
+    for i in _urutan_topologis(pendahulu):
+        siap = max((selesai[j] for j in pendahulu[i]), default=0)
+        if durasi[i] == 0:
+            mulai[i] = selesai[i] = siap
+            continue
+        t_kosong, r = heapq.heappop(kosong)
+        mulai[i] = max(siap, t_kosong)
+        selesai[i] = mulai[i] + durasi[i]
+        nomor_regu[i] = r + 1
+        heapq.heappush(kosong, (selesai[i], r))
+
+    jadwal = pd.DataFrame({
+        "No": np.arange(1, n + 1), "Item": [item['nama'] for item in data_proyek], "Tipe": [item['tipe'] for item in data_proyek],
+        "Biaya (Rp)": biaya, **{f"{k} (OH)": oh[:, j] for j, k in enumerate(KELOMPOK_TENAGA)},
+        "Durasi (hari)": durasi, "Mulai (hari)": mulai, "Selesai (hari)": selesai,
+        "Minggu Mulai": mulai // hari_kerja_minggu + 1, "Minggu Selesai": np.maximum(selesai - 1, mulai) // hari_kerja_minggu + 1,
+        "Regu": nomor_regu, "Pendahulu": [", ".join(str(j + 1) for j in p) for p in pendahulu],
+    }, columns=KOLOM_JADWAL)
+    mingguan = seri_mingguan(mulai, durasi, biaya, oh, hari_kerja_minggu)
+    return {"jadwal": jadwal, "mingguan": mingguan, "durasi_hari": int(selesai.max()) if n else 0,
+            "durasi_minggu": len(mingguan), "regu": n_regu}
+
+def seri_mingguan(mulai, durasi, biaya, oh, hari_kerja_minggu=HARI_KERJA_MINGGU):
+    """Biaya & OH dibagi rata per hari kerja tiap item, dijumlah per minggu; bobot & kumulatif (%) Kurva S"""
+    aktif = durasi > 0
+    n_hari = int((mulai + durasi)[aktif].max()) if aktif.any() else 0
+    n_minggu = -(-n_hari // hari_kerja_minggu)
+    nilai = np.column_stack([biaya, oh])[aktif] / durasi[aktif, None] # Laju per hari
+    delta = np.zeros((n_minggu * hari_kerja_minggu + 1, nilai.shape[1]))
+    np.add.at(delta, mulai[aktif], nilai)
+    np.add.at(delta, (mulai + durasi)[aktif], -nilai)
+    harian = np.cumsum(delta[:-1], axis=0).reshape(n_minggu, hari_kerja_minggu, nilai.shape[1])
+    per_minggu = harian.sum(axis=1)
+    total = per_minggu[:, 0].sum()
+    bobot = per_minggu[:, 0] / total * 100 if total else np.zeros(n_minggu)
+    df = pd.DataFrame({
+        "Minggu": np.arange(1, n_minggu + 1),
+        "Biaya (Rp)": per_minggu[:, 0],
+        "Biaya Kumulatif (Rp)": np.cumsum(per_minggu[:, 0]),
+        "Bobot (%)": bobot,
+        "Kumulatif (%)": np.minimum(np.cumsum(bobot), 100.0),
+    })
+    for j, k in enumerate(KELOMPOK_TENAGA, start=1):
+        df[f"{k} (OH)"] = per_minggu[:, j]
+        df[f"{k} Maks (org/hari)"] = np.ceil(harian[:, :, j].max(axis=1) - 1e-9)
+    return df
+
+def ekspor_kurva_s_excel(hasil):
+    """Workbook Kurva S: tabel mingguan + grafik (bobot kolom, kumulatif garis) & jadwal per item"""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        mingguan = hasil["mingguan"]
+        mingguan.to_excel(writer, sheet_name='Kurva S', index=False)
+        hasil["jadwal"].to_excel(writer, sheet_name='Jadwal Item', index=False)
+        n = len(mingguan)
+        if n:
+            wb, ws = writer.book, writer.sheets['Kurva S']
+            kolom = {k: mingguan.columns.get_loc(k) for k in ("Minggu", "Bobot (%)", "Kumulatif (%)")}
+            grafik = wb.add_chart({'type': 'column'})
+            grafik.add_series({'name': 'Bobot Mingguan (%)', 'categories': ['Kurva S', 1, kolom["Minggu"], n, kolom["Minggu"]],
+                               'values': ['Kurva S', 1, kolom["Bobot (%)"], n, kolom["Bobot (%)"]]})
+            garis = wb.add_chart({'type': 'line'})
+            garis.add_series({'name': 'Kumulatif (%)', 'categories': ['Kurva S', 1, kolom["Minggu"], n, kolom["Minggu"]],
+                              'values': ['Kurva S', 1, kolom["Kumulatif (%)"], n, kolom["Kumulatif (%)"]], 'y2_axis': True})
+            grafik.combine(garis)
+            grafik.set_title({'name': 'Kurva S'})
+            grafik.set_x_axis({'name': 'Minggu'})
+            grafik.set_y_axis({'name': 'Bobot (%)'})
+            garis.set_y2_axis({'name': 'Kumulatif (%)', 'min': 0, 'max': 100})
+            grafik.set_size({'width': 900, 'height': 420})
+            ws.insert_chart(1, len(mingguan.columns) + 1, grafik)
+    return output.getvalue()
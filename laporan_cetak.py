@@ -0,0 +1,332 @@
+import time
+import zlib
+from functools import lru_cache
+
+from rab_engine import AHSP_Engine, TARIF_PPN, generate_breakdown, hitung_rab
+
+# ==========================================
+# LAPORAN CETAK PDF (STREAMING, PER HALAMAN)
+# ==========================================
+# Rekap RAB, RAB Detail per item, Analisa AHSP (Formulir Tab 4) & Back-Up Volume (generate_breakdown)
+# ditata menjadi halaman A4 di server, tanpa browser (pengganti Ctrl + P untuk proyek besar).
+#   halaman_laporan(...) : generator isi halaman (content stream PDF), item dihitung satu per satu
+#   PDFStream            : penulis PDF minimal (font standar Helvetica, tanpa dependensi); tiap halaman langsung
+#                          ditulis ke file & dibuang, yang disimpan hanya offset objek (xref).
+# Memori terbatas 1 halaman + 1 item, jadi laporan ribuan halaman aman ditulis ke file dari CLI.
+
+A4 = (595.28, 841.89)   # pt
+MARGIN = 36.0
+UKURAN_HURUF = 8.0
+SPASI_BARIS = 10.0
+PADDING_SEL = 2.5
+BAGIAN_LAPORAN = ("rekap", "detail", "analisa", "backup")
+
+# Lebar karakter Helvetica (1/1000 em) untuk ASCII 32..126 (AFM standar); karakter lain dianggap 556
+_LEBAR_HELVETICA = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+FAKTOR_TEBAL = 1.06 # Helvetica-Bold sedikit lebih lebar (angka & tanda baca sama lebar)
+_LEBAR_BYTE = [556] * 32 + _LEBAR_HELVETICA + [556] * 129 # Diindeks byte cp1252
+
+@lru_cache(maxsize=65536)
+def _lebar_em(teks):
+    return sum(map(_LEBAR_BYTE.__getitem__, teks.encode("cp1252", errors="replace")))
+
+def lebar_teks(teks, ukuran=UKURAN_HURUF, tebal=False):
+    lebar = _lebar_em(teks) * ukuran / 1000
+    return lebar * FAKTOR_TEBAL if tebal else lebar
+
+def _pdf_str(teks):
+    """String literal PDF (WinAnsi/cp1252); karakter di luar cp1252 (emoji, dsb.) menjadi '?'"""
+    b = str(teks).encode("cp1252", errors="replace")
+    return b"(" + b.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def _bungkus(teks, lebar, ukuran=UKURAN_HURUF, tebal=False):
+    """Pecah teks menjadi baris-baris yang muat di `lebar` pt (per kata; kata terlalu panjang dipotong per huruf)"""
+    teks = str(teks)
+    if lebar_teks(teks, ukuran, tebal) <= lebar: return [teks] # Sebagian besar sel muat 1 baris
+    baris, kini = [], ""
+    for kata in teks.split():
+        calon = f"{kini} {kata}" if kini else kata
+        if lebar_teks(calon, ukuran, tebal) <= lebar:
+            kini = calon
+            continue
+        if kini: baris.append(kini)
+        kini = kata
+        while lebar_teks(kini, ukuran, tebal) > lebar and len(kini) > 1:
+            n = len(kini) - 1
+            while n > 1 and lebar_teks(kini[:n], ukuran, tebal) > lebar: n -= 1
+            baris.append(kini[:n])
+            kini = kini[n:]
+    return baris + [kini] if kini or not baris else baris
+
+# --- PENULIS PDF MINIMAL ---
+class PDFStream:
+    """
+    PDF 1.4 yang ditulis berurutan ke `output` (path atau file biner, mis. BytesIO).
+    Objek 1-4 (Catalog, Pages, 2 font) dipesan di awal; Catalog & Pages ditulis saat tutup().
+    """
+
+    def __init__(self, output, ukuran=A4, judul=""):
+        self._milik = isinstance(output, str)
+        self.f = open(output, "wb") if self._milik else output
+        self.ukuran = ukuran
+        self.judul = judul
+        self.posisi = 0
+        self.offset = {}    # nomor objek -> offset byte (xref)
+        self.halaman = []   # nomor objek Page
+        self._nomor = 4
+        self._tulis(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._objek(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._objek(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    def _tulis(self, data):
+        self.f.write(data)
+        self.posisi += len(data)
+
+    def _baru(self):
+        self._nomor += 1
+        return self._nomor
+
+    def _objek(self, nomor, isi):
+        self.offset[nomor] = self.posisi
+        self._tulis(b"%d 0 obj\n" % nomor + isi + b"\nendobj\n")
+
+    def tambah_halaman(self, isi):
+        """Tulis 1 halaman dari content stream (bytes) dan lepaskan dari memori"""
+        data = zlib.compress(isi)
+        konten, hal = self._baru(), self._baru()
+        self._objek(konten, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+        self._objek(hal, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Contents %d 0 R "
+                         b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (*self.ukuran, konten))
+        self.halaman.append(hal)
+
+    def tutup(self):
+        self._objek(2, b"<< /Type /Pages /Count %d /Kids [" % len(self.halaman)
+                    + b" ".join(b"%d 0 R" % h for h in self.halaman) + b"] >>")
+        self._objek(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        info = self._baru()
+        self._objek(info, b"<< /Title " + _pdf_str(self.judul) + b" /Producer (BIM-RAB) >>")
+        awal_xref = self.posisi
+        n = self._nomor + 1
+        self._tulis(b"xref\n0 %d\n0000000000 65535 f \n" % n)
+        self._tulis(b"".join(b"%010d 00000 n \n" % self.offset[i] for i in range(1, n)))
+        self._tulis(b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (n, info, awal_xref))
+        if self._milik: self.f.close()
+        return len(self.halaman)
+
+# --- TATA LETAK HALAMAN ---
+# Kolom tabel: (judul, lebar pt, rata "L"/"R", format angka atau None)
+KOLOM_REKAP = [("No", 30, "R", "{:d}"), ("Item Pekerjaan", 233, "L", None), ("Tipe", 135, "L", None), ("Jumlah Harga (Rp)", 125, "R", "{:,.0f}")]
+KOLOM_DETAIL = [("Kode", 52, "L", None), ("Uraian", 185, "L", None), ("Vol", 62, "R", "{:,.3f}"), ("Sat", 34, "L", None),
+                ("H.Sat (Rp)", 90, "R", "{:,.0f}"), ("Total (Rp)", 100, "R", "{:,.0f}")]
+KOLOM_ANALISA = [("Uraian", 160, "L", None), ("Koefisien", 55, "R", "{:.4f}"), ("Satuan", 38, "L", None),
+                 ("Harga Satuan (Rp)", 92, "R", "{:,.2f}"), ("Jumlah Harga (Rp)", 100, "R", "{:,.2f}"), ("Kategori", 78, "L", None)]
+KOLOM_BACKUP = [("Kode", 55, "L", None), ("Uraian Pekerjaan", 140, "L", None), ("Perhitungan / Rumus", 213, "L", None),
+                ("Volume", 70, "R", "{:,.3f}"), ("Satuan", 45, "L", None)]
+
+class _PenataHalaman:
+    """Menata elemen (judul, teks, tabel, baris) ke halaman; header tabel diulang di halaman berikutnya"""
+
+    def __init__(self, judul, ukuran=A4):
+        self.judul_laporan = judul
+        self.lebar, self.tinggi = ukuran
+        self.nomor = 0
+        self.bagian = ""
+        self.kolom = None
+        self.isi = None
+        self.siap = [] # Halaman selesai yang belum diambil generator
+
+    # --- HALAMAN ---
+    def _buka(self):
+        self.nomor += 1
+        self.isi = [b"0.5 w\n"]
+        self.y = self.tinggi - MARGIN
+        self._teks(MARGIN, self.y - 8, self.judul_laporan, 8, tebal=True)
+        self._teks_kanan(self.lebar - MARGIN, self.y - 8, self.bagian, 8)
+        self.y -= 12
+        self.isi.append(b"%.2f %.2f m %.2f %.2f l S\n" % (MARGIN, self.y, self.lebar - MARGIN, self.y))
+        self.y -= 8
+        if self.kolom: self._header_tabel()
+
+    def tutup_halaman(self):
+        if self.isi is None: return
+        self._teks(MARGIN, MARGIN - 14, time.strftime("Dicetak %d-%m-%Y %H:%M"), 7)
+        self._teks_kanan(self.lebar - MARGIN, MARGIN - 14, f"Halaman {self.nomor}", 7)
+        self.siap.append(b"".join(self.isi))
+        self.isi = None
+
+    def halaman_baru(self, bagian=None):
+        self.tutup_halaman()
+        if bagian is not None: self.bagian = bagian
+        self.kolom = None
+
+    def _butuh(self, tinggi):
+        """Pastikan ada ruang `tinggi` pt di halaman ini (buka halaman baru bila tidak cukup)"""
+        if self.isi is None: self._buka()
+        elif self.y - tinggi < MARGIN:
+            self.tutup_halaman()
+            self._buka()
+
+    # --- PRIMITIF ---
+    def _teks(self, x, y, teks, ukuran=UKURAN_HURUF, tebal=False):
+        self.isi.append(b"BT /%s %.1f Tf %.2f %.2f Td %s Tj ET\n" % (b"F2" if tebal else b"F1", ukuran, x, y, _pdf_str(teks)))
+
+    def _teks_kanan(self, x, y, teks, ukuran=UKURAN_HURUF, tebal=False):
+        self._teks(x - lebar_teks(teks, ukuran, tebal), y, teks, ukuran, tebal)
+
+    def _sel(self, nilai, tebal=False):
+        """1 baris tabel (teks kolom "L" dibungkus); kembalikan tinggi baris"""
+        teks = [(nilai[i] if fmt is None or nilai[i] in ("", None) or isinstance(nilai[i], str) else fmt.format(nilai[i]))
+                for i, (_, _, _, fmt) in enumerate(self.kolom)]
+        teks = ["" if t is None else str(t) for t in teks]
+        pecah = [_bungkus(t, lebar - 2 * PADDING_SEL, tebal=tebal) if rata == "L" else [t]
+                 for t, (_, lebar, rata, _) in zip(teks, self.kolom)]
+        tinggi = max(len(p) for p in pecah) * SPASI_BARIS + 2
+        return pecah, tinggi
+
+    def _gambar_baris(self, pecah, tinggi, tebal=False, isi_abu=False):
+        x = MARGIN
+        lebar_total = sum(k[1] for k in self.kolom)
+        if isi_abu: self.isi.append(b"0.85 g %.2f %.2f %.2f %.2f re f 0 g\n" % (MARGIN, self.y - tinggi, lebar_total, tinggi))
+        for baris_sel, (_, lebar, rata, _) in zip(pecah, self.kolom):
+            self.isi.append(b"%.2f %.2f %.2f %.2f re S\n" % (x, self.y - tinggi, lebar, tinggi))
+            for j, t in enumerate(baris_sel):
+                y = self.y - (j + 1) * SPASI_BARIS + 1.5
+                if rata == "R": self._teks_kanan(x + lebar - PADDING_SEL, y, t, tebal=tebal)
+                else: self._teks(x + PADDING_SEL, y, t, tebal=tebal)
+            x += lebar
+        self.y -= tinggi
+
+    def _header_tabel(self):
+        pecah, tinggi = self._sel([k[0] for k in self.kolom], tebal=True)
+        self._gambar_baris(pecah, tinggi, tebal=True, isi_abu=True)
+
+    # --- ELEMEN ---
+    def judul(self, teks, ukuran=10, sisa=0):
+        """Judul blok; `sisa` = ruang minimum setelah judul (agar judul tidak yatim di dasar halaman)"""
+        self.kolom = None
+        self._butuh(ukuran + 6 + sisa)
+        self._teks(MARGIN, self.y - ukuran, teks, ukuran, tebal=True)
+        self.y -= ukuran + 6
+
+    def teks(self, teks, ukuran=UKURAN_HURUF):
+        for baris in _bungkus(teks, self.lebar - 2 * MARGIN, ukuran):
+            self._butuh(ukuran + 3)
+            self._teks(MARGIN, self.y - ukuran, baris, ukuran)
+            self.y -= ukuran + 3
+
+    def tabel(self, kolom):
+        self.kolom = kolom
+        self._butuh(3 * SPASI_BARIS + 4)
+        self._header_tabel()
+
+    def baris(self, nilai, tebal=False):
+        pecah, tinggi = self._sel(nilai, tebal=tebal)
+        if self.y - tinggi < MARGIN:
+            self.tutup_halaman()
+            self._buka() # Header tabel diulang otomatis
+        self._gambar_baris(pecah, tinggi, tebal=tebal)
+
+    def spasi(self, tinggi=SPASI_BARIS):
+        if self.isi is not None: self.y -= tinggi
+
+# --- ISI LAPORAN ---
+def _rab_item(data_proyek, prices, overhead_pct):
+    """(no, item, rows, subtotal) per item; dihitung satu per satu dengan hitung_rab (HSP di-memo)"""
+    for i, item in enumerate(data_proyek, start=1):
+        rows, subtotal = hitung_rab([item], prices, overhead_pct, no_awal=i)
+        yield i, item, rows, subtotal
+
+def _bagian_rekap(p, data_proyek, prices, overhead_pct):
+    p.halaman_baru("Rekapitulasi RAB")
+    p.judul("REKAPITULASI RENCANA ANGGARAN BIAYA", 12)
+    p.teks(f"Jumlah item: {len(data_proyek)} | Overhead & Profit: {overhead_pct}% | PPN: {TARIF_PPN:.0%}")
+    p.spasi()
+    p.tabel(KOLOM_REKAP)
+    total = 0
+    for i, item, _, subtotal in _rab_item(data_proyek, prices, overhead_pct):
+        p.baris([i, item['nama'], item['tipe'], subtotal])
+        total += subtotal
+        yield
+    for label, nilai in [("Jumlah", total), (f"PPN {TARIF_PPN:.0%}", total * TARIF_PPN), ("Total Akhir", total * (1 + TARIF_PPN))]:
+        p.baris(["", "", label, nilai], tebal=True)
+    yield
+
+def _bagian_detail(p, data_proyek, prices, overhead_pct):
+    p.halaman_baru("RAB Detail")
+    p.judul("RINCIAN RAB PER ITEM PEKERJAAN", 12)
+    for i, item, rows, subtotal in _rab_item(data_proyek, prices, overhead_pct):
+        if not rows: continue
+        p.judul(f"{i}. {item['nama']} ({item['tipe']})", 9, sisa=3 * SPASI_BARIS)
+        p.tabel(KOLOM_DETAIL)
+        for r in rows: p.baris([r["Kode"], r["Uraian"], r["Vol"], r["Sat"], r["H.Sat"], r["Total"]])
+        p.baris(["", "", "", "", "Subtotal", subtotal], tebal=True)
+        p.spasi()
+        yield
+
+def _bagian_analisa(p, prices, overhead_pct, kode_ahsp=None):
+    p.halaman_baru("Analisa Harga Satuan")
+    p.judul("ANALISA HARGA SATUAN PEKERJAAN (AHSP)", 12)
+    for kode in (kode_ahsp or AHSP_Engine.KODE):
+        form = AHSP_Engine.get_formulir(kode, prices, overhead_pct)
+        p.judul(f"Analisa: {form['uraian']}", 9, sisa=len(form['rows']) * SPASI_BARIS + 2 * SPASI_BARIS) # 1 formulir utuh 1 halaman bila muat
+        p.teks(f"Kode: {form['kode']}")
+        p.tabel(KOLOM_ANALISA)
+        for r in form['rows']:
+            p.baris([r["Uraian"], r["Koefisien"], r["Satuan"], r["Harga Satuan (Rp)"], r["Jumlah Harga (Rp)"], r["Kategori"]])
+        for label, nilai in [
+            ("A. Tenaga", form['total_upah']), ("B. Bahan", form['total_bahan']),
+            ("C. Jumlah (A+B)", form['jum_dasar']), (f"D. Overhead ({overhead_pct}%)", form['ovr_val']),
+            ("E. Harga Satuan", form['jum_final']),
+        ]:
+            p.baris([label, "", "", "", nilai, ""], tebal=True)
+        p.spasi()
+        yield
+
+def _bagian_backup(p, data_proyek):
+    p.halaman_baru("Back-Up Data Volume")
+    p.judul("LAPORAN BACK-UP DATA VOLUME", 12)
+    p.teks("Referensi: Permen PUPR No. 182 Tahun 2025 (AHSP Bidang SDA)")
+    for idx, item in enumerate(data_proyek):
+        rincian = generate_breakdown(item)
+        p.judul(f"#{idx+1}. {item['nama']} ({item['tipe']})", 9, sisa=3 * SPASI_BARIS)
+        p.tabel(KOLOM_BACKUP)
+        for r in rincian: p.baris([r['kode'], r['uraian'], r['rumus'], float(r['volume']), r['satuan']])
+        p.spasi()
+        yield
+
+def halaman_laporan(data_proyek, prices, overhead_pct, bagian=BAGIAN_LAPORAN, judul="RAB - AHSP Bidang SDA", kode_ahsp=None, ukuran=A4):
+    """
+    Generator content stream PDF per halaman (bytes), urut `bagian` (subset BAGIAN_LAPORAN).
+    Halaman dikeluarkan segera setelah penuh; tidak ada list halaman / baris RAB seluruh proyek di memori.
+    """
+    p = _PenataHalaman(judul, ukuran)
+    pembuat = {
+        "rekap": lambda: _bagian_rekap(p, data_proyek, prices, overhead_pct),
+        "detail": lambda: _bagian_detail(p, data_proyek, prices, overhead_pct),
+        "analisa": lambda: _bagian_analisa(p, prices, overhead_pct, kode_ahsp),
+        "backup": lambda: _bagian_backup(p, data_proyek),
+    }
+    for nama in bagian:
+        if nama not in pembuat: raise ValueError(f"Bagian laporan tidak dikenal: {nama} (pilihan: {', '.join(BAGIAN_LAPORAN)})")
+        for _ in pembuat[nama]():
+            yield from p.siap
+            p.siap.clear()
+    p.tutup_halaman()
+    yield from p.siap
+
+def tulis_laporan_pdf(output, data_proyek, prices, overhead_pct, bagian=BAGIAN_LAPORAN, judul="RAB - AHSP Bidang SDA", kode_ahsp=None):
+    """Tulis laporan PDF ke `output` (path / file biner); return jumlah halaman"""
+    pdf = PDFStream(output, judul=judul)
+    try:
+        for isi in halaman_laporan(data_proyek, prices, overhead_pct, bagian, judul, kode_ahsp):
+            pdf.tambah_halaman(isi)
+    finally:
+        n = pdf.tutup()
+    return n
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from rab_engine import Calculator, SF_UPLIFT_MIN, biaya_batch
+
+# ==========================================
+# OPTIMASI DESAIN TERJUNAN USBR
+# ==========================================
+# Sapu grid H_step x t_lantai x t_dinding x mode_hemat sekaligus (vektor) lewat
+# Calculator.hitung_terjunan_usbr_batch, lalu pilih desain termurah yang lolos cek stabilitas.
+
+GRID_DEFAULT = {
+    "H_step": np.round(np.arange(0.5, 2.01, 0.1), 2),
+    "t_lantai": np.round(np.arange(0.20, 0.61, 0.05), 2),
+    "t_dinding": np.round(np.arange(0.20, 0.41, 0.05), 2),
+    "mode_hemat": (False, True),
+}
+UKURAN_CHUNK = 200000
+
+def _grid(H_step, t_lantai, t_dinding, mode_hemat):
+    mesh = np.meshgrid(np.asarray(H_step, float), np.asarray(t_lantai, float),
+                       np.asarray(t_dinding, float), np.asarray(mode_hemat, bool), indexing="ij")
+    return pd.DataFrame({k: m.ravel() for k, m in zip(["H_step", "t_lantai", "t_dinding", "mode_hemat"], mesh)})
+
+def pareto_biaya_sf(df):
+    """Front Pareto: biaya minimum vs SF uplift maksimum (baris yang tidak didominasi)"""
+    urut = df.sort_values(["biaya", "sf_uplift"], ascending=[True, False])
+    sf_terbaik = np.maximum.accumulate(urut["sf_uplift"].to_numpy())
+    lolos = np.r_[True, urut["sf_uplift"].to_numpy()[1:] > sf_terbaik[:-1]]
+    return urut[lolos]
+
+def optimasi_terjunan(Q, H_total, B, qa_tanah, tabel_hsp, is_rehab=False, sf_min=SF_UPLIFT_MIN, **grid):
+    """
+    Cari konfigurasi terjunan termurah yang AMAN (SF uplift >= sf_min & sigma netto <= qa_tanah).
+    `grid` menimpa GRID_DEFAULT (H_step, t_lantai, t_dinding, mode_hemat).
+    Return: {"grid": semua kombinasi + biaya & status, "terbaik": baris termurah yang aman (atau None),
+             "pareto": front biaya vs SF dari kombinasi yang aman}
+    """
+    df = _grid(**{**GRID_DEFAULT, **grid})
+    hasil = []
+    for awal in range(0, len(df), UKURAN_CHUNK):
+        chunk = df.iloc[awal:awal + UKURAN_CHUNK]
+        calc = Calculator.hitung_terjunan_usbr_batch(chunk, Q=Q, H_total=H_total, B=B, qa_tanah=qa_tanah, is_rehab=is_rehab)
+        hasil.append(chunk.join(calc[["info_struktur", "sf_uplift", "sigma_tanah", "vol_beton", "berat_besi"]]).assign(biaya=biaya_batch(calc, tabel_hsp)))
+    df = pd.concat(hasil)
+    df["aman"] = (df["sf_uplift"] >= sf_min) & (df["sigma_tanah"] <= qa_tanah)
+
+    aman = df[df["aman"]]
+    terbaik = aman.loc[aman["biaya"].idxmin()] if not aman.empty else None
+    return {"grid": df, "terbaik": terbaik, "pareto": pareto_biaya_sf(aman) if not aman.empty else aman}
@@ -0,0 +1,131 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, TARIF_PPN, matriks_volume
+from proyek_store import muat_proyek
+from rekap_sumber_daya import SATUAN_SUMBER_DAYA, _kategori
+
+# ==========================================
+# PORTOFOLIO MULTI-PROYEK
+# ==========================================
+# Banyak file proyek (.json / .rabdb / .csv segmen) dimuat & dihitung paralel dengan harga yang sama.
+# Tiap worker hanya mengembalikan ringkasan (biaya & panjang per tipe, biaya satuan per item, kuantitas sumber daya),
+# bukan list item utuh, jadi memori tetap kecil walau 50+ paket dibuka sekaligus.
+# Thread pool dipakai secara default (aman di dalam Streamlit); parsing .rabdb/sqlite & numpy melepas GIL.
+
+EKSTENSI_PROYEK = (".json", ".rabdb", ".csv")
+# UI web hanya boleh membaca folder di bawah akar ini (env RAB_FOLDER_PROYEK); tanpa env, UI hanya menerima upload.
+# muat_portofolio sendiri (CLI / skrip) tetap menerima path apa pun.
+FOLDER_PROYEK = os.environ.get("RAB_FOLDER_PROYEK")
+
+def folder_di_akar(sub, akar=FOLDER_PROYEK):
+    """Path absolut subfolder `sub` di dalam `akar`; ValueError bila akar tidak diatur, path keluar dari akar (.., symlink) atau bukan folder"""
+    if not akar: raise ValueError("Folder server tidak diaktifkan (atur env RAB_FOLDER_PROYEK)")
+    akar = os.path.realpath(akar)
+    path = os.path.realpath(os.path.join(akar, sub or ""))
+    if os.path.commonpath([akar, path]) != akar: raise ValueError(f"Folder harus di dalam {akar}: {sub}")
+    if not os.path.isdir(path): raise ValueError(f"Folder tidak ditemukan: {sub}")
+    return path
+
+def daftar_file(folder):
+    """Path file proyek di folder (tidak rekursif), urut nama"""
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(EKSTENSI_PROYEK))
+
+def _biaya_satuan(biaya, panjang, jumlah_item):
+    """Saluran (panjang > 0): Rp/m; bangunan (Box, Terjunan: panjang 0): Rp/buah"""
+    return np.where(panjang > 0, biaya / np.where(panjang > 0, panjang, 1), biaya / jumlah_item)
+
+def ringkas_proyek(nama, data_proyek, vektor_hsp):
+    """Ringkasan 1 proyek: total, biaya & panjang per tipe, biaya satuan per item, kuantitas sumber daya"""
+    kuantitas = matriks_volume(data_proyek)
+    biaya = kuantitas @ vektor_hsp
+    df = pd.DataFrame({
+        "tipe": [item['tipe'] for item in data_proyek],
+        "panjang": [item.get('panjang', 0) or 0 for item in data_proyek],
+        "biaya": biaya,
+    })
+    per_tipe = df.groupby("tipe").agg(jumlah_item=("biaya", "size"), panjang=("panjang", "sum"), biaya=("biaya", "sum"))
+    return {
+        "proyek": nama, "jumlah_item": len(data_proyek), "panjang": float(df["panjang"].sum()), "jumlah": float(biaya.sum()),
+        "biaya_saluran": float(df.loc[df["panjang"] > 0, "biaya"].sum()), # Hanya item berpanjang (saluran), dasar Rp/m proyek
+        "per_tipe": per_tipe.reset_index().assign(proyek=nama),
+        "biaya_satuan": df.assign(biaya_satuan=_biaya_satuan(df["biaya"], df["panjang"], 1))[["tipe", "biaya_satuan"]],
+        "sumber_daya": kuantitas.sum(axis=0) @ AHSP_Engine.MATRIKS_KOEF,
+    }
+
+def _proses(nama, sumber, vektor_hsp):
+    try:
+        return ringkas_proyek(nama, muat_proyek(sumber, nama), vektor_hsp)
+    except Exception as e:
+        return {"proyek": nama, "error": f"{type(e).__name__}: {e}"}
+
+def muat_portofolio(sumber, prices, overhead, max_workers=None, executor=ThreadPoolExecutor):
+    """
+    sumber: list path file / folder, atau list (nama, bytes) dari upload. Semua proyek dihitung dengan harga yang sama.
+    executor: ThreadPoolExecutor (default) atau ProcessPoolExecutor (untuk CLI / banyak file .csv besar).
+    Return: {"proyek", "per_tipe", "sebaran", "sumber_daya": DataFrame, "gagal": [(nama, pesan)]}
+    """
+    tugas = []
+    for s in sumber:
+        if isinstance(s, str) and os.path.isdir(s): tugas += [(os.path.basename(p), p) for p in daftar_file(s)]
+        elif isinstance(s, str): tugas.append((os.path.basename(s), s))
+        else: tugas.append(s)
+    tabel_hsp = AHSP_Engine.tabel_harga_satuan(prices, overhead)
+    vektor_hsp = np.array([tabel_hsp[k] for k in AHSP_Engine.KODE])
+    with executor(max_workers=max_workers) as pool:
+        hasil = list(pool.map(_proses, *zip(*tugas), [vektor_hsp] * len(tugas))) if tugas else []
+    gagal = [(h["proyek"], h["error"]) for h in hasil if "error" in h]
+    return rekap_portofolio([h for h in hasil if "error" not in h], gagal)
+
+def _sebaran(df, kolom, grup):
+    return df.groupby(grup)[kolom].agg(
+        n="size", rata2="mean", std="std", minimum="min",
+        p10=lambda s: s.quantile(0.10), median="median", p90=lambda s: s.quantile(0.90), maksimum="max",
+    ).assign(cv_persen=lambda d: d["std"] / d["rata2"] * 100)
+
+def rekap_portofolio(ringkasan, gagal=()):
+    """Gabungkan ringkasan per proyek menjadi agregat lintas proyek"""
+    kolom_sd = [f"{n} ({SATUAN_SUMBER_DAYA.get(n, '-')})" for n in AHSP_Engine.SUMBER_DAYA]
+    if not ringkasan:
+        return {"proyek": pd.DataFrame(), "per_tipe": pd.DataFrame(), "sebaran": pd.DataFrame(),
+                "sumber_daya": pd.DataFrame(), "sumber_daya_proyek": pd.DataFrame(columns=kolom_sd), "gagal": list(gagal)}
+    df_proyek = pd.DataFrame([{k: r[k] for k in ("proyek", "jumlah_item", "panjang", "jumlah", "biaya_saluran")} for r in ringkasan])
+    # Rp/m dari saluran saja: bangunan (Box, Terjunan) tidak punya panjang, biayanya tidak ikut dibagi panjang saluran
+    df_proyek = df_proyek.assign(total_akhir=df_proyek["jumlah"] * (1 + TARIF_PPN),
+                                 biaya_per_m=df_proyek["biaya_saluran"] / df_proyek["panjang"].replace(0, np.nan))
+    per_tipe = pd.concat([r["per_tipe"] for r in ringkasan], ignore_index=True)
+    per_tipe["satuan"] = np.where(per_tipe["panjang"] > 0, "m", "bh")
+    per_tipe["biaya_satuan"] = _biaya_satuan(per_tipe["biaya"], per_tipe["panjang"], per_tipe["jumlah_item"])
+
+    # Biaya satuan (Rp/m atau Rp/bh) per tipe: agregat portofolio + sebaran antar proyek & antar item
+    total_tipe = per_tipe.groupby("tipe")[["jumlah_item", "panjang", "biaya"]].sum()
+    total_tipe.insert(0, "satuan", np.where(total_tipe["panjang"] > 0, "m", "bh"))
+    total_tipe["biaya_satuan"] = _biaya_satuan(total_tipe["biaya"], total_tipe["panjang"], total_tipe["jumlah_item"])
+    antar_proyek = _sebaran(per_tipe, "biaya_satuan", "tipe").add_prefix("proyek_")
+    item = pd.concat([r["biaya_satuan"] for r in ringkasan], ignore_index=True)
+    antar_item = _sebaran(item, "biaya_satuan", "tipe").add_prefix("item_")
+    sebaran = total_tipe.join(antar_proyek).join(antar_item).reset_index()
+
+    sumber_daya_proyek = pd.DataFrame([r["sumber_daya"] for r in ringkasan], index=df_proyek["proyek"], columns=kolom_sd)
+    sumber_daya = pd.DataFrame({
+        "Sumber Daya": AHSP_Engine.SUMBER_DAYA,
+        "Kategori": [_kategori(n) for n in AHSP_Engine.SUMBER_DAYA],
+        "Satuan": [SATUAN_SUMBER_DAYA.get(n, "-") for n in AHSP_Engine.SUMBER_DAYA],
+        "Kuantitas": sumber_daya_proyek.sum(axis=0).to_numpy(),
+    })
+    return {"proyek": df_proyek, "per_tipe": per_tipe[["proyek", "tipe", "jumlah_item", "panjang", "biaya", "satuan", "biaya_satuan"]],
+            "sebaran": sebaran, "sumber_daya": sumber_daya, "sumber_daya_proyek": sumber_daya_proyek, "gagal": list(gagal)}
+
+def ekspor_portofolio_excel(hasil):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        hasil["proyek"].to_excel(writer, sheet_name='Rekap Proyek', index=False)
+        hasil["sebaran"].to_excel(writer, sheet_name='Biaya Satuan per Tipe', index=False)
+        hasil["per_tipe"].to_excel(writer, sheet_name='Proyek x Tipe', index=False)
+        hasil["sumber_daya"].to_excel(writer, sheet_name='Total Sumber Daya', index=False)
+        hasil["sumber_daya_proyek"].to_excel(writer, sheet_name='Sumber Daya per Proyek')
+    return output.getvalue()
@@ -0,0 +1,145 @@
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import TIPE_SEGMEN, _vol_dari_baris
+
+# ==========================================
+# IMPOR POTONGAN MEMANJANG (STA) SALURAN
+# ==========================================
+# File CSV/Excel berisi penampang melintang di tiap STA (kolom: sta, h, b, m, t_cm, ...) dibaca per chunk.
+# Volume antar 2 STA dihitung secara vektor dengan rumus luas ujung rata-rata:
+#   V = (A1 + A2) / 2 x L
+# atau prismoida (A tengah = penampang dari dimensi rata-rata kedua STA):
+#   V = (A1 + 4 Am + A2) / 6 x L
+# lalu dijumlah per ruas (kolom 'ruas' bila ada, atau tiap `panjang_ruas` meter) menjadi 1 item proyek.
+
+UKURAN_CHUNK_STA = 20000
+PANJANG_RUAS_DEFAULT = 100.0
+DEFAULT_STA = {"t_cm": 15.0, "dia": 10.0, "jarak": 15.0} # Sama dengan nilai awal form Input (Saluran Beton)
+KOLOM_VOL_STA = ["vol_beton", "vol_batu", "vol_galian", "vol_timbunan", "berat_besi",
+                 "luas_bekisting", "luas_plester", "luas_siaran", "vol_bongkaran"]
+# Kunci volume per tipe (urutan sama dengan dict hasil Calculator skalar)
+KOLOM_TIPE = {
+    "Saluran Beton": ["vol_beton", "vol_galian", "vol_timbunan", "berat_besi", "luas_bekisting", "vol_bongkaran"],
+    "Saluran Batu": ["vol_batu", "vol_galian", "vol_timbunan", "luas_plester", "luas_siaran", "vol_bongkaran"],
+}
+KOLOM_KRITIS = ["mu", "t_rekom", "rho_act", "rho_min", "rho_max", "rho_status"] # Diambil dari STA dengan h terbesar
+
+def format_sta(sta):
+    """1250.5 -> '1+250.50'"""
+    return f"{int(sta // 1000)}+{sta % 1000:06.2f}"
+
+def baca_chunk(file, ukuran_chunk=UKURAN_CHUNK_STA):
+    """Generator DataFrame per `ukuran_chunk` baris dari CSV / Excel (xlsx dibaca read-only baris demi baris)"""
+    nama = getattr(file, "name", str(file))
+    if nama.endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        wb = load_workbook(file, read_only=True, data_only=True)
+        try:
+            baris = wb.active.iter_rows(values_only=True)
+            header = [str(h).strip().lower() for h in next(baris)]
+            while blok := list(islice(baris, ukuran_chunk)):
+                yield pd.DataFrame(blok, columns=header)
+        finally:
+            wb.close()
+    else:
+        for chunk in pd.read_csv(file, chunksize=ukuran_chunk):
+            yield chunk.rename(columns=lambda k: str(k).strip().lower())
+
+def _laju_per_meter(df):
+    """Volume per meter panjang (laju) & konstanta ujung (mis. 1 baris tulangan tambahan) tiap baris penampang"""
+    laju = pd.DataFrame(0.0, index=df.index, columns=KOLOM_VOL_STA)
+    ujung = laju.copy()
+    kritis = pd.DataFrame(np.nan, index=df.index, columns=KOLOM_KRITIS).astype({"rho_status": object})
+    for tipe, grup in df.groupby("tipe", sort=False):
+        if tipe not in KOLOM_TIPE: raise ValueError(f"Tipe tidak didukung untuk potongan memanjang: {tipe}")
+        fungsi, konstan = TIPE_SEGMEN[tipe]
+        grup = grup.assign(**{k: grup[k].fillna(v) for k, v in konstan.items() if k in grup})
+        konstan = {k: v for k, v in konstan.items() if k not in grup}
+        satu = fungsi(grup.assign(panjang=1.0), **konstan)
+        dua = fungsi(grup.assign(panjang=2.0), **konstan)
+        kolom = [k for k in KOLOM_VOL_STA if k in satu]
+        laju.loc[grup.index, kolom] = (dua[kolom] - satu[kolom]).fillna(0.0).to_numpy()
+        ujung.loc[grup.index, kolom] = (2 * satu[kolom] - dua[kolom]).fillna(0.0).to_numpy()
+        ada = [k for k in KOLOM_KRITIS if k in satu]
+        kritis.loc[grup.index, ada] = satu[ada].to_numpy()
+    return laju, ujung, kritis
+
+def _volume_interval(stasiun, metode):
+    """Volume tiap interval STA i -> i+1 (stasiun: penampang berurutan, hasil: 1 baris = 1 interval)"""
+    a, b = stasiun.iloc[:-1], stasiun.iloc[1:].set_axis(stasiun.index[:-1])
+    L = (b["sta"] - a["sta"]).to_numpy()
+    if (L < 0).any(): raise ValueError("Kolom 'sta' harus urut naik")
+    laju, ujung, kritis = _laju_per_meter(stasiun)
+    laju_a = laju.iloc[:-1]
+    # Interval yang tipenya berganti dihitung dengan penampang awal saja (prismatik)
+    sama = (b["tipe"] == a["tipe"]).to_numpy()
+    laju_b = laju.iloc[1:].set_axis(a.index).where(np.broadcast_to(sama[:, None], laju_a.shape), laju_a)
+    if metode == "prismoida":
+        angka = stasiun.select_dtypes("number").columns.difference(["sta", "ruas"])
+        tengah = a.copy()
+        tengah[angka] = np.where(sama[:, None], (a[angka].to_numpy(dtype=float) + b[angka].to_numpy(dtype=float)) / 2, a[angka])
+        vol = (laju_a + 4 * _laju_per_meter(tengah)[0] + laju_b) / 6
+    else:
+        vol = (laju_a + laju_b) / 2
+    vol = vol.mul(L, axis=0)
+    return vol.assign(panjang=L, sta_awal=a["sta"].to_numpy(), sta_akhir=b["sta"].to_numpy(), h=a["h"].to_numpy(),
+                      ruas=a["ruas"].to_numpy(), tipe=a["tipe"].to_numpy(), is_rehab=a["is_rehab"].to_numpy(),
+                      **{f"ujung_{k}": ujung[k].iloc[:-1] for k in KOLOM_VOL_STA}, **kritis.iloc[:-1])
+
+def _gabung_ruas(df):
+    """Jumlahkan interval / ringkasan per (ruas, tipe); kolom kritis & ujung dari baris dengan h terbesar"""
+    df = df.sort_values("h", ascending=False, kind="stable")
+    grup = df.groupby(["ruas", "tipe", "is_rehab"], sort=False)
+    jumlah = grup[KOLOM_VOL_STA + ["panjang"]].sum()
+    sta = grup.agg(sta_awal=("sta_awal", "min"), sta_akhir=("sta_akhir", "max"))
+    lain = grup[[c for c in df.columns if c.startswith("ujung_")] + KOLOM_KRITIS + ["h"]].first()
+    return pd.concat([jumlah, sta, lain], axis=1).reset_index()
+
+def impor_potongan_memanjang(file, tipe="Saluran Beton", panjang_ruas=PANJANG_RUAS_DEFAULT, metode="rata2",
+                             nama_ruas="Ruas", is_rehab=False, ukuran_chunk=UKURAN_CHUNK_STA, **default):
+    """
+    Baca potongan memanjang (1 baris = penampang di 1 STA) per chunk -> list item proyek, 1 item per ruas.
+    Kolom wajib: sta, h + parameter penampang (Saluran Beton: b, m, t_cm, dia, jarak; Saluran Batu: l_atas, l_bawah, t_lantai).
+    Kolom opsional: tipe, ruas, is_rehab; kolom yang tidak ada di file diisi dari `default` / DEFAULT_STA (mis. dia=13).
+    metode: "rata2" (luas ujung rata-rata) atau "prismoida".
+    """
+    ringkasan = []
+    sisa = None   # STA terakhir chunk sebelumnya (awal interval pertama chunk berikutnya)
+    sta_0 = None
+    for chunk in baca_chunk(file, ukuran_chunk):
+        chunk = chunk.dropna(subset=["sta"])
+        if chunk.empty: continue
+        chunk = chunk.assign(**{k: v for k, v in {**DEFAULT_STA, **default}.items() if k not in chunk})
+        if "tipe" not in chunk: chunk = chunk.assign(tipe=tipe)
+        if "is_rehab" not in chunk: chunk = chunk.assign(is_rehab=is_rehab)
+        chunk = chunk.assign(sta=chunk["sta"].astype(float), is_rehab=chunk["is_rehab"].fillna(False).astype(bool))
+        if sta_0 is None: sta_0 = chunk["sta"].iloc[0]
+        if "ruas" not in chunk:
+            chunk = chunk.assign(ruas=((chunk["sta"] - sta_0) // panjang_ruas).astype(int) + 1)
+        if sisa is not None: chunk = pd.concat([sisa, chunk], ignore_index=True)
+        chunk = chunk.reset_index(drop=True)
+        sisa = chunk.iloc[[-1]]
+        if len(chunk) < 2: continue
+
+        ringkasan.append(_gabung_ruas(_volume_interval(chunk, metode)))
+
+    if not ringkasan: return []
+    df = _gabung_ruas(pd.concat(ringkasan, ignore_index=True))
+    df = df.sort_values("sta_awal", kind="stable")
+    for k in KOLOM_VOL_STA:
+        df[k] = df[k] + df[f"ujung_{k}"]
+
+    items = []
+    for rec in df.to_dict("records"):
+        # Saluran Beton: mu/t_rekom/rho dari STA kritis; Saluran Batu: mu = t_rekom = 0 (sama dengan fungsi skalar)
+        baris = {k: rec[k] for k in KOLOM_KRITIS} if rec["tipe"] == "Saluran Beton" else {"mu": 0.0, "t_rekom": 0.0}
+        baris.update({k: rec[k] for k in KOLOM_TIPE[rec["tipe"]]})
+        nama = f"{nama_ruas} {rec['ruas']} (STA {format_sta(rec['sta_awal'])} - {format_sta(rec['sta_akhir'])})"
+        items.append({
+            "nama": nama + (" (REHAB)" if rec["is_rehab"] else ""), "tipe": rec["tipe"],
+            "panjang": rec["panjang"], "vol": _vol_dari_baris(baris),
+        })
+    return items
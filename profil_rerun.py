@@ -0,0 +1,135 @@
+import cProfile
+import csv
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+# ==========================================
+# PROFIL RERUN (WAKTU & MEMORI PER TAHAP)
+# ==========================================
+# Setiap interaksi widget menjalankan ulang BIM_RAB.py dari atas. ProfilRerun mencatat durasi
+# dan alokasi memori (tracemalloc) tiap tahap lewat titik pemisah:
+#   profil = ProfilRerun(aktif=True)
+#   try:
+#       profil.tahap("sidebar") ... profil.tahap("tab1") ...
+#   finally:
+#       profil.selesai(n_item) # Juga saat rerun terpotong (st.rerun / st.stop): cProfile & tracemalloc dilepas
+# Catatan: tracemalloc bersifat global per proses. Tracing dinyalakan selama masih ada rerun ber-profil memori
+# (hitungan di bawah kunci), jadi sesi tanpa debug tidak mematikannya di tengah rerun sesi lain. Angka alokasi
+# tercampur bila beberapa sesi ber-profil berjalan bersamaan; puncak hanya dicatat bila 1 rerun ber-profil aktif.
+
+logger = logging.getLogger("rab.profil")
+KOLOM_PROFIL = ["rerun", "tahap", "detik", "alokasi_kb", "puncak_kb", "n_item"] # rerun = waktu mulai rerun
+_kunci_trace = threading.Lock()
+_trace_oleh_profil = False # tracemalloc dinyalakan oleh ProfilRerun (bukan oleh pengguna/tool lain)
+_n_trace = 0               # Rerun ber-profil memori yang sedang berjalan (semua sesi)
+
+def _mulai_trace():
+    global _trace_oleh_profil, _n_trace
+    with _kunci_trace:
+        if _n_trace == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _trace_oleh_profil = True
+        _n_trace += 1
+
+def _henti_trace():
+    """Lepas 1 rerun; tracemalloc dihentikan hanya bila tidak ada lagi rerun ber-profil & ProfilRerun yang menyalakannya"""
+    global _trace_oleh_profil, _n_trace
+    with _kunci_trace:
+        _n_trace -= 1
+        if _n_trace == 0 and _trace_oleh_profil:
+            tracemalloc.stop()
+            _trace_oleh_profil = False
+
+def _sendiri():
+    """True bila hanya 1 rerun ber-profil memori yang berjalan (reset_peak tidak mengganggu sesi lain)"""
+    with _kunci_trace: return _n_trace == 1
+
+class ProfilRerun:
+    def __init__(self, aktif=True, memori=True, cprofile=False):
+        self.aktif = aktif
+        self.memori = aktif and memori
+        self.hasil = []
+        self.rerun = datetime.now().isoformat(timespec="milliseconds")
+        self._tahap = None
+        self._selesai = False
+        if self.memori: _mulai_trace()
+        self._mem = tracemalloc.get_traced_memory()[0] if self.memori else 0
+        self.profiler = cProfile.Profile() if aktif and cprofile else None
+        if self.profiler: self.profiler.enable()
+        self._t = time.perf_counter()
+
+    def tahap(self, nama):
+        """Tutup tahap yang sedang berjalan lalu mulai tahap `nama`"""
+        if not self.aktif: return
+        self._tutup()
+        self._tahap = nama
+
+    def _tutup(self):
+        detik = time.perf_counter() - self._t
+        if self._tahap is not None:
+            rec = {"tahap": self._tahap, "detik": detik, "alokasi_kb": None, "puncak_kb": None}
+            if self.memori:
+                sekarang, puncak = tracemalloc.get_traced_memory()
+                rec["alokasi_kb"] = (sekarang - self._mem) / 1024
+                if _sendiri():
+                    rec["puncak_kb"] = (puncak - self._mem) / 1024
+                    tracemalloc.reset_peak()
+                self._mem = sekarang
+            self.hasil.append(rec)
+        self._tahap = None
+        self._t = time.perf_counter() # Waktu baca tracemalloc tidak dihitung ke tahap berikutnya
+
+    def selesai(self, n_item=None):
+        """Tutup tahap terakhir, hentikan cProfile & lepas tracemalloc; kembalikan record (1 per tahap). Aman dipanggil ulang"""
+        if not self.aktif or self._selesai: return self.hasil
+        self._selesai = True
+        self._tutup()
+        if self.profiler: self.profiler.disable()
+        if self.memori: _henti_trace()
+        for rec in self.hasil:
+            rec.update(rerun=self.rerun, n_item=n_item)
+        self.hasil = [{k: rec[k] for k in KOLOM_PROFIL} for rec in self.hasil]
+        logger.info(json.dumps({"rerun": self.rerun, "n_item": n_item, "total_detik": self.total_detik(),
+                                "tahap": {r["tahap"]: round(r["detik"], 6) for r in self.hasil}}))
+        path_csv = os.environ.get("RAB_PROFIL_CSV")
+        if path_csv: tulis_csv(self.hasil, path_csv)
+        return self.hasil
+
+    def total_detik(self):
+        return sum(r["detik"] for r in self.hasil)
+
+    def tabel(self):
+        df = pd.DataFrame(self.hasil, columns=KOLOM_PROFIL)
+        total = df["detik"].sum()
+        return df.assign(persen=df["detik"] / total * 100 if total else 0.0)[["tahap", "detik", "persen", "alokasi_kb", "puncak_kb"]]
+
+    # --- cProfile ---
+    def laporan_cprofile(self, urut="cumulative", n_baris=40):
+        if self.profiler is None: return ""
+        teks = io.StringIO()
+        pstats.Stats(self.profiler, stream=teks).strip_dirs().sort_stats(urut).print_stats(n_baris)
+        return teks.getvalue()
+
+    def cprofile_bytes(self):
+        """Isi file .prof (format pstats.dump_stats) untuk snakeviz / pstats"""
+        if self.profiler is None: return b""
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+
+def tulis_csv(records, path):
+    """Append record profil ke CSV (header ditulis bila file baru)"""
+    baru = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=KOLOM_PROFIL)
+        if baru: writer.writeheader()
+        writer.writerows(records)
@@ -0,0 +1,165 @@
+import sqlite3
+import json
+import os
+import tempfile
+from io import BytesIO
+
+import pandas as pd
+
+from rab_engine import segmen_ke_items
+
+# ==========================================
+# PENYIMPANAN PROYEK (SQLITE, PER ITEM)
+# ==========================================
+# Format ringkas pengganti dump JSON satu proyek utuh:
+# 1 baris = 1 item, payload volume disimpan sebagai JSON tanpa spasi.
+# File .rabdb adalah database SQLite biasa (bisa dibuka dengan tool SQLite apa pun).
+# to_bytes / dari_bytes memakai Connection.serialize / deserialize (Python >= 3.11, tanpa file sementara);
+# Python 3.8-3.10 otomatis lewat file sementara + Connection.backup (isi file sama).
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    urutan REAL NOT NULL,
+    nama TEXT NOT NULL,
+    tipe TEXT NOT NULL,
+    panjang REAL NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_urutan ON items (urutan);
+"""
+
+def _ringkas(data):
+    return json.dumps(data, separators=(',', ':'))
+
+class ProjectStore:
+    """Store item proyek: tambah/ubah/hapus per item, baca malas (lazy), serialisasi hanya saat disimpan."""
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SKEMA)
+
+    # --- KONVERSI ---
+    @classmethod
+    def dari_bytes(cls, data):
+        """Buka file .rabdb (hasil to_bytes); tanpa menulis ke disk di Python >= 3.11"""
+        store = cls()
+        if hasattr(store.conn, "deserialize"): store.conn.deserialize(data)
+        else: _muat_lewat_file(data, store.conn)
+        return store
+
+    @classmethod
+    def dari_list(cls, data_proyek):
+        """Import dari skema JSON lama (list of dict: nama, tipe, panjang, vol)"""
+        store = cls()
+        with store.conn:
+            store.conn.executemany(
+                "INSERT INTO items (urutan, nama, tipe, panjang, payload) VALUES (?, ?, ?, ?, ?)",
+                ((i, *store._kolom(item)) for i, item in enumerate(data_proyek)),
+            )
+        return store
+
+    @classmethod
+    def dari_json(cls, fp):
+        return cls.dari_list(json.load(fp))
+
+    def to_bytes(self):
+        self.conn.commit()
+        if hasattr(self.conn, "serialize"): return self.conn.serialize()
+        return _simpan_lewat_file(self.conn)
+
+    def to_list(self):
+        return list(self.items())
+
+    def to_json(self, indent=2):
+        """Export ke skema rab_proyek.json (kompatibel dengan versi lama)"""
+        return json.dumps(self.to_list(), indent=indent)
+
+    # --- OPERASI PER ITEM ---
+    @staticmethod
+    def _kolom(item):
+        payload = {k: v for k, v in item.items() if k not in ("nama", "tipe")}
+        return item['nama'], item['tipe'], item.get('panjang', 0) or 0, _ringkas(payload)
+
+    @staticmethod
+    def _item(row):
+        _, nama, tipe, _, payload = row
+        return {"nama": nama, "tipe": tipe, **json.loads(payload)}
+
+    def tambah(self, item):
+        """Append 1 item, kembalikan id-nya"""
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO items (urutan, nama, tipe, panjang, payload) "
+                "VALUES ((SELECT COALESCE(MAX(urutan), -1) + 1 FROM items), ?, ?, ?, ?)",
+                self._kolom(item),
+            )
+        return cur.lastrowid
+
+    def ubah(self, item_id, item):
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE items SET nama = ?, tipe = ?, panjang = ?, payload = ? WHERE id = ?",
+                (*self._kolom(item), item_id),
+            )
+        if cur.rowcount == 0: raise KeyError(item_id)
+
+    def hapus(self, item_id):
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+        if cur.rowcount == 0: raise KeyError(item_id)
+
+    def ambil(self, item_id):
+        row = self.conn.execute("SELECT id, nama, tipe, panjang, payload FROM items WHERE id = ?", (item_id,)).fetchone()
+        if row is None: raise KeyError(item_id)
+        return self._item(row)
+
+    def ids(self):
+        return [r[0] for r in self.conn.execute("SELECT id FROM items ORDER BY urutan, id")]
+
+    def items(self):
+        """Iterasi item berurutan; payload hanya di-parse saat item dibaca"""
+        for row in self.conn.execute("SELECT id, nama, tipe, panjang, payload FROM items ORDER BY urutan, id"):
+            yield self._item(row)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+# --- MUAT FILE PROYEK (.json / .rabdb / .csv SEGMEN) ---
+# Dipakai CLI (rab_cli) & portofolio (path maupun upload UI)
+UKURAN_CHUNK_CSV = 5000
+
+def muat_proyek(sumber, nama=None, pool=None):
+    """
+    List item proyek dari path (str) atau isi file upload (bytes; `nama` = nama file untuk ekstensi).
+    .csv = tabel segmen (rab_engine.segmen_ke_items), dibaca per chunk & dihitung paralel di pool bila ada.
+    """
+    nama = (nama or sumber).lower()
+    if nama.endswith(".rabdb"):
+        if isinstance(sumber, str):
+            with open(sumber, "rb") as f: sumber = f.read()
+        return ProjectStore.dari_bytes(sumber).to_list()
+    if nama.endswith(".csv"):
+        chunks = pd.read_csv(sumber if isinstance(sumber, str) else BytesIO(sumber), chunksize=UKURAN_CHUNK_CSV)
+        hasil = pool.map(segmen_ke_items, chunks) if pool else map(segmen_ke_items, chunks)
+        return [item for items in hasil for item in items]
+    if isinstance(sumber, str):
+        with open(sumber, encoding="utf-8") as f: return json.load(f)
+    return json.loads(sumber)
+
+# --- CADANGAN PYTHON < 3.11 (TANPA serialize / deserialize) ---
+def _muat_lewat_file(data, conn):
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "proyek.rabdb")
+        with open(path, "wb") as f: f.write(data)
+        sumber = sqlite3.connect(path)
+        try: sumber.backup(conn)
+        finally: sumber.close()
+
+def _simpan_lewat_file(conn):
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "proyek.rabdb")
+        tujuan = sqlite3.connect(path)
+        try: conn.backup(tujuan)
+        finally: tujuan.close()
+        with open(path, "rb") as f: return f.read()
@@ -0,0 +1,194 @@
+import hmac
+import json
+import os
+import threading
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, MAP_PEKERJAAN, OVERHEAD_DEFAULT
+
+# ==========================================
+# PUSTAKA HARGA BERSAMA (SATU PER PROSES)
+# ==========================================
+# Semua sesi Streamlit berjalan di proses yang sama. Daftar harga referensi (Bengkulu + file di FOLDER_HARGA)
+# dan tabel turunannya (vektor harga, HSP per kode, MAP_PEKERJAAN + HSP) dimuat / dihitung sekali, lalu dibagi
+# ke semua sesi dalam bentuk read-only (MappingProxyType, array numpy write=False).
+# Sesi hanya menyimpan HargaSesi: nama daftar yang dipilih + harga yang di-override (kunci yang berbeda saja).
+# Invalidasi eksplisit: perbarui() / muat_ulang() menaikkan versi daftar; turunan versi lama dibuang,
+# sesi lain memakai versi baru pada rerun berikutnya (override sesi tetap berlaku).
+
+NAMA_DEFAULT = "Bengkulu 2024/2025"
+FOLDER_HARGA = os.environ.get("RAB_FOLDER_HARGA", "harga")
+EKSTENSI_HARGA = (".json", ".csv")
+MAKS_TURUNAN = 32 # Kombinasi (daftar, versi, overhead) yang turunannya disimpan
+# Menerbitkan / memuat ulang daftar bersama dari UI hanya dengan kunci admin ini; tanpa env hanya lewat skrip / restart.
+KUNCI_ADMIN = os.environ.get("RAB_ADMIN_HARGA")
+
+def baca_harga(sumber, nama=None):
+    """
+    Harga dari .json ({kunci: harga}) atau .csv (kolom: kunci, harga); path atau file (upload, `nama` untuk ekstensi).
+    Kunci yang tidak ada pakai HARGA_DEFAULT. Return: (prices, overhead)
+    """
+    nama = nama or sumber
+    if str(nama).lower().endswith(".csv"):
+        data = dict(pd.read_csv(sumber).set_index("kunci")["harga"])
+    elif isinstance(sumber, str):
+        with open(sumber, encoding="utf-8") as f: data = json.load(f)
+    else:
+        data = json.load(sumber)
+    overhead = float(data.pop("overhead", OVERHEAD_DEFAULT))
+    return {**HARGA_DEFAULT, **{k: float(v) for k, v in data.items()}}, overhead
+
+class DaftarHarga:
+    """1 versi daftar harga referensi (tidak diubah setelah dibuat; versi baru = objek baru)"""
+    __slots__ = ("nama", "versi", "prices", "overhead", "sumber")
+
+    def __init__(self, nama, versi, prices, overhead, sumber):
+        self.nama, self.versi, self.sumber = nama, versi, sumber
+        self.prices = MappingProxyType(dict(prices))
+        self.overhead = float(overhead)
+
+class TurunanHarga:
+    """Tabel turunan 1 daftar harga + overhead, format sama dengan RABInkremental (vektor, hsp, map_pekerjaan)"""
+    __slots__ = ("vektor", "hsp", "map_pekerjaan")
+
+    def __init__(self, prices, overhead_pct):
+        vektor = np.asarray(AHSP_Engine.vektor_harga(prices))
+        vektor.setflags(write=False)
+        hsp = dict(zip(AHSP_Engine.KODE, (AHSP_Engine.MATRIKS_KOEF @ vektor * (1 + overhead_pct/100)).tolist()))
+        self.vektor = vektor
+        self.hsp = MappingProxyType(hsp)
+        self.map_pekerjaan = MappingProxyType({key: (uraian, sat, k, hsp[k]) for key, (uraian, sat, k) in MAP_PEKERJAAN.items()})
+
+class PustakaHarga:
+    """Daftar harga referensi & turunannya, dipakai bersama semua sesi (thread-safe)"""
+
+    def __init__(self, folder=FOLDER_HARGA):
+        self.folder = folder
+        self._kunci = threading.RLock()
+        self._daftar = {NAMA_DEFAULT: DaftarHarga(NAMA_DEFAULT, 1, HARGA_DEFAULT, OVERHEAD_DEFAULT, "Harga Pasar Prov. Bengkulu (Estimasi 2024/2025)")}
+        self._file = {}     # nama -> (path, mtime) untuk daftar dari folder
+        self._turunan = {}  # (nama, versi, overhead) -> TurunanHarga (urutan sisip = LRU sederhana)
+        self.gagal = {}     # nama file -> pesan error saat muat_ulang terakhir
+        self.muat_ulang()
+
+    # --- DAFTAR ---
+    def daftar(self):
+        with self._kunci: return list(self._daftar)
+
+    def ambil(self, nama):
+        """Versi terbaru daftar `nama` (daftar default bila nama sudah tidak ada)"""
+        with self._kunci: return self._daftar.get(nama) or self._daftar[NAMA_DEFAULT]
+
+    def ringkasan(self):
+        with self._kunci:
+            return pd.DataFrame([{"Daftar Harga": d.nama, "Versi": d.versi, "Overhead (%)": d.overhead, "Sumber": d.sumber}
+                                 for d in self._daftar.values()])
+
+    # --- INVALIDASI ---
+    def perbarui(self, nama, prices, overhead, sumber="manual"):
+        """Terbitkan versi baru daftar `nama` untuk semua sesi; turunan versi lama dibuang"""
+        with self._kunci:
+            lama = self._daftar.get(nama)
+            self._daftar[nama] = baru = DaftarHarga(nama, lama.versi + 1 if lama else 1, prices, overhead, sumber)
+            self._buang_turunan(nama)
+            return baru
+
+    def hapus(self, nama):
+        if nama == NAMA_DEFAULT: raise ValueError("Daftar harga default tidak bisa dihapus")
+        with self._kunci:
+            self._daftar.pop(nama, None)
+            self._file.pop(nama, None)
+            self._buang_turunan(nama)
+
+    def muat_ulang(self):
+        """Baca ulang FOLDER_HARGA: file baru / berubah (mtime) diterbitkan, file yang hilang dihapus. Return: nama yang berubah"""
+        ada = {} if not self.folder or not os.path.isdir(self.folder) else {
+            os.path.splitext(f)[0]: os.path.join(self.folder, f) for f in sorted(os.listdir(self.folder)) if f.lower().endswith(EKSTENSI_HARGA)}
+        berubah = []
+        with self._kunci:
+            self.gagal = {}
+            for nama, path in ada.items():
+                mtime = os.path.getmtime(path)
+                if self._file.get(nama) == (path, mtime): continue
+                try:
+                    prices, overhead = baca_harga(path)
+                except Exception as e:
+                    self.gagal[nama] = f"{type(e).__name__}: {e}"
+                    continue
+                self.perbarui(nama, prices, overhead, sumber=path)
+                self._file[nama] = (path, mtime)
+                berubah.append(nama)
+            for nama in [n for n in self._file if n not in ada]:
+                self.hapus(nama)
+                berubah.append(nama)
+        return berubah
+
+    def _buang_turunan(self, nama):
+        for k in [k for k in self._turunan if k[0] == nama]: del self._turunan[k]
+
+    # --- TURUNAN ---
+    def turunan(self, daftar, overhead_pct=None):
+        """Vektor harga, HSP & MAP_PEKERJAAN+HSP read-only untuk DaftarHarga `daftar` (nama / objek; dihitung sekali per proses)"""
+        with self._kunci:
+            if isinstance(daftar, str): daftar = self.ambil(daftar)
+            overhead_pct = daftar.overhead if overhead_pct is None else float(overhead_pct)
+            kunci = (daftar.nama, daftar.versi, overhead_pct)
+            hasil = self._turunan.pop(kunci, None) or TurunanHarga(daftar.prices, overhead_pct)
+            self._turunan[kunci] = hasil
+            while len(self._turunan) > MAKS_TURUNAN: del self._turunan[next(iter(self._turunan))]
+            return hasil
+
+def admin_sah(kunci, kunci_admin=KUNCI_ADMIN):
+    """True bila `kunci` sama dengan kunci admin (perbandingan waktu-konstan); selalu False bila kunci admin tidak diatur"""
+    return bool(kunci_admin) and hmac.compare_digest(str(kunci or "").encode(), kunci_admin.encode())
+
+_PUSTAKA = None
+_KUNCI_PUSTAKA = threading.Lock()
+
+def pustaka():
+    """Instance PustakaHarga tunggal per proses (dibuat saat pertama dipakai)"""
+    global _PUSTAKA
+    with _KUNCI_PUSTAKA:
+        if _PUSTAKA is None: _PUSTAKA = PustakaHarga()
+        return _PUSTAKA
+
+class HargaSesi:
+    """Harga 1 sesi = daftar bersama + override sesi; hanya kunci yang berbeda dari daftar yang disimpan"""
+    __slots__ = ("nama", "override", "overhead")
+
+    def __init__(self, nama=NAMA_DEFAULT):
+        self.nama = nama
+        self.override = {}  # kunci harga -> nilai sesi
+        self.overhead = None # None = ikut overhead daftar
+
+    def catat(self, dasar, kunci, nilai):
+        """Simpan nilai input sesi sebagai override hanya bila berbeda dari daftar bersama"""
+        if nilai != dasar.prices[kunci]: self.override[kunci] = nilai
+        else: self.override.pop(kunci, None)
+
+    def catat_overhead(self, dasar, nilai):
+        self.overhead = None if nilai == dasar.overhead else float(nilai)
+
+    def muat(self, dasar, prices, overhead):
+        """Daftar harga upload dipakai sesi ini saja: disimpan sebagai override terhadap daftar bersama `dasar`"""
+        self.override = {k: float(v) for k, v in prices.items() if k in dasar.prices and float(v) != dasar.prices[k]}
+        self.catat_overhead(dasar, overhead)
+
+    def reset(self):
+        self.override.clear()
+        self.overhead = None
+
+    def prices(self, dasar):
+        """Dict harga untuk perhitungan (dibangun per rerun, tidak disimpan di sesi)"""
+        return {**dasar.prices, **self.override}
+
+    def overhead_pct(self, dasar):
+        return dasar.overhead if self.overhead is None else self.overhead
+
+    def turunan(self, pustaka_harga, dasar):
+        """Turunan bersama bila sesi tanpa override harga (overhead sesi tetap bisa dibagi); None bila harus dihitung sendiri"""
+        if self.override: return None
+        return pustaka_harga.turunan(dasar, self.overhead_pct(dasar))
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, OVERHEAD_DEFAULT, TARIF_PPN, hitung_rab
+from rab_excel import tulis_rab_excel
+from laporan_cetak import tulis_laporan_pdf
+from proyek_store import muat_proyek
+from pustaka_harga import baca_harga
+
+# ==========================================
+# RAB HEADLESS (TANPA STREAMLIT)
+# ==========================================
+# Contoh:
+#   python rab_cli.py rab_proyek.json segmen_das.csv --harga harga_2025.json --out-dir hasil/ --jobs 4 [--pdf]
+# Input proyek: .json (skema rab_proyek.json), .rabdb (ProjectStore) atau .csv segmen
+# (kolom: nama, tipe, + parameter Calculator.*_batch, lihat rab_engine.segmen_ke_items), dimuat proyek_store.muat_proyek.
+
+def muat_harga(path=None):
+    """Harga dari .json ({kunci: harga}) atau .csv (kolom: kunci, harga); kunci yang tidak ada pakai HARGA_DEFAULT"""
+    return baca_harga(path) if path else (dict(HARGA_DEFAULT), OVERHEAD_DEFAULT)
+
+def proses_proyek(data_proyek, prices, overhead, output_xlsx=None, output_pdf=None):
+    """Hitung RAB 1 proyek (+ tulis Excel / laporan PDF bila output_xlsx / output_pdf diisi); kembalikan ringkasan"""
+    rab_rows, grand_total = hitung_rab(data_proyek, prices, overhead)
+    if output_xlsx:
+        formulir = [AHSP_Engine.get_formulir(kode, prices, overhead) for kode in AHSP_Engine.KODE]
+        tulis_rab_excel(output_xlsx, rab_rows, data_proyek, formulir, overhead)
+    halaman_pdf = tulis_laporan_pdf(output_pdf, data_proyek, prices, overhead) if output_pdf else 0
+    return {
+        "jumlah_item": len(data_proyek), "jumlah": grand_total,
+        "ppn": grand_total * TARIF_PPN, "total_akhir": grand_total * (1 + TARIF_PPN),
+        "excel": output_xlsx, "pdf": output_pdf, "halaman_pdf": halaman_pdf,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hitung RAB (AHSP SDA) tanpa Streamlit")
+    parser.add_argument("proyek", nargs="+", help="File proyek: .json / .rabdb / .csv segmen")
+    parser.add_argument("--harga", help="File harga .json / .csv (default: Harga Bengkulu)")
+    parser.add_argument("--overhead", type=float, help="Overhead & Profit (%%), menimpa nilai di file harga")
+    parser.add_argument("--out-dir", default=".", help="Folder output Excel & rekap")
+    parser.add_argument("--pdf", action="store_true", help="Tulis juga laporan cetak PDF (Rekap, Detail, AHSP, Back-Up)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Jumlah proses paralel")
+    args = parser.parse_args(argv)
+
+    prices, overhead = muat_harga(args.harga)
+    if args.overhead is not None: overhead = args.overhead
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {}
+        for path in args.proyek:
+            nama = os.path.splitext(os.path.basename(path))[0]
+            data_proyek = muat_proyek(path, pool=pool)
+            output_xlsx = os.path.join(args.out_dir, f"RAB_{nama}.xlsx")
+            output_pdf = os.path.join(args.out_dir, f"RAB_{nama}.pdf") if args.pdf else None
+            futures[path] = pool.submit(proses_proyek, data_proyek, prices, overhead, output_xlsx, output_pdf)
+        rekap = [{"proyek": path, **f.result()} for path, f in futures.items()]
+
+    df_rekap = pd.DataFrame(rekap)
+    df_rekap.to_csv(os.path.join(args.out_dir, "rekap_rab.csv"), index=False)
+    for r in rekap:
+        print(f"{r['proyek']}: {r['jumlah_item']} item | Total Akhir Rp {r['total_akhir']:,.0f} -> {r['excel']}"
+              + (f" | {r['pdf']} ({r['halaman_pdf']} halaman)" if r['pdf'] else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,675 @@
+import math
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# ENGINE RAB (TANPA STREAMLIT)
+# ==========================================
+# Dipakai oleh BIM_RAB.py (UI) dan rab_cli.py (batch/headless).
+
+# --- 1. LIBRARY AHSP & HARGA (DATABASE BENGKULU) ---
+# Harga default: Harga Pasar Prov. Bengkulu (Estimasi 2024/2025)
+HARGA_DEFAULT = {
+    'u_pekerja': 115000.0, 'u_tukang': 140000.0, 'u_mandor': 165000.0,
+    'p_semen': 1650.0, 'p_pasir': 215000.0, 'p_batu': 265000.0,
+    'p_split': 325000.0, 'p_besi': 15500.0, 'p_kayu': 2850000.0,
+    'p_paku': 20000.0, 'p_kawat': 22000.0, 'p_minyak': 25000.0
+}
+OVERHEAD_DEFAULT = 15.0 # SDA biasanya 10-15%
+
+# Registry koefisien AHSP: kode -> (uraian, [(sumber daya, koefisien, kunci harga)])
+AHSP_REGISTRY = {
+    # --- A. PEKERJAAN TANAH (SDA) ---
+    "T.06.a.1": {"kode": "T.06.a.1", "uraian": "1 m3 Galian Tanah Biasa (Manual)", "items": [
+        ("Pekerja", 0.750, "u_pekerja"),
+        ("Mandor", 0.025, "u_mandor"),
+    ]},
+    "T.14.a": {"kode": "T.14.a", "uraian": "1 m3 Timbunan Kembali Dipadatkan", "items": [
+        ("Pekerja", 0.330, "u_pekerja"),
+        ("Mandor", 0.010, "u_mandor"),
+    ]},
+    "T.15.a": {"kode": "T.15.a", "uraian": "1 m3 Bongkaran Pasangan", "items": [
+        ("Pekerja", 2.000, "u_pekerja"),
+        ("Mandor", 0.100, "u_mandor"),
+    ]},
+    # --- B. PEKERJAAN PASANGAN (SDA) ---
+    "P.01.a": {"kode": "P.01.a (SDA)", "uraian": "1 m3 Pasangan Batu Camp. 1:4", "items": [
+        ("Pekerja", 1.200, "u_pekerja"),
+        ("Tukang Batu", 0.600, "u_tukang"),
+        ("Mandor", 0.060, "u_mandor"),
+        ("Batu Kali", 1.200, "p_batu"),
+        ("Semen (PC)", 163.00, "p_semen"),
+        ("Pasir Pasang", 0.520, "p_pasir"),
+    ]},
+    "P.04.e": {"kode": "P.04.e", "uraian": "1 m2 Plesteran 1:3 + Acian", "items": [
+        ("Pekerja", 0.300, "u_pekerja"),
+        ("Tukang Batu", 0.150, "u_tukang"),
+        ("Mandor", 0.015, "u_mandor"),
+        ("Semen (PC)", 7.776, "p_semen"), # 6.24 plester + acian
+        ("Pasir Pasang", 0.024, "p_pasir"),
+    ]},
+    "P.05.a": {"kode": "P.05.a", "uraian": "1 m2 Siaran Camp. 1:2", "items": [
+        ("Pekerja", 0.150, "u_pekerja"),
+        ("Tukang Batu", 0.075, "u_tukang"),
+        ("Mandor", 0.008, "u_mandor"),
+        ("Semen (PC)", 6.000, "p_semen"), # Estimasi Siaran
+        ("Pasir Pasang", 0.010, "p_pasir"),
+    ]},
+    # --- C. PEKERJAAN BETON (SDA) ---
+    "B.05.a": {"kode": "B.05.a", "uraian": "1 m3 Beton Mutu K-225 (f'c 19.3 MPa)", "items": [
+        ("Pekerja", 1.650, "u_pekerja"),
+        ("Tukang Batu", 0.275, "u_tukang"),
+        ("Mandor", 0.083, "u_mandor"),
+        ("Semen (PC)", 371.0, "p_semen"),
+        ("Pasir Beton", 0.499, "p_pasir"),
+        ("Split/Kerikil", 0.776, "p_split"),
+    ]},
+    "B.17.a": {"kode": "B.17.a", "uraian": "1 kg Pembesian Besi Polos/Ulir", "items": [
+        ("Pekerja", 0.007, "u_pekerja"),
+        ("Tukang Besi", 0.007, "u_tukang"),
+        ("Mandor", 0.0004, "u_mandor"),
+        ("Besi Beton", 1.050, "p_besi"), # Waste 5%
+        ("Kawat Beton", 0.015, "p_kawat"),
+    ]},
+    "B.20.a": {"kode": "B.20.a", "uraian": "1 m2 Pasang Bekisting (Kayu Kls III)", "items": [ # 2x Pakai
+        ("Pekerja", 0.520, "u_pekerja"),
+        ("Tukang Kayu", 0.260, "u_tukang"),
+        ("Mandor", 0.026, "u_mandor"),
+        ("Kayu Kelas III", 0.045, "p_kayu"),
+        ("Paku", 0.300, "p_paku"),
+        ("Minyak Bekisting", 0.100, "p_minyak"), # Asumsi liter
+    ]},
+}
+
+def _bangun_matriks_koef(registry):
+    """Matriks koefisien [kode AHSP x sumber daya] + kunci harga tiap sumber daya (dibangun sekali)."""
+    sumber_daya, kunci_harga = [], []
+    for data in registry.values():
+        for nama, _, kunci in data['items']:
+            if nama not in sumber_daya:
+                sumber_daya.append(nama)
+                kunci_harga.append(kunci)
+    posisi = {nama: j for j, nama in enumerate(sumber_daya)}
+    matriks = np.zeros((len(registry), len(sumber_daya)))
+    for i, data in enumerate(registry.values()):
+        for nama, koef, _ in data['items']:
+            matriks[i, posisi[nama]] += koef
+    matriks.setflags(write=False)
+    return sumber_daya, kunci_harga, matriks
+
+class AHSP_Engine:
+    """
+    Engine Analisa Harga Satuan Pekerjaan (AHSP) Bidang SDA.
+    Referensi: SE Menteri PUPR Bidang SDA.
+    Lokasi Harga: Provinsi Bengkulu (Estimasi)
+    """
+    KODE = list(AHSP_REGISTRY)
+    SUMBER_DAYA, KUNCI_HARGA, MATRIKS_KOEF = _bangun_matriks_koef(AHSP_REGISTRY)
+
+    @staticmethod
+    def vektor_harga(prices):
+        """Vektor harga per sumber daya (urutan AHSP_Engine.SUMBER_DAYA)"""
+        return tuple(float(prices.get(k, HARGA_DEFAULT.get(k, 0.0))) for k in AHSP_Engine.KUNCI_HARGA)
+
+    @staticmethod
+    def get_analisa_detail(hsp_code, prices):
+        """Mengembalikan Rincian Analisa dalam format Dictionary"""
+        data = AHSP_REGISTRY.get(hsp_code)
+        if data is None:
+            return {"kode": "N/A", "uraian": "Item Tidak Ditemukan", "items": []}
+        koef = [(nama, k, prices.get(kunci, HARGA_DEFAULT.get(kunci, 0.0))) for nama, k, kunci in data['items']]
+        return {"kode": data['kode'], "uraian": data['uraian'], "items": koef}
+
+    @staticmethod
+    def get_formulir(hsp_code, prices, overhead_pct):
+        """Formulir Standar Analisa Harga Satuan (Tenaga/Bahan + Rekap Overhead)"""
+        detail_ahsp = AHSP_Engine.get_analisa_detail(hsp_code, prices)
+        data_form = []
+        total_upah = 0
+        total_bahan = 0
+        for uraian, koef, harga in detail_ahsp['items']:
+            jumlah = koef * harga
+            kategori_item = "Upah" if "Pekerja" in uraian or "Tukang" in uraian or "Mandor" in uraian else "Bahan"
+            
+            if kategori_item == "Upah": total_upah += jumlah
+            else: total_bahan += jumlah
+                
+            data_form.append({
+                "Uraian": uraian,
+                "Koefisien": koef,
+                "Satuan": "OH" if kategori_item == "Upah" else ("kg" if "Semen" in uraian or "Besi" in uraian else "m3"),
+                "Harga Satuan (Rp)": harga,
+                "Jumlah Harga (Rp)": jumlah,
+                "Kategori": kategori_item
+            })
+        jum_dasar = total_upah + total_bahan
+        ovr_val = jum_dasar * (overhead_pct/100)
+        return {
+            "kode": detail_ahsp['kode'], "uraian": detail_ahsp['uraian'], "rows": data_form,
+            "total_upah": total_upah, "total_bahan": total_bahan,
+            "jum_dasar": jum_dasar, "ovr_val": ovr_val, "jum_final": jum_dasar + ovr_val
+        }
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _tabel_harga_satuan(vektor, overhead_pct):
+        hsp = AHSP_Engine.MATRIKS_KOEF @ np.asarray(vektor) * (1 + overhead_pct/100)
+        return MappingProxyType(dict(zip(AHSP_Engine.KODE, hsp.tolist()))) # Cache dipakai semua sesi: read-only
+
+    @staticmethod
+    def tabel_harga_satuan(prices, overhead_pct):
+        """Semua HSP sekaligus: satu perkalian matriks-vektor, di-memo berdasarkan vektor harga."""
+        return AHSP_Engine._tabel_harga_satuan(AHSP_Engine.vektor_harga(prices), float(overhead_pct))
+
+    @staticmethod
+    def hitung_harga_satuan(hsp_code, prices, overhead_pct):
+        return AHSP_Engine.tabel_harga_satuan(prices, overhead_pct).get(hsp_code, 0.0)
+
+# --- 2. LIBRARY PERHITUNGAN VOLUME (ENGINEERING CORE - V.11) ---
+# Batas desain bersama: dipakai Calculator, optimasi_usbr & validator_rab
+SF_UPLIFT_MIN = 1.5 # SF uplift minimum kolam olak terjunan (status_uplift "AMAN")
+
+class Calculator:
+    
+    # 3.1 SALURAN BETON
+    @staticmethod
+    def hitung_beton_struktur(h, b, m, panjang, t_cm, dia, jarak, lapis, waste, fc, fy, is_rehab):
+        if h <= 0 or panjang <= 0: return {"vol_beton": 0, "rho_data": {"status": "DATA KOSONG"}}
+        gamma_air, selimut = 9.81, 40
+        t_mm = t_cm * 10
+        d_eff = max(1.0, t_mm - selimut - (dia/2))
+        Mu = 1.6 * (1/6) * gamma_air * (h**3)
+        sisi_miring = h * math.sqrt(1 + m**2)
+        t_rekom = max((Mu / (0.85 * 2000))**0.5, sisi_miring / 12, 0.10) * 100 
+        As_per_meter = (1000 / jarak) * (0.25 * math.pi * dia**2) * lapis
+        rho_actual = As_per_meter / (1000 * d_eff)
+        rho_min = 1.4 / fy if fy > 0 else 0.0014
+        rho_max = 0.75 * ((0.85 * (0.85 if fc<=28 else 0.65) * fc / fy) * (600/(600+fy)))
+        status_rho = "AMAN" if rho_min <= rho_actual <= rho_max else ("KURANG BESI" if rho_actual < rho_min else "BOROS BESI")
+        t_m = t_cm / 100
+        vol_beton = (b + 2*(h*math.sqrt(1+m**2)) + 2*t_m) * t_m * panjang
+        vol_galian = ((b + 2*t_m*math.sqrt(1+m**2) + 0.4 + (b + 2*t_m*math.sqrt(1+m**2) + 0.4 + 2*m*(h+t_m+0.2)))/2) * (h+t_m+0.2) * panjang
+        return {
+            "mu": Mu, "t_rekom": t_rekom,
+            "rho_data": {"act": rho_actual, "min": rho_min, "max": rho_max, "status": status_rho},
+            "vol_beton": vol_beton, "vol_galian": vol_galian, "vol_timbunan": max(0, (vol_galian-vol_beton)*0.45),
+            "berat_besi": (b + 2*(h*math.sqrt(1+m**2))) * ((panjang*100/jarak)+1) * lapis * (0.006165*dia**2) * 1.2 * (1+waste/100),
+            "luas_bekisting": (2 * sisi_miring * panjang) * 2, "vol_bongkaran": vol_beton if is_rehab else 0
+        }
+
+    # 3.2 SALURAN BATU
+    @staticmethod
+    def hitung_pasangan_batu(h, b, m, panjang, l_atas, l_bawah, t_lantai, is_rehab):
+        vol_batu = ((((l_atas+l_bawah)/2)*h)*2 + (b*t_lantai)) * panjang
+        return {
+            "mu": 0, "t_rekom": 0, "rho_data": None,
+            "vol_batu": vol_batu, "vol_galian": vol_batu*1.25, "vol_timbunan": max(0, (vol_batu*1.25 - vol_batu)*0.35),
+            "luas_plester": ((2*h*math.sqrt(1+m**2))+b)*panjang, "luas_siaran": (2*l_atas)*panjang, "vol_bongkaran": vol_batu if is_rehab else 0
+        }
+
+    # 3.3 BOX CULVERT
+    @staticmethod
+    def hitung_gorong_box_struktur(w, h, p, t_cm, dia, jarak, fc, fy, is_rehab):
+        if w<=0 or h<=0: return {"vol_beton": 0, "t_rekom": 0, "rho_data": {"status": "DATA 0"}}
+        t_m = t_cm / 100
+        Mu = (1/10) * ((18*1.5)+10) * ((w+t_m)**2)
+        d_eff = (t_cm*10) - 40 - (dia/2)
+        t_rekom = max((Mu/(0.85*2000))**0.5 * 100, (w+t_m)/12*100, 15.0)
+        rho_act = ((1000/jarak)*(0.25*math.pi*dia**2)*2) / (1000*d_eff)
+        status = "AMAN" if (1.4/fy) <= rho_act <= 0.025 else ("KURANG" if rho_act < 1.4/fy else "BOROS")
+        vol_beton = ((w+2*t_m)*(h+2*t_m)*p) - (w*h*p)
+        return {
+            "mu": Mu, "t_rekom": t_rekom, "rho_data": {"act": rho_act, "min": 1.4/fy, "max": 0.025, "status": status},
+            "vol_beton": vol_beton, "vol_galian": vol_beton/0.2, "vol_timbunan": vol_beton/0.5,
+            "berat_besi": 2*((w+2*t_m)+(h+2*t_m))*2 * ((p*100/jarak)+1) * (0.006165*dia**2) * 1.2,
+            "luas_bekisting": (2*w+2*h)*p, "vol_bongkaran": vol_beton if is_rehab else 0
+        }
+
+    # 3.4 TERJUNAN USBR + MODE HEMAT
+    @staticmethod
+    def hitung_terjunan_usbr(Q, H_total, H_step, B, t_lantai, t_dinding, qa_tanah, mode_hemat, is_rehab):
+        if H_step <= 0: H_step = 0.1
+        if B <= 0: B = 1.0
+        if Q <= 0: Q = 0.1 
+        g = 9.81
+        n_steps = math.ceil(H_total / H_step)
+        H_real = H_total / n_steps 
+        q = Q / B
+        V1 = math.sqrt(2 * g * H_real)
+        y1 = q / V1
+        Fr1 = V1 / math.sqrt(g * y1)
+        y2 = 0.5 * y1 * (math.sqrt(1 + 8 * Fr1**2) - 1)
+        
+        tipe_usbr = "Unknown"
+        k_length = 0
+        if Fr1 < 1.7: tipe_usbr, k_length = "Aliran Undular", 4.0
+        elif Fr1 < 2.5: tipe_usbr, k_length = "USBR Tipe I", 5.0
+        elif Fr1 <= 4.5: tipe_usbr, k_length = "USBR Tipe IV", 6.0 
+        else:
+            if V1 < 18.0: tipe_usbr, k_length = "USBR Tipe III", 2.7 
+            else: tipe_usbr, k_length = "USBR Tipe II", 4.3
+        
+        L_kolam_standard = k_length * y2
+        L_drop = 4.30 * H_real * ((q**2 / (g * H_real**3))**0.27)
+        
+        is_hemat_active = mode_hemat and (H_real <= 1.2)
+        L_kolam_inter = 0.5 if is_hemat_active else L_kolam_standard
+        tipe_desain = "Mode Hemat (Kolam Hilir Saja)" if is_hemat_active else "Standard (Full USBR)"
+        L_kolam_final = L_kolam_standard 
+        
+        jml_inter = max(0, n_steps - 1)
+        L_total_structure_linear = (jml_inter * (L_drop + L_kolam_inter)) + (1 * (L_drop + L_kolam_final))
+        
+        gamma_c, gamma_w = 24, 9.81
+        L_final_segment = L_drop + L_kolam_final
+        W_beton = L_final_segment * B * t_lantai * gamma_c
+        W_air = 0.5 * (y1 + y2) * L_final_segment * B * gamma_w
+        Total_Berat = W_beton + W_air
+        head_hulu = y2 + (0.5 * H_real)
+        Uplift_Force = 0.5 * (head_hulu + y2) * L_final_segment * B * gamma_w
+        SF_uplift = Total_Berat / Uplift_Force if Uplift_Force > 0 else 99
+        Tekanan_Netto = (Total_Berat - Uplift_Force) / (B * L_final_segment)
+        if Tekanan_Netto < 0: Tekanan_Netto = 0
+        
+        status_uplift = "AMAN" if SF_uplift >= SF_UPLIFT_MIN else "⚠️ BAHAYA (Mengapung)"
+        status_tanah = "AMAN" if Tekanan_Netto <= qa_tanah else "⚠️ BAHAYA (Amblas)"
+        
+        h_dinding = y2 + 0.6 
+        vol_lantai = L_total_structure_linear * B * t_lantai
+        vol_mercu = n_steps * (B * H_real * 0.4) 
+        vol_dinding = 2 * (L_total_structure_linear * h_dinding * t_dinding)
+        vol_beton_total = vol_lantai + vol_mercu + vol_dinding
+        
+        ratio_besi = 120.0
+        if SF_uplift < SF_UPLIFT_MIN: ratio_besi += 10 
+        if "USBR Tipe III" in tipe_usbr: ratio_besi += 15
+        
+        return {
+            "info_struktur": f"{tipe_usbr} ({n_steps} Trap) - {tipe_desain}",
+            "detail_usbr": {"Fr": Fr1, "y1": y1, "y2": y2, "L_kolam_final": L_kolam_final, "L_total": L_total_structure_linear},
+            "stabilitas": {"sf_uplift": SF_uplift, "status_uplift": status_uplift, "sigma_tanah": Tekanan_Netto, "status_tanah": status_tanah},
+            "vol_beton": vol_beton_total, "vol_batu": 0, "vol_galian": vol_beton_total * 1.3, 
+            "vol_timbunan": vol_beton_total * 0.3, "berat_besi": vol_beton_total * ratio_besi, 
+            "luas_bekisting": (2 * L_total_structure_linear * h_dinding) + (n_steps*B*H_real),
+            "luas_plester": (2 * L_total_structure_linear * h_dinding), "luas_siaran": 0,
+            "vol_bongkaran": vol_beton_total if is_rehab else 0
+        }
+
+    # 3.5 MODE BATCH (VEKTOR) - 1 BARIS = 1 SEGMEN
+    # Rumus identik dengan fungsi skalar di atas, termasuk jalur guard (h <= 0, H_step <= 0, dst).
+    @staticmethod
+    def hitung_beton_struktur_batch(data, **konstan):
+        h, b, m, panjang, t_cm, dia, jarak, lapis, waste, fc, fy, is_rehab = _kolom_batch(
+            data, ["h", "b", "m", "panjang", "t_cm", "dia", "jarak", "lapis", "waste", "fc", "fy", "is_rehab"], konstan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gamma_air, selimut = 9.81, 40
+            t_mm = t_cm * 10
+            d_eff = np.maximum(1.0, t_mm - selimut - (dia/2))
+            Mu = 1.6 * (1/6) * gamma_air * (h**3)
+            sisi_miring = h * np.sqrt(1 + m**2)
+            t_rekom = np.maximum(np.maximum((Mu / (0.85 * 2000))**0.5, sisi_miring / 12), 0.10) * 100
+            As_per_meter = (1000 / jarak) * (0.25 * math.pi * dia**2) * lapis
+            rho_actual = As_per_meter / (1000 * d_eff)
+            rho_min = np.where(fy > 0, 1.4 / fy, 0.0014)
+            rho_max = 0.75 * ((0.85 * np.where(fc <= 28, 0.85, 0.65) * fc / fy) * (600/(600+fy)))
+            status_rho = np.where((rho_min <= rho_actual) & (rho_actual <= rho_max), "AMAN",
+                                  np.where(rho_actual < rho_min, "KURANG BESI", "BOROS BESI"))
+            t_m = t_cm / 100
+            vol_beton = (b + 2*(h*np.sqrt(1+m**2)) + 2*t_m) * t_m * panjang
+            vol_galian = ((b + 2*t_m*np.sqrt(1+m**2) + 0.4 + (b + 2*t_m*np.sqrt(1+m**2) + 0.4 + 2*m*(h+t_m+0.2)))/2) * (h+t_m+0.2) * panjang
+            berat_besi = (b + 2*(h*np.sqrt(1+m**2))) * ((panjang*100/jarak)+1) * lapis * (0.006165*dia**2) * 1.2 * (1+waste/100)
+        kosong = (h <= 0) | (panjang <= 0)
+        hasil = pd.DataFrame({
+            "mu": Mu, "t_rekom": t_rekom,
+            "rho_act": rho_actual, "rho_min": rho_min, "rho_max": rho_max, "rho_status": status_rho,
+            "vol_beton": vol_beton, "vol_galian": vol_galian, "vol_timbunan": np.maximum(0, (vol_galian-vol_beton)*0.45),
+            "berat_besi": berat_besi, "luas_bekisting": (2 * sisi_miring * panjang) * 2,
+            "vol_bongkaran": np.where(is_rehab != 0, vol_beton, 0.0),
+        }, index=_index_batch(data, h))
+        hasil.loc[kosong, hasil.columns != "rho_status"] = np.nan
+        hasil.loc[kosong, "vol_beton"] = 0.0
+        hasil.loc[kosong, "rho_status"] = "DATA KOSONG"
+        return hasil
+
+    @staticmethod
+    def hitung_pasangan_batu_batch(data, **konstan):
+        h, b, m, panjang, l_atas, l_bawah, t_lantai, is_rehab = _kolom_batch(
+            data, ["h", "b", "m", "panjang", "l_atas", "l_bawah", "t_lantai", "is_rehab"], konstan)
+        vol_batu = ((((l_atas+l_bawah)/2)*h)*2 + (b*t_lantai)) * panjang
+        return pd.DataFrame({
+            "mu": 0.0, "t_rekom": 0.0,
+            "vol_batu": vol_batu, "vol_galian": vol_batu*1.25, "vol_timbunan": np.maximum(0, (vol_batu*1.25 - vol_batu)*0.35),
+            "luas_plester": ((2*h*np.sqrt(1+m**2))+b)*panjang, "luas_siaran": (2*l_atas)*panjang,
+            "vol_bongkaran": np.where(is_rehab != 0, vol_batu, 0.0),
+        }, index=_index_batch(data, h))
+
+    @staticmethod
+    def hitung_gorong_box_struktur_batch(data, **konstan):
+        w, h, p, t_cm, dia, jarak, fc, fy, is_rehab = _kolom_batch(
+            data, ["w", "h", "p", "t_cm", "dia", "jarak", "fc", "fy", "is_rehab"], konstan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_m = t_cm / 100
+            Mu = (1/10) * ((18*1.5)+10) * ((w+t_m)**2)
+            d_eff = (t_cm*10) - 40 - (dia/2)
+            t_rekom = np.maximum(np.maximum((Mu/(0.85*2000))**0.5 * 100, (w+t_m)/12*100), 15.0)
+            rho_act = ((1000/jarak)*(0.25*math.pi*dia**2)*2) / (1000*d_eff)
+            rho_min = 1.4/fy
+            status = np.where((rho_min <= rho_act) & (rho_act <= 0.025), "AMAN",
+                              np.where(rho_act < rho_min, "KURANG", "BOROS"))
+            vol_beton = ((w+2*t_m)*(h+2*t_m)*p) - (w*h*p)
+            berat_besi = 2*((w+2*t_m)+(h+2*t_m))*2 * ((p*100/jarak)+1) * (0.006165*dia**2) * 1.2
+        kosong = (w <= 0) | (h <= 0)
+        hasil = pd.DataFrame({
+            "mu": Mu, "t_rekom": t_rekom,
+            "rho_act": rho_act, "rho_min": rho_min, "rho_max": 0.025, "rho_status": status,
+            "vol_beton": vol_beton, "vol_galian": vol_beton/0.2, "vol_timbunan": vol_beton/0.5,
+            "berat_besi": berat_besi, "luas_bekisting": (2*w+2*h)*p,
+            "vol_bongkaran": np.where(is_rehab != 0, vol_beton, 0.0),
+        }, index=_index_batch(data, w))
+        hasil.loc[kosong, hasil.columns != "rho_status"] = np.nan
+        hasil.loc[kosong, ["vol_beton", "t_rekom"]] = 0.0
+        hasil.loc[kosong, "rho_status"] = "DATA 0"
+        return hasil
+
+    @staticmethod
+    def hitung_terjunan_usbr_batch(data, **konstan):
+        Q, H_total, H_step, B, t_lantai, t_dinding, qa_tanah, mode_hemat, is_rehab = _kolom_batch(
+            data, ["Q", "H_total", "H_step", "B", "t_lantai", "t_dinding", "qa_tanah", "mode_hemat", "is_rehab"], konstan)
+        H_step = np.where(H_step <= 0, 0.1, H_step)
+        B = np.where(B <= 0, 1.0, B)
+        Q = np.where(Q <= 0, 0.1, Q)
+        g = 9.81
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n_steps = np.ceil(H_total / H_step)
+            H_real = H_total / n_steps
+            q = Q / B
+            V1 = np.sqrt(2 * g * H_real)
+            y1 = q / V1
+            Fr1 = V1 / np.sqrt(g * y1)
+            y2 = 0.5 * y1 * (np.sqrt(1 + 8 * Fr1**2) - 1)
+
+            kondisi = [Fr1 < 1.7, Fr1 < 2.5, Fr1 <= 4.5, V1 < 18.0]
+            tipe_usbr = np.select(kondisi, ["Aliran Undular", "USBR Tipe I", "USBR Tipe IV", "USBR Tipe III"], "USBR Tipe II")
+            k_length = np.select(kondisi, [4.0, 5.0, 6.0, 2.7], 4.3)
+
+            L_kolam_standard = k_length * y2
+            L_drop = 4.30 * H_real * ((q**2 / (g * H_real**3))**0.27)
+
+            is_hemat_active = (mode_hemat != 0) & (H_real <= 1.2)
+            L_kolam_inter = np.where(is_hemat_active, 0.5, L_kolam_standard)
+            tipe_desain = np.where(is_hemat_active, "Mode Hemat (Kolam Hilir Saja)", "Standard (Full USBR)")
+            L_kolam_final = L_kolam_standard
+
+            jml_inter = np.maximum(0, n_steps - 1)
+            L_total_structure_linear = (jml_inter * (L_drop + L_kolam_inter)) + (1 * (L_drop + L_kolam_final))
+
+            gamma_c, gamma_w = 24, 9.81
+            L_final_segment = L_drop + L_kolam_final
+            W_beton = L_final_segment * B * t_lantai * gamma_c
+            W_air = 0.5 * (y1 + y2) * L_final_segment * B * gamma_w
+            Total_Berat = W_beton + W_air
+            head_hulu = y2 + (0.5 * H_real)
+            Uplift_Force = 0.5 * (head_hulu + y2) * L_final_segment * B * gamma_w
+            SF_uplift = np.where(Uplift_Force > 0, Total_Berat / Uplift_Force, 99)
+            Tekanan_Netto = np.maximum((Total_Berat - Uplift_Force) / (B * L_final_segment), 0)
+
+            h_dinding = y2 + 0.6
+            vol_lantai = L_total_structure_linear * B * t_lantai
+            vol_mercu = n_steps * (B * H_real * 0.4)
+            vol_dinding = 2 * (L_total_structure_linear * h_dinding * t_dinding)
+            vol_beton_total = vol_lantai + vol_mercu + vol_dinding
+
+        ratio_besi = 120.0 + np.where(SF_uplift < SF_UPLIFT_MIN, 10, 0) + np.where(tipe_usbr == "USBR Tipe III", 15, 0)
+        n_trap = np.nan_to_num(n_steps).astype(int).astype(str)
+        info = pd.Series(tipe_usbr) + " (" + n_trap + " Trap) - " + pd.Series(tipe_desain)
+        return pd.DataFrame({
+            "info_struktur": info.to_numpy(), "tipe_usbr": tipe_usbr, "n_steps": n_steps,
+            "Fr": Fr1, "y1": y1, "y2": y2, "L_kolam_final": L_kolam_final, "L_total": L_total_structure_linear,
+            "sf_uplift": SF_uplift, "status_uplift": np.where(SF_uplift >= SF_UPLIFT_MIN, "AMAN", "⚠️ BAHAYA (Mengapung)"),
+            "sigma_tanah": Tekanan_Netto, "status_tanah": np.where(Tekanan_Netto <= qa_tanah, "AMAN", "⚠️ BAHAYA (Amblas)"),
+            "vol_beton": vol_beton_total, "vol_batu": 0.0, "vol_galian": vol_beton_total * 1.3,
+            "vol_timbunan": vol_beton_total * 0.3, "berat_besi": vol_beton_total * ratio_besi,
+            "luas_bekisting": (2 * L_total_structure_linear * h_dinding) + (n_steps*B*H_real),
+            "luas_plester": (2 * L_total_structure_linear * h_dinding), "luas_siaran": 0.0,
+            "vol_bongkaran": np.where(is_rehab != 0, vol_beton_total, 0.0),
+        }, index=_index_batch(data, Q))
+
+def _kolom_batch(data, nama_kolom, konstan):
+    """Ambil kolom input batch (DataFrame / dict of array) sebagai array float; konstanta di-broadcast."""
+    kolom = []
+    for nama in nama_kolom:
+        if nama in konstan: nilai = konstan[nama]
+        elif nama in data: nilai = data[nama]
+        else: raise KeyError(f"Kolom input batch '{nama}' tidak ditemukan")
+        kolom.append(np.asarray(nilai, dtype=float))
+    return np.broadcast_arrays(*kolom)
+
+def _index_batch(data, acuan):
+    return data.index if isinstance(data, pd.DataFrame) else pd.RangeIndex(len(np.atleast_1d(acuan)))
+
+# --- 3. RAB (VOLUME x HARGA SATUAN) ---
+# Kunci volume -> (uraian, satuan, kode AHSP)
+MAP_PEKERJAAN = {
+    "vol_bongkaran": ("Bongkaran Pasangan Eksisting", "m3", "T.15.a"),
+    "vol_galian": ("Galian Tanah Biasa", "m3", "T.06.a.1"),
+    "vol_timbunan": ("Timbunan Kembali Dipadatkan", "m3", "T.14.a"),
+    "vol_beton": ("Beton K-225 (Struktur)", "m3", "B.05.a"),
+    "vol_batu": ("Pasangan Batu Kali 1:4", "m3", "P.01.a"),
+    "berat_besi": ("Pembesian Ulir/Polos", "kg", "B.17.a"),
+    "luas_bekisting": ("Pasang Bekisting", "m2", "B.20.a"),
+    "luas_plester": ("Plesteran 1:3 + Acian", "m2", "P.04.e"),
+    "luas_siaran": ("Siaran 1:2", "m2", "P.05.a"),
+}
+TARIF_PPN = 0.11
+
+def hitung_rab(data_proyek, prices, overhead_pct, no_awal=1):
+    """Baris RAB Detail (format sheet 'RAB Detail') untuk semua item + grand total (sebelum PPN)"""
+    tabel_hsp = AHSP_Engine.tabel_harga_satuan(prices, overhead_pct)
+    rab_rows = []
+    grand_total = 0
+    for i, item in enumerate(data_proyek, start=no_awal):
+        for key, val in item['vol'].items():
+            if key in MAP_PEKERJAAN and val > 0.001:
+                uraian, sat, kode_ahsp = MAP_PEKERJAAN[key]
+                harga = tabel_hsp[kode_ahsp]
+                jumlah = val * harga
+                grand_total += jumlah
+                rab_rows.append({"No": i, "Item": item['nama'], "Kode": kode_ahsp, "Uraian": uraian, "Vol": val, "Sat": sat, "H.Sat": harga, "Total": jumlah})
+    return rab_rows, grand_total
+
+def matriks_volume(data_proyek):
+    """Matriks kuantitas proyek [item x kode AHSP] (urutan AHSP_Engine.KODE), aturan sama dengan hitung_rab (vol > 0.001)"""
+    kolom = {kode: j for j, kode in enumerate(AHSP_Engine.KODE)}
+    matriks = np.zeros((len(data_proyek), len(kolom)))
+    for i, item in enumerate(data_proyek):
+        for key, val in item['vol'].items():
+            if key in MAP_PEKERJAAN and val > 0.001:
+                matriks[i, kolom[MAP_PEKERJAAN[key][2]]] += val
+    return matriks
+
+def biaya_batch(df_vol, tabel_hsp):
+    """Biaya langsung (sebelum PPN) per baris hasil Calculator.*_batch, aturan sama dengan hitung_rab (vol > 0.001)"""
+    biaya = np.zeros(len(df_vol))
+    for key, (_, _, kode_ahsp) in MAP_PEKERJAAN.items():
+        if key in df_vol:
+            vol = df_vol[key].fillna(0).to_numpy(dtype=float)
+            biaya += np.where(vol > 0.001, vol * tabel_hsp[kode_ahsp], 0.0)
+    return biaya
+
+def baris_rincian_rab(kunci, map_pekerjaan):
+    """Baris RAB 1 item dari tuple (kunci volume, volume, harga satuan) tanpa tabel ter-format: (rows, subtotal)"""
+    item_rows = []
+    for key, val, harga in kunci:
+        uraian, sat, kode_ahsp, _ = map_pekerjaan[key]
+        item_rows.append({"Kode": kode_ahsp, "Uraian": uraian, "Vol": val, "Sat": sat, "H.Sat": harga, "Total": val * harga})
+    return item_rows, sum(row["Total"] for row in item_rows)
+
+def tabel_rincian_rab(item_rows):
+    """Tabel ter-format (Styler) baris RAB 1 item untuk st.dataframe"""
+    return pd.DataFrame(item_rows).style.format({"Vol": "{:.3f}", "H.Sat": "{:,.0f}", "Total": "{:,.0f}"})
+
+# --- 4. SEGMEN TABULAR (CSV/DataFrame) -> ITEM PROYEK ---
+# Parameter tetap per tipe, sama dengan yang dipakai form Input (Tab 1)
+TIPE_SEGMEN = {
+    "Saluran Beton": (Calculator.hitung_beton_struktur_batch, {"lapis": 2, "waste": 5, "fc": 20, "fy": 280}),
+    "Saluran Batu": (Calculator.hitung_pasangan_batu_batch, {"b": 0.5, "m": 0.2}),
+    "Gorong-Gorong Box": (Calculator.hitung_gorong_box_struktur_batch, {"fc": 25, "fy": 400}),
+    "Terjunan USBR (Integrated)": (Calculator.hitung_terjunan_usbr_batch, {"mode_hemat": True}),
+}
+# Kolom segmen yang disimpan sebagai item['dimensi'] (nama kunci dimensi: nama kolom segmen), sama dengan form Input
+DIMENSI_SEGMEN = {
+    "Saluran Beton": {k: k for k in ["h", "b", "m", "panjang", "t_cm", "dia", "jarak"]},
+    "Saluran Batu": {k: k for k in ["h", "panjang", "l_atas", "l_bawah", "t_lantai"]},
+    "Gorong-Gorong Box": {"w": "w", "h": "h", "panjang": "p", "t_cm": "t_cm", "dia": "dia", "jarak": "jarak"},
+    "Terjunan USBR (Integrated)": {k: k for k in ["Q", "H_total", "H_step", "B", "qa_tanah", "t_lantai", "t_dinding", "mode_hemat"]},
+}
+_KUNCI_RHO = {"rho_act": "act", "rho_min": "min", "rho_max": "max", "rho_status": "status"}
+_KUNCI_GRUP = {
+    "detail_usbr": ["Fr", "y1", "y2", "L_kolam_final", "L_total"],
+    "stabilitas": ["sf_uplift", "status_uplift", "sigma_tanah", "status_tanah"],
+}
+_KOLOM_BANTU = ["tipe_usbr", "n_steps"]
+
+def _vol_dari_baris(rec):
+    """Susun ulang 1 baris hasil batch menjadi dict `vol` berstruktur sama dengan fungsi skalar"""
+    vol = {}
+    rho = {}
+    for k, v in rec.items():
+        if k in _KOLOM_BANTU or (isinstance(v, float) and math.isnan(v)): continue
+        if k in _KUNCI_RHO: rho[_KUNCI_RHO[k]] = v
+        else: vol[k] = v
+    for grup, kunci in _KUNCI_GRUP.items():
+        if kunci[0] in vol: vol[grup] = {k: vol.pop(k) for k in kunci}
+    if rho: vol["rho_data"] = rho
+    elif "vol_batu" in vol and "info_struktur" not in vol: vol["rho_data"] = None
+    return vol
+
+def segmen_ke_items(df_segmen):
+    """
+    DataFrame segmen (kolom: nama, tipe, + parameter fungsi Calculator.*_batch; is_rehab opsional)
+    -> list item proyek (skema rab_proyek.json). Volume dihitung per tipe secara vektor.
+    """
+    df_segmen = df_segmen.reset_index(drop=True)
+    if "is_rehab" not in df_segmen: df_segmen = df_segmen.assign(is_rehab=False)
+    df_segmen = df_segmen.assign(is_rehab=df_segmen["is_rehab"].fillna(False).astype(bool))
+    items = [None] * len(df_segmen)
+    for tipe, grup in df_segmen.groupby("tipe", sort=False):
+        if tipe not in TIPE_SEGMEN: raise ValueError(f"Tipe segmen tidak dikenal: {tipe}")
+        fungsi, konstan = TIPE_SEGMEN[tipe]
+        grup = grup.assign(**{k: grup[k].fillna(v) for k, v in konstan.items() if k in grup})
+        konstan = {k: v for k, v in konstan.items() if k not in grup}
+        hasil = fungsi(grup, **konstan)
+        panjang = grup["panjang"].astype(float).tolist() if tipe.startswith("Saluran") else [0] * len(grup)
+        nama = (grup["nama"].astype(str) + grup["is_rehab"].map({True: " (REHAB)", False: ""})).tolist()
+        peta_dimensi = DIMENSI_SEGMEN[tipe]
+        dimensi = grup.assign(**konstan)[list(peta_dimensi.values())].set_axis(list(peta_dimensi), axis=1).to_dict("records")
+        for idx, nm, pj, rec, dim in zip(hasil.index, nama, panjang, hasil.to_dict("records"), dimensi):
+            items[idx] = {"nama": nm, "tipe": tipe, "panjang": pj, "vol": _vol_dari_baris(rec), "dimensi": dim}
+    return items
+
+def item_dari_dimensi(nama, tipe, dimensi, is_rehab=False):
+    """Hitung ulang 1 item dari item['dimensi'] (mis. setelah diedit); nama tanpa akhiran ' (REHAB)'"""
+    baris = {"nama": nama, "tipe": tipe, "is_rehab": is_rehab, **{DIMENSI_SEGMEN[tipe][k]: v for k, v in dimensi.items()}}
+    return segmen_ke_items(pd.DataFrame([baris]))[0]
+
+# --- 5. BACK-UP VOLUME (BREAKDOWN ITEM) ---
+# Dipakai Tab Back-Up BoQ (boq_tab), Excel (rab_excel) & laporan PDF (laporan_cetak)
+def generate_breakdown(item):
+    """
+    Memecah 1 Item Pekerjaan menjadi Sub-Item Analisa 
+    Sesuai Struktur AHSP (Galian, Timbunan, Struktur, Finishing)
+    """
+    vol = item['vol']
+    dim = item.get('dimensi', {})
+    tipe = item['tipe']
+    panjang = dim.get('panjang', 1)
+    
+    breakdown = []
+    
+    # A. PEKERJAAN PERSIAPAN / BONGKARAN
+    if vol.get('vol_bongkaran', 0) > 0:
+        breakdown.append({
+            "kode": "T.15.a", 
+            "uraian": "Bongkaran Pasangan Eksisting",
+            "rumus": "V = Volume Struktur Lama (Asumsi sama dengan baru)",
+            "volume": f"{vol['vol_bongkaran']:.3f}",
+            "satuan": "m3"
+        })
+        
+    # B. PEKERJAAN TANAH
+    if vol.get('vol_galian', 0) > 0:
+        luas_galian = vol['vol_galian'] / panjang if panjang > 0 else 0
+        breakdown.append({
+            "kode": "T.06.a.1", 
+            "uraian": "Galian Tanah Biasa",
+            "rumus": f"V = Luas Penampang Galian ({luas_galian:.2f} m2) x Panjang",
+            "volume": f"{vol['vol_galian']:.3f}",
+            "satuan": "m3"
+        })
+        
+    if vol.get('vol_timbunan', 0) > 0:
+        breakdown.append({
+            "kode": "T.14.a", 
+            "uraian": "Timbunan Kembali Dipadatkan",
+            "rumus": "V = (Vol. Galian - Vol. Struktur) x 0.45 (Faktor Gembur)",
+            "volume": f"{vol['vol_timbunan']:.3f}",
+            "satuan": "m3"
+        })
+
+    # C. PEKERJAAN STRUKTUR BETON/BATU
+    if vol.get('vol_beton', 0) > 0:
+        ket_rumus = "V = Luas Penampang x Panjang"
+        if "Saluran Beton" in tipe:
+            b, h, t = dim.get('b',0), dim.get('h',0), dim.get('t_cm',0)
+            ket_rumus = f"V = ((L.Luar - L.Dalam) x Panjang) | Dimensi: {b}x{h} t={t}cm"
+            
+        breakdown.append({
+            "kode": "B.05.a", 
+            "uraian": "Beton Mutu K-225 (Struktur)",
+            "rumus": ket_rumus,
+            "volume": f"{vol['vol_beton']:.3f}",
+            "satuan": "m3"
+        })
+    
+    if vol.get('vol_batu', 0) > 0:
+        breakdown.append({
+            "kode": "P.01.a", 
+            "uraian": "Pasangan Batu Kali Camp. 1:4",
+            "rumus": "V = Luas Penampang Trapesium x Panjang",
+            "volume": f"{vol['vol_batu']:.3f}",
+            "satuan": "m3"
+        })
+
+    # D. PEKERJAAN BESI & BEKISTING
+    if vol.get('berat_besi', 0) > 0:
+        ratio = vol['berat_besi'] / vol['vol_beton'] if vol['vol_beton'] > 0 else 0
+        breakdown.append({
+            "kode": "B.17.a", 
+            "uraian": "Pembesian (Polos/Ulir)",
+            "rumus": f"Berat = Vol. Beton x Ratio Besi ({ratio:.1f} kg/m3)",
+            "volume": f"{vol['berat_besi']:.2f}",
+            "satuan": "kg"
+        })
+        
+    if vol.get('luas_bekisting', 0) > 0:
+        breakdown.append({
+            "kode": "B.20.a", 
+            "uraian": "Pasang Bekisting (2x Pakai)",
+            "rumus": "Luas = Keliling Sisi Vertikal Beton x Panjang",
+            "volume": f"{vol['luas_bekisting']:.3f}",
+            "satuan": "m2"
+        })
+        
+    # E. PEKERJAAN FINISHING (TERJUNAN USBR)
+    if vol.get('luas_plester', 0) > 0:
+        breakdown.append({
+            "kode": "P.04.e", 
+            "uraian": "Plesteran 1:3 + Acian",
+            "rumus": "Luas = Luas Bidang Basah / Ekspos",
+            "volume": f"{vol['luas_plester']:.3f}",
+            "satuan": "m2"
+        })
+
+    return breakdown
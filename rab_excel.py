@@ -0,0 +1,95 @@
+import xlsxwriter
+from rab_engine import TARIF_PPN, generate_breakdown
+
+# ==========================================
+# EKSPOR EXCEL RAB (STREAMING, CONSTANT MEMORY)
+# ==========================================
+# Mode constant_memory xlsxwriter menulis baris per baris ke file sementara,
+# jadi setiap sheet WAJIB ditulis berurutan (baris naik) dan selesai sebelum sheet berikutnya.
+
+def tulis_rab_excel(output, rab_rows, data_proyek, formulir_ahsp, overhead_pct):
+    """
+    Tulis Workbook RAB ke `output` (path / BytesIO):
+    Rekap RAB, RAB Detail, Analisa AHSP (Formulir Tab 4) & Back-Up Volume (BoQ).
+    """
+    wb = xlsxwriter.Workbook(output, {'constant_memory': True})
+    fmt = {
+        "judul": wb.add_format({'bold': True, 'font_size': 12}),
+        "head": wb.add_format({'bold': True, 'bg_color': '#D9D9D9', 'border': 1}),
+        "bold": wb.add_format({'bold': True}),
+        "rp": wb.add_format({'num_format': '#,##0'}),
+        "rp2": wb.add_format({'num_format': '#,##0.00'}),
+        "rp_bold": wb.add_format({'num_format': '#,##0', 'bold': True}),
+        "vol": wb.add_format({'num_format': '0.000'}),
+        "koef": wb.add_format({'num_format': '0.0000'}),
+    }
+    _sheet_rekap(wb, fmt, rab_rows, data_proyek)
+    _sheet_detail(wb, fmt, rab_rows)
+    _sheet_analisa(wb, fmt, formulir_ahsp, overhead_pct)
+    _sheet_backup(wb, fmt, data_proyek)
+    wb.close()
+
+def _tulis_baris(ws, row, nilai, formats=None):
+    for col, val in enumerate(nilai):
+        ws.write(row, col, val, formats[col] if formats else None)
+
+def _sheet_rekap(wb, fmt, rab_rows, data_proyek):
+    ws = wb.add_worksheet("Rekap RAB")
+    ws.set_column(0, 0, 6); ws.set_column(1, 2, 40); ws.set_column(3, 3, 20)
+    ws.write(0, 0, "REKAPITULASI RENCANA ANGGARAN BIAYA", fmt["judul"])
+    _tulis_baris(ws, 2, ["No", "Item Pekerjaan", "Tipe", "Jumlah Harga (Rp)"], [fmt["head"]] * 4)
+
+    subtotal = {}
+    for r in rab_rows:
+        subtotal[r["No"]] = subtotal.get(r["No"], 0) + r["Total"]
+    row = 3
+    for i, item in enumerate(data_proyek):
+        _tulis_baris(ws, row, [i+1, item['nama'], item['tipe'], subtotal.get(i+1, 0)], [None, None, None, fmt["rp"]])
+        row += 1
+
+    total = sum(subtotal.values())
+    row += 1
+    for label, nilai in [("Jumlah", total), (f"PPN {TARIF_PPN:.0%}", total * TARIF_PPN), ("Total Akhir", total * (1 + TARIF_PPN))]:
+        ws.write(row, 2, label, fmt["bold"]); ws.write(row, 3, nilai, fmt["rp_bold"])
+        row += 1
+
+def _sheet_detail(wb, fmt, rab_rows):
+    ws = wb.add_worksheet("RAB Detail")
+    kolom = ["No", "Item", "Kode", "Uraian", "Vol", "Sat", "H.Sat", "Total"]
+    ws.set_column(1, 1, 30); ws.set_column(3, 3, 32); ws.set_column(6, 7, 16)
+    _tulis_baris(ws, 0, kolom, [fmt["head"]] * len(kolom))
+    formats = [None, None, None, None, fmt["vol"], None, fmt["rp"], fmt["rp"]]
+    for row, r in enumerate(rab_rows, start=1):
+        _tulis_baris(ws, row, [r[k] for k in kolom], formats)
+
+def _sheet_analisa(wb, fmt, formulir_ahsp, overhead_pct):
+    ws = wb.add_worksheet("Analisa AHSP")
+    kolom = ["Uraian", "Koefisien", "Satuan", "Harga Satuan (Rp)", "Jumlah Harga (Rp)", "Kategori"]
+    ws.set_column(0, 0, 28); ws.set_column(3, 4, 18)
+    formats = [None, fmt["koef"], None, fmt["rp2"], fmt["rp2"], None]
+    row = 0
+    for form in formulir_ahsp:
+        ws.write(row, 0, f"Analisa: {form['uraian']}", fmt["judul"]); row += 1
+        ws.write(row, 0, f"Kode: {form['kode']}"); row += 1
+        _tulis_baris(ws, row, kolom, [fmt["head"]] * len(kolom)); row += 1
+        for r in form['rows']:
+            _tulis_baris(ws, row, [r[k] for k in kolom], formats); row += 1
+        for label, nilai in [
+            ("A. Tenaga", form['total_upah']), ("B. Bahan", form['total_bahan']),
+            ("C. Jumlah (A+B)", form['jum_dasar']), (f"D. Overhead ({overhead_pct}%)", form['ovr_val']),
+            ("E. Harga Satuan", form['jum_final']),
+        ]:
+            ws.write(row, 3, label, fmt["bold"]); ws.write(row, 4, nilai, fmt["rp2"]); row += 1
+        row += 2
+
+def _sheet_backup(wb, fmt, data_proyek):
+    ws = wb.add_worksheet("Back-Up Volume")
+    ws.set_column(0, 0, 10); ws.set_column(1, 1, 32); ws.set_column(2, 2, 60); ws.set_column(3, 3, 14)
+    row = 0
+    for idx, item in enumerate(data_proyek):
+        ws.write(row, 0, f"#{idx+1}. {item['nama']} ({item['tipe']})", fmt["judul"]); row += 1
+        _tulis_baris(ws, row, ["Kode", "Uraian Pekerjaan", "Perhitungan / Rumus", "Volume", "Satuan"], [fmt["head"]] * 5); row += 1
+        for r in generate_breakdown(item):
+            _tulis_baris(ws, row, [r['kode'], r['uraian'], r['rumus'], float(r['volume']), r['satuan']], [None, None, None, fmt["vol"], None])
+            row += 1
+        row += 1
@@ -0,0 +1,59 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, AHSP_REGISTRY, HARGA_DEFAULT, matriks_volume
+
+# ==========================================
+# REKAP SUMBER DAYA (BAHAN & TENAGA) PROYEK
+# ==========================================
+# Kebutuhan sumber daya seluruh proyek dengan satu perkalian matriks:
+#   Sumber daya [item x sumber daya] = Kuantitas [item x kode] @ Koefisien [kode x sumber daya]
+# Koefisien AHSP hanya 9 kode x 15 sumber daya, jadi matriks padat (numpy) sudah cukup; tidak perlu scipy.sparse.
+
+SATUAN_SUMBER_DAYA = {
+    "Pekerja": "OH", "Tukang Batu": "OH", "Tukang Besi": "OH", "Tukang Kayu": "OH", "Mandor": "OH",
+    "Semen (PC)": "kg", "Pasir Pasang": "m3", "Pasir Beton": "m3", "Batu Kali": "m3", "Split/Kerikil": "m3",
+    "Besi Beton": "kg", "Kawat Beton": "kg", "Kayu Kelas III": "m3", "Paku": "kg", "Minyak Bekisting": "liter",
+}
+
+def _kategori(nama):
+    return "Upah" if SATUAN_SUMBER_DAYA.get(nama) == "OH" else "Bahan"
+
+def hitung_sumber_daya(data_proyek, prices=None):
+    """
+    Kebutuhan sumber daya proyek: total per sumber daya, per item, dan per kode AHSP.
+    Harga (opsional, default HARGA_DEFAULT) hanya untuk kolom nilai di tabel total (tanpa overhead).
+    Return: {"total": DataFrame, "per_item": DataFrame [item x sumber daya], "per_kode": DataFrame [kode x sumber daya]}
+    """
+    koef = AHSP_Engine.MATRIKS_KOEF
+    kuantitas = matriks_volume(data_proyek)
+    per_item = kuantitas @ koef
+    per_kode = kuantitas.sum(axis=0)[:, None] * koef
+    total = per_kode.sum(axis=0)
+    harga = np.asarray(AHSP_Engine.vektor_harga(prices or HARGA_DEFAULT))
+
+    sumber_daya = AHSP_Engine.SUMBER_DAYA
+    df_total = pd.DataFrame({
+        "Sumber Daya": sumber_daya,
+        "Kategori": [_kategori(n) for n in sumber_daya],
+        "Satuan": [SATUAN_SUMBER_DAYA.get(n, "-") for n in sumber_daya],
+        "Kuantitas": total,
+        "Harga Satuan (Rp)": harga,
+        "Jumlah Harga (Rp)": total * harga,
+    }).sort_values(["Kategori", "Jumlah Harga (Rp)"], ascending=[False, False], ignore_index=True)
+    kolom = [f"{n} ({SATUAN_SUMBER_DAYA.get(n, '-')})" for n in sumber_daya]
+    return {
+        "total": df_total,
+        "per_item": pd.DataFrame(per_item, index=[item['nama'] for item in data_proyek], columns=kolom),
+        "per_kode": pd.DataFrame(per_kode, index=[f"{k} - {AHSP_REGISTRY[k]['uraian']}" for k in AHSP_Engine.KODE], columns=kolom),
+    }
+
+def ekspor_sumber_daya_excel(hasil):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        hasil["total"].to_excel(writer, sheet_name='Total Sumber Daya', index=False)
+        hasil["per_kode"].to_excel(writer, sheet_name='Per Kode AHSP')
+        hasil["per_item"].to_excel(writer, sheet_name='Per Item')
+    return output.getvalue()
@@ -0,0 +1,142 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, MAP_PEKERJAAN, TARIF_PPN
+
+# ==========================================
+# ANALISA RISIKO BIAYA (MONTE CARLO)
+# ==========================================
+# Tiap kunci harga (u_pekerja, p_semen, ...) dan tiap kunci volume (vol_galian, berat_besi, ...) diberi faktor
+# acak distribusi segitiga (bawah %, mode 0 = nilai RAB, atas %). Volume dijumlah dulu per kunci (sekali),
+# lalu semua sampel dihitung per batch dengan operasi matriks (tanpa loop Python per sampel / per item):
+#   HSP [sampel x kode]   = (Harga dasar x Faktor harga)[:, sumber daya] @ Koefisien.T x (1 + OH)
+#   Total [sampel]        = sum_kunci (Volume x Faktor volume) x HSP[:, kode kunci] x (1 + PPN)
+# Faktor volume berlaku sistematis untuk seluruh proyek (mis. galian seluruh ruas kurang hitung 10%).
+# Pemicu biaya: korelasi rank (Spearman) tiap faktor dengan total + ayunan tornado (faktor di P10 / P90).
+
+N_SAMPEL_DEFAULT = 100_000
+UKURAN_BATCH_RISIKO = 50_000
+# (bawah %, atas %) distribusi segitiga, mode di 0% (harga / volume RAB dianggap paling mungkin)
+KETIDAKPASTIAN_HARGA = {"u_": (-5.0, 10.0), "p_": (-10.0, 20.0), "p_besi": (-10.0, 25.0), "p_semen": (-5.0, 20.0)}
+KETIDAKPASTIAN_VOLUME = {
+    "vol_bongkaran": (-20.0, 30.0), "vol_galian": (-10.0, 20.0), "vol_timbunan": (-10.0, 20.0),
+    "vol_beton": (-5.0, 10.0), "vol_batu": (-5.0, 10.0), "berat_besi": (-5.0, 15.0),
+    "luas_bekisting": (-5.0, 10.0), "luas_plester": (-5.0, 10.0), "luas_siaran": (-5.0, 10.0),
+}
+KOLOM_KETIDAKPASTIAN = ["Jenis", "Kunci", "Uraian", "Bawah (%)", "Atas (%)"]
+PERSENTIL = [10, 50, 80, 90]
+
+_KUNCI_HARGA = list(dict.fromkeys(AHSP_Engine.KUNCI_HARGA)) # Kunci unik (u_tukang dipakai 3 sumber daya)
+_IDX_SUMBER_DAYA = np.array([_KUNCI_HARGA.index(k) for k in AHSP_Engine.KUNCI_HARGA])
+_KUNCI_VOLUME = list(MAP_PEKERJAAN)
+_IDX_KODE = np.array([AHSP_Engine.KODE.index(MAP_PEKERJAAN[k][2]) for k in _KUNCI_VOLUME])
+_NAMA_SUMBER_DAYA = {k: " / ".join(n for n, kk in zip(AHSP_Engine.SUMBER_DAYA, AHSP_Engine.KUNCI_HARGA) if kk == k) for k in _KUNCI_HARGA}
+
+def tabel_ketidakpastian():
+    """Rentang default per kunci harga & volume (bisa diedit di UI), kolom KOLOM_KETIDAKPASTIAN"""
+    baris = []
+    for k in _KUNCI_HARGA:
+        bawah, atas = KETIDAKPASTIAN_HARGA.get(k, KETIDAKPASTIAN_HARGA[k[:2]])
+        baris.append(["Harga", k, _NAMA_SUMBER_DAYA[k], bawah, atas])
+    for k in _KUNCI_VOLUME:
+        baris.append(["Volume", k, MAP_PEKERJAAN[k][0], *KETIDAKPASTIAN_VOLUME.get(k, (0.0, 0.0))])
+    return pd.DataFrame(baris, columns=KOLOM_KETIDAKPASTIAN)
+
+def _segitiga_inv(u, bawah, atas):
+    """Invers CDF distribusi segitiga (bawah, mode 0, atas) dalam %; bawah = atas = 0 -> 0"""
+    lebar = atas - bawah
+    aman = np.where(lebar > 0, lebar, 1.0)
+    fc = np.where(lebar > 0, -bawah / aman, 0.0)
+    kiri = bawah + np.sqrt(u * aman * -bawah)
+    kanan = atas - np.sqrt((1 - u) * aman * atas)
+    return np.where(lebar > 0, np.where(u < fc, kiri, kanan), 0.0)
+
+def _volume_per_kunci(data_proyek):
+    """Total volume proyek per kunci MAP_PEKERJAAN (aturan sama dengan hitung_rab: vol > 0.001)"""
+    total = dict.fromkeys(_KUNCI_VOLUME, 0.0)
+    for item in data_proyek:
+        for key, val in item['vol'].items():
+            if key in total and val > 0.001: total[key] += val
+    return np.array(list(total.values()))
+
+def _total(faktor_harga, faktor_volume, harga_dasar, volume, overhead_pct):
+    """Total Akhir (+PPN) tiap baris faktor [n x kunci harga], [n x kunci volume]"""
+    harga = (harga_dasar * faktor_harga)[:, _IDX_SUMBER_DAYA]
+    hsp = (harga @ AHSP_Engine.MATRIKS_KOEF.T) * (1 + overhead_pct/100)
+    return ((faktor_volume * volume) * hsp[:, _IDX_KODE]).sum(axis=1) * (1 + TARIF_PPN)
+
+def _rank(x):
+    """Rank per kolom (0..n-1) tanpa scipy"""
+    r = np.empty(x.shape)
+    urut = np.arange(len(x), dtype=float).reshape(-1, *([1] * (x.ndim - 1)))
+    np.put_along_axis(r, np.argsort(x, axis=0), np.broadcast_to(urut, x.shape), axis=0)
+    return r
+
+def simulasi_risiko(data_proyek, prices, overhead_pct, ketidakpastian=None, n_sampel=N_SAMPEL_DEFAULT, seed=0, ukuran_batch=UKURAN_BATCH_RISIKO):
+    """
+    Monte Carlo biaya proyek. ketidakpastian: DataFrame (kolom KOLOM_KETIDAKPASTIAN), default tabel_ketidakpastian().
+    Return: {"dasar", "persentil": DataFrame, "pemicu": DataFrame, "sampel": array Total Akhir, "detik"}
+    """
+    t0 = time.perf_counter()
+    tabel = tabel_ketidakpastian() if ketidakpastian is None else ketidakpastian
+    rentang = tabel.set_index("Kunci")[["Bawah (%)", "Atas (%)"]].astype(float)
+    rentang["Bawah (%)"] = rentang["Bawah (%)"].clip(upper=0)
+    rentang["Atas (%)"] = rentang["Atas (%)"].clip(lower=0)
+    rentang = rentang.reindex(_KUNCI_HARGA + _KUNCI_VOLUME).fillna(0.0)
+    bawah, atas = rentang["Bawah (%)"].to_numpy(), rentang["Atas (%)"].to_numpy()
+    n_harga = len(_KUNCI_HARGA)
+
+    harga_dasar = np.array([float(prices.get(k, HARGA_DEFAULT.get(k, 0.0))) for k in _KUNCI_HARGA])
+    volume = _volume_per_kunci(data_proyek)
+    hitung = lambda f: _total(f[:, :n_harga], f[:, n_harga:], harga_dasar, volume, overhead_pct)
+    dasar = float(hitung(np.ones((1, len(bawah))))[0])
+
+    rng = np.random.default_rng(seed)
+    sampel = np.empty(n_sampel)
+    faktor = np.empty((n_sampel, len(bawah)), dtype=np.float32) # Disimpan untuk analisa pemicu
+    for awal in range(0, n_sampel, ukuran_batch):
+        akhir = min(awal + ukuran_batch, n_sampel)
+        f = 1 + _segitiga_inv(rng.random((akhir - awal, len(bawah))), bawah, atas) / 100
+        faktor[awal:akhir] = f
+        sampel[awal:akhir] = hitung(f)
+
+    nilai_p = np.percentile(sampel, PERSENTIL)
+    persentil = pd.DataFrame({
+        "Ukuran": ["Estimasi RAB (Deterministik)", "Rata-rata"] + [f"P{p}" for p in PERSENTIL],
+        "Total Akhir (Rp)": [dasar, sampel.mean(), *nilai_p],
+    })
+    persentil["Selisih vs RAB (%)"] = (persentil["Total Akhir (Rp)"] / dasar - 1) * 100 if dasar else np.nan
+
+    # Pemicu: Spearman = korelasi Pearson antar rank; faktor konstan (rentang 0) -> 0
+    aktif = atas > bawah
+    rank_f = _rank(faktor[:, aktif].astype(float))
+    rank_t = _rank(sampel)
+    rank_f -= rank_f.mean(axis=0)
+    rank_t -= rank_t.mean()
+    rho = np.zeros(len(bawah))
+    rho[aktif] = (rank_f * rank_t[:, None]).sum(axis=0) / np.sqrt((rank_f**2).sum(axis=0) * (rank_t**2).sum())
+    # Tornado: 1 faktor di P10 / P90 distribusinya, faktor lain di nilai RAB
+    uji = np.ones((2 * len(bawah), len(bawah)))
+    idx = np.arange(len(bawah))
+    uji[2 * idx, idx] = 1 + _segitiga_inv(0.1, bawah, atas) / 100
+    uji[2 * idx + 1, idx] = 1 + _segitiga_inv(0.9, bawah, atas) / 100
+    tornado = hitung(uji).reshape(-1, 2)
+    pemicu = pd.DataFrame({
+        "Jenis": ["Harga"] * n_harga + ["Volume"] * len(_KUNCI_VOLUME),
+        "Kunci": rentang.index,
+        "Uraian": [_NAMA_SUMBER_DAYA[k] for k in _KUNCI_HARGA] + [MAP_PEKERJAAN[k][0] for k in _KUNCI_VOLUME],
+        "Spearman": rho,
+        "Kontribusi Varian (%)": rho**2 / (rho**2).sum() * 100 if (rho**2).sum() else 0.0,
+        "Total @P10 Faktor": tornado[:, 0], "Total @P90 Faktor": tornado[:, 1],
+        "Ayunan (Rp)": tornado[:, 1] - tornado[:, 0],
+    }).sort_values("Ayunan (Rp)", ascending=False, ignore_index=True)
+    return {"dasar": dasar, "persentil": persentil, "pemicu": pemicu, "sampel": sampel, "detik": time.perf_counter() - t0}
+
+def histogram_risiko(sampel, n_bin=60):
+    """Histogram + kurva kumulatif (S-curve probabilitas) untuk st.bar_chart / st.line_chart"""
+    jumlah, tepi = np.histogram(sampel, bins=n_bin)
+    tengah = (tepi[:-1] + tepi[1:]) / 2
+    return pd.DataFrame({"Frekuensi": jumlah, "Kumulatif (%)": jumlah.cumsum() / len(sampel) * 100},
+                        index=pd.Index(np.round(tengah / 1e6, 1), name="Total Akhir (Rp juta)"))
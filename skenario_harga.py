@@ -0,0 +1,71 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, TARIF_PPN, matriks_volume
+
+# ==========================================
+# ANALISA SENSITIVITAS MULTI-SKENARIO HARGA
+# ==========================================
+# Semua skenario dihitung sekaligus dengan perkalian matriks:
+#   HSP [skenario x kode]   = Harga sumber daya [skenario x sumber daya] @ Koefisien.T [sumber daya x kode] x (1 + OH)
+#   Subtotal [item x skenario] = Kuantitas [item x kode] @ HSP.T
+
+def skenario_eskalasi(prices, persen_list):
+    """Skenario eskalasi seragam ±% terhadap `prices` (1 baris = 1 skenario)"""
+    rows = [{k: v * (1 + p/100) for k, v in prices.items()} for p in persen_list]
+    return pd.DataFrame(rows, index=[f"{p:+g}%" for p in persen_list])
+
+def muat_skenario(file, prices_dasar):
+    """
+    Skenario dari CSV/Excel: kolom pertama = nama skenario, kolom lain = kunci harga (u_pekerja, p_semen, ...)
+    dan opsional 'overhead'. Kunci harga yang kosong diisi dari `prices_dasar`.
+    """
+    nama = getattr(file, "name", str(file))
+    df = pd.read_excel(file) if nama.endswith((".xlsx", ".xls")) else pd.read_csv(file)
+    df = df.set_index(df.columns[0])
+    for k, v in prices_dasar.items():
+        df[k] = df[k].fillna(v) if k in df else v
+    return df
+
+def _vektor_harga(df_skenario):
+    return np.column_stack([
+        df_skenario[k].to_numpy(dtype=float) if k in df_skenario else np.full(len(df_skenario), HARGA_DEFAULT.get(k, 0.0))
+        for k in AHSP_Engine.KUNCI_HARGA
+    ])
+
+def hitung_skenario(data_proyek, df_skenario, overhead_pct, prices_dasar=None):
+    """
+    HSP, subtotal per item & total proyek untuk semua skenario dalam satu operasi matriks.
+    Kolom 'overhead' pada df_skenario (bila ada) menimpa overhead_pct per skenario.
+    Bila `prices_dasar` diisi, total tiap skenario dibandingkan dengan harga dasar tsb.
+    """
+    harga = _vektor_harga(df_skenario)
+    overhead = df_skenario["overhead"].to_numpy(dtype=float) if "overhead" in df_skenario else np.full(len(df_skenario), float(overhead_pct))
+    if prices_dasar is not None:
+        harga = np.vstack([harga, AHSP_Engine.vektor_harga(prices_dasar)])
+        overhead = np.append(overhead, float(overhead_pct))
+    hsp = (harga @ AHSP_Engine.MATRIKS_KOEF.T) * (1 + overhead/100)[:, None]
+    subtotal = matriks_volume(data_proyek) @ hsp.T
+    jumlah = subtotal.sum(axis=0)
+
+    nama_skenario = df_skenario.index.astype(str)
+    n = len(nama_skenario)
+    total = pd.DataFrame({"Jumlah": jumlah[:n], "PPN": jumlah[:n] * TARIF_PPN, "Total Akhir": jumlah[:n] * (1 + TARIF_PPN)}, index=nama_skenario)
+    if prices_dasar is not None:
+        total["Selisih vs Harga Dasar (%)"] = (jumlah[:n] / jumlah[n] - 1) * 100 if jumlah[n] else np.nan
+    return {
+        "hsp": pd.DataFrame(hsp[:n], index=nama_skenario, columns=AHSP_Engine.KODE),
+        "subtotal": pd.DataFrame(subtotal[:, :n], index=[item['nama'] for item in data_proyek], columns=nama_skenario),
+        "total": total,
+    }
+
+def ekspor_skenario_excel(hasil, df_skenario):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        hasil["total"].to_excel(writer, sheet_name='Total Skenario')
+        hasil["hsp"].to_excel(writer, sheet_name='HSP per Skenario')
+        hasil["subtotal"].to_excel(writer, sheet_name='Subtotal Item')
+        df_skenario.to_excel(writer, sheet_name='Harga Skenario')
+    return output.getvalue()
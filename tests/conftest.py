@@ -0,0 +1,47 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Modul aplikasi ada di akar repo (bukan paket): tambahkan ke sys.path agar `pytest` bisa dijalankan dari mana saja
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rab_engine import TIPE_SEGMEN, segmen_ke_items  # noqa: E402
+
+# Kolom dimensi yang dijadikan nol per tipe: jalur guard fungsi skalar ikut diuji
+KOLOM_GUARD = {"Saluran Beton": ["h", "panjang"], "Saluran Batu": ["h"], "Gorong-Gorong Box": ["w", "h"],
+               "Terjunan USBR (Integrated)": ["H_step", "B", "Q"]}
+
+def segmen_acak(tipe, n, seed, guard=True):
+    """DataFrame n segmen acak (seed tetap) 1 tipe, kolom = parameter Calculator.*_batch"""
+    rng = np.random.default_rng(seed)
+    u = lambda a, b: rng.uniform(a, b, n).round(3)
+    kolom = {
+        "Saluran Beton": lambda: dict(h=u(0.3, 2.5), b=u(0.3, 2.0), m=u(0, 1.5), panjang=u(5, 300), t_cm=u(12, 35),
+                                      dia=rng.choice([10.0, 13.0, 16.0, 19.0], n), jarak=u(10, 30)),
+        "Saluran Batu": lambda: dict(h=u(0.3, 2.0), panjang=u(5, 300), l_atas=u(0.25, 0.5), l_bawah=u(0.3, 0.9), t_lantai=u(0.15, 0.4)),
+        "Gorong-Gorong Box": lambda: dict(w=u(0.5, 3.5), h=u(0.5, 3.0), p=u(3, 15), t_cm=u(15, 35),
+                                          dia=rng.choice([13.0, 16.0, 19.0], n), jarak=u(10, 25)),
+        "Terjunan USBR (Integrated)": lambda: dict(Q=u(0.2, 15), H_total=u(0.5, 8), H_step=u(0.3, 2), B=u(0.8, 5),
+                                                   t_lantai=u(0.2, 0.5), t_dinding=u(0.2, 0.4), qa_tanah=u(80, 250),
+                                                   mode_hemat=np.arange(n) % 2 == 0),
+    }[tipe]()
+    df = pd.DataFrame({**kolom, "is_rehab": rng.random(n) < 0.3})
+    if guard:
+        for i, k in enumerate(KOLOM_GUARD[tipe]): df.loc[i, k] = 0.0
+    return df
+
+def proyek_acak(n, seed=0):
+    """List n item proyek (skema rab_proyek.json) merata di 4 tipe, urutan tipe diselang-seling"""
+    bagian = []
+    for j, tipe in enumerate(TIPE_SEGMEN):
+        df = segmen_acak(tipe, -(-n // len(TIPE_SEGMEN)), seed + j, guard=False)
+        bagian.append(df.assign(nama=[f"{tipe} {i + 1}" for i in range(len(df))], tipe=tipe, urut=np.arange(len(df)) * 4 + j))
+    df = pd.concat(bagian, ignore_index=True).sort_values("urut", ignore_index=True).head(n)
+    return segmen_ke_items(df.drop(columns="urut"))
+
+@pytest.fixture
+def proyek():
+    return proyek_acak(40, seed=11)
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from benchmark_rab import kasus_benchmark, main, proyek_sintetis
+from rab_engine import HARGA_DEFAULT, hitung_rab
+
+def test_semua_kasus_jalan(tmp_path, capsys):
+    lama, baru = tmp_path / "lama.json", tmp_path / "baru.json"
+    assert main(["--sizes", "8", "--repeat", "1", "--output", str(lama)]) == 0
+    with open(lama, encoding="utf-8") as f: hasil = json.load(f)["hasil"]
+    df, items = proyek_sintetis(8)
+    assert [r["kasus"] for r in hasil] == list(kasus_benchmark(df, items, excel_max=20000))
+    assert all(r["n_item"] == 8 and r["detik"] >= 0 for r in hasil)
+    main(["--sizes", "8", "--repeat", "1", "--filter", "calc.", "--output", str(baru), "--compare", str(lama)])
+    with open(baru, encoding="utf-8") as f: assert all(r["kasus"].startswith("calc.") for r in json.load(f)["hasil"])
+    assert " -> " in capsys.readouterr().out
+
+def test_proyek_sintetis():
+    df, items = proyek_sintetis(10, seed=3)
+    assert len(df) == len(items) == 10 and df["tipe"].nunique() == 4
+    assert hitung_rab(items, HARGA_DEFAULT, 15)[1] > 0
+
+def test_tab3_halaman_jalur_ui():
+    df, items = proyek_sintetis(60)
+    halaman, total = kasus_benchmark(df, items, excel_max=0)["rab.tab3_halaman"]()
+    assert len(halaman) == 25 and halaman[0][0].startswith("1. Seg 1 — Rp ")
+    assert total == pytest.approx(hitung_rab(items, HARGA_DEFAULT, 15)[1], rel=1e-9)
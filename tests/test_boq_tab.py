@@ -0,0 +1,71 @@
+import copy
+
+import pytest
+
+import boq_tab
+from boq_tab import (DIGEST_TOKEN_BUDGET, LocalModel, ModelBackend, ask_model, build_item_html, build_project_digest,
+                     stream_answer, _estimasi_token)
+
+class Penghitung(LocalModel):
+    """LocalModel yang mencatat berapa kali model benar-benar dipanggil"""
+    name = "uji/penghitung"
+
+    def __init__(self, delay=0.0):
+        super().__init__(delay)
+        self.panggilan = 0
+
+    def stream(self, prompt):
+        self.panggilan += 1
+        yield from super().stream(prompt)
+
+@pytest.fixture(autouse=True)
+def cache_kosong():
+    boq_tab._RESPONSE_CACHE.clear()
+    yield
+    boq_tab._RESPONSE_CACHE.clear()
+
+def test_model_backend_abstrak():
+    with pytest.raises(TypeError):
+        ModelBackend()
+    class TanpaStream(ModelBackend): pass
+    with pytest.raises(TypeError):
+        TanpaStream()
+    assert LocalModel().generate_content("RINGKASAN DATA PROYEK:\n- a\nINSTRUKSI:\nUSER QUERY: q").text.endswith("- a\n")
+
+def test_digest_dalam_batas_token(proyek):
+    besar = proyek * 25 # 1000 item
+    digest = build_project_digest(besar)
+    assert _estimasi_token(digest) <= DIGEST_TOKEN_BUDGET
+    assert f"JUMLAH ITEM: {len(besar)}" in digest and "AGREGAT PER TIPE (CSV):" in digest
+    assert '"vol"' not in digest # Tanpa JSON item bila tidak dirujuk
+
+def test_digest_item_dirujuk_dan_outlier(proyek):
+    proyek = copy.deepcopy(proyek)
+    proyek[6]["vol"]["berat_besi"] *= 40 # Rasio besi jauh di atas median tipe-nya
+    digest = build_project_digest(proyek, f"cek item #3 dan {proyek[9]['nama']}")
+    assert f"#3 {{\"nama\":\"{proyek[2]['nama']}\"" in digest and f"#10 {{\"nama\":\"{proyek[9]['nama']}\"" in digest
+    assert f"- #7 {proyek[6]['nama']}" in digest
+    assert "#4 {" not in digest
+
+def test_cache_jawaban(proyek):
+    model = Penghitung()
+    pertama = ask_model(model, proyek, "Apakah rasio besi wajar?")
+    assert pertama.startswith("[Model Lokal") and model.panggilan == 1
+    assert ask_model(model, proyek, "  apakah rasio besi WAJAR? ") == pertama and model.panggilan == 1
+    ask_model(model, proyek, "Pertanyaan lain")
+    ubah = copy.deepcopy(proyek)
+    ubah[0]["vol"]["vol_galian"] += 1
+    ask_model(model, ubah, "Apakah rasio besi wajar?") # Data proyek berubah: tidak pakai cache
+    assert model.panggilan == 3
+
+def test_timeout_tidak_di_cache(proyek):
+    model = Penghitung(delay=0.2)
+    jawaban = "".join(stream_answer(model, proyek, "lambat", timeout=0.05))
+    assert "Waktu habis" in jawaban and not boq_tab._RESPONSE_CACHE
+
+def test_item_html_escape(proyek):
+    item = {**proyek[0], "nama": "<script>alert(1)</script> & Co"}
+    teks = build_item_html(0, item)
+    assert "<script>" not in teks and "&lt;script&gt;alert(1)&lt;/script&gt; &amp; Co" in teks
+    assert teks.startswith("\n    <div class=\"boq-container\">") and "#1. " in teks
+    assert build_item_html(0, item) is teks # Di-cache per (nomor, isi item)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from desain_hidrolis import (H_MAKS, V_MAKS, V_MIN, debit_manning, desain_ke_segmen, desain_saluran,
+                             kedalaman_normal, tinggi_jagaan)
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, OVERHEAD_DEFAULT, hitung_rab, segmen_ke_items
+
+@pytest.fixture
+def tabel_hsp():
+    return AHSP_Engine.tabel_harga_satuan(HARGA_DEFAULT, OVERHEAD_DEFAULT)
+
+@pytest.fixture
+def ruas():
+    rng = np.random.default_rng(5)
+    n = 12
+    return pd.DataFrame({"nama": [f"Ruas {i + 1}" for i in range(n)], "Q": rng.uniform(0.2, 6.0, n).round(2),
+                         "S": rng.uniform(0.0003, 0.003, n).round(5), "panjang": rng.uniform(50, 400, n).round(1)})
+
+def test_kedalaman_normal():
+    Q, b, m, S, n = np.array([0.5, 2.0, 8.0]), np.array([0.6, 1.2, 2.5]), np.array([0.0, 0.5, 1.0]), 0.001, 0.015
+    y = kedalaman_normal(Q, b, m, S, n)
+    assert debit_manning(y, b, m, S, n) == pytest.approx(Q, rel=1e-6)
+    assert np.isnan(kedalaman_normal(500.0, 0.3, 0.0, 0.0005, 0.02)) # Melebihi kapasitas pada y_maks
+
+@pytest.mark.parametrize("tipe", ["Saluran Beton", "Saluran Batu"])
+def test_desain_layak_dan_sama_dengan_rab(ruas, tabel_hsp, tipe):
+    hasil = desain_saluran(ruas, tipe, tabel_hsp)
+    ok = hasil[hasil["status"] == "✅ OK"]
+    assert len(ok) > 0
+    assert ((ok["v"] >= V_MIN) & (ok["v"] <= V_MAKS[tipe]) & (ok["h"] <= H_MAKS + 1e-9)).all()
+    assert (ok["h"] >= ok["y_normal"] + ok["jagaan"] - 1e-9).all()
+    assert (ok["jagaan"] == tinggi_jagaan(ok["Q"])).all()
+    items = segmen_ke_items(desain_ke_segmen(hasil, tipe))
+    for biaya, item in zip(ok["biaya"], items):
+        assert biaya == pytest.approx(hitung_rab([item], HARGA_DEFAULT, OVERHEAD_DEFAULT)[1], rel=1e-9)
+
+def test_desain_termurah(ruas, tabel_hsp):
+    hasil = desain_saluran(ruas.head(3), "Saluran Beton", tabel_hsp).set_index("nama")
+    # Kombinasi tunggal lain yang juga layak tidak boleh lebih murah dari pilihan desain
+    for b in (0.5, 1.0, 2.0):
+        for m in (0.0, 1.0):
+            satu = desain_saluran(ruas.head(3), "Saluran Beton", tabel_hsp, b=(b,), m=(m,)).set_index("nama")
+            layak = satu["biaya"].notna()
+            assert (satu.loc[layak, "biaya"] >= hasil.loc[layak, "biaya"] - 1e-6).all()
+
+def test_tidak_layak_dan_input_salah(tabel_hsp):
+    hasil = desain_saluran(pd.DataFrame({"nama": ["Besar"], "Q": [80.0], "S": [0.001], "panjang": [100.0]}), "Saluran Beton", tabel_hsp)
+    assert hasil["status"].iloc[0].startswith("❌") and hasil["n_layak"].iloc[0] == 0
+    assert desain_ke_segmen(hasil, "Saluran Beton").empty
+    with pytest.raises(ValueError):
+        desain_saluran(pd.DataFrame({"nama": ["A"], "Q": [1.0], "S": [0.0], "panjang": [10.0]}), "Saluran Beton", tabel_hsp)
+    with pytest.raises(ValueError):
+        desain_saluran(pd.DataFrame({"nama": ["A"], "Q": [1.0], "S": [0.001], "panjang": [10.0]}), "Gorong-Gorong Box", tabel_hsp)
@@ -0,0 +1,69 @@
+import pytest
+
+from graf_dependensi import KUNCI_OVERHEAD, RABInkremental
+from item_store import ItemStore
+from pustaka_harga import TurunanHarga
+from rab_engine import HARGA_DEFAULT, OVERHEAD_DEFAULT, hitung_rab, item_dari_dimensi
+
+def cocok_dengan_hitung_rab(rab, store):
+    """Grand total & subtotal per item RABInkremental == hitung_rab dari nol untuk harga & item yang sama"""
+    rows, total = hitung_rab(store.to_list(), rab.prices, rab.overhead)
+    assert rab.grand_total() == pytest.approx(total, rel=1e-9)
+    subtotal = {}
+    for row in rows: subtotal[row["No"]] = subtotal.get(row["No"], 0) + row["Total"]
+    for no, item_id in enumerate(store.ids(), 1):
+        assert rab.hasil[item_id][1] == pytest.approx(subtotal.get(no, 0), rel=1e-9, abs=1e-6), store.ambil(item_id)["nama"]
+
+@pytest.fixture
+def rab_dan_store(proyek):
+    store = ItemStore.dari_list(proyek)
+    rab = RABInkremental()
+    rab.set_harga(HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    assert rab.sinkron(store) == len(proyek)
+    return rab, store
+
+def test_awal_sama_dengan_hitung_rab(rab_dan_store):
+    cocok_dengan_hitung_rab(*rab_dan_store)
+
+def test_ubah_harga_hanya_hitung_item_terdampak(rab_dan_store):
+    rab, store = rab_dan_store
+    terakhir = rab.set_harga({**HARGA_DEFAULT, "p_besi": HARGA_DEFAULT["p_besi"] * 1.25}, OVERHEAD_DEFAULT)
+    assert terakhir["kunci_harga"] == ["p_besi"]
+    berbesi = [i for i in store.ids() if store.ambil(i)["vol"].get("berat_besi", 0) > 0.001]
+    assert 0 < terakhir["item"] == len(berbesi) < len(store)
+    cocok_dengan_hitung_rab(rab, store)
+
+    rab.set_harga({**rab.prices, "p_semen": 1650.0, "u_pekerja": 120000.0}, OVERHEAD_DEFAULT)
+    cocok_dengan_hitung_rab(rab, store)
+    terakhir = rab.set_harga(rab.prices, 12.0)
+    assert terakhir["kunci_harga"] == [KUNCI_OVERHEAD] and terakhir["item"] == len(store)
+    cocok_dengan_hitung_rab(rab, store)
+    assert rab.set_harga(rab.prices, 12.0)["item"] == 0 # Harga sama: tidak ada yang dihitung ulang
+
+def test_ubah_tambah_hapus_item(rab_dan_store, proyek):
+    rab, store = rab_dan_store
+    ids = store.ids()
+    lama = store.ambil(ids[0])
+    store.ubah(ids[0], item_dari_dimensi(lama["nama"], lama["tipe"], {**lama["dimensi"], "h": lama["dimensi"]["h"] * 1.5}))
+    store.hapus(ids[1])
+    store.hapus(ids[-1])
+    store.tambah(proyek[3])
+    assert rab.sinkron(store) == 2 # 1 diubah + 1 baru
+    assert ids[1] not in rab.hasil and ids[-1] not in rab.hasil
+    cocok_dengan_hitung_rab(rab, store)
+
+    rab.set_harga({**rab.prices, "p_batu": 300000.0}, rab.overhead)
+    assert rab.sinkron(store) == 0
+    cocok_dengan_hitung_rab(rab, store)
+
+def test_turunan_bersama_sama_dengan_hitung_sendiri(rab_dan_store):
+    rab, store = rab_dan_store
+    prices = {**HARGA_DEFAULT, "p_pasir": 280000.0}
+    rab.set_harga(prices, 14.0, TurunanHarga(prices, 14.0))
+    cocok_dengan_hitung_rab(rab, store)
+    rab.set_harga({**prices, "p_kayu": 4000000.0}, 14.0) # Override sesi: lepas dari tabel bersama
+    cocok_dengan_hitung_rab(rab, store)
+
+def test_sinkron_sebelum_set_harga():
+    with pytest.raises(RuntimeError):
+        RABInkremental().sinkron(ItemStore())
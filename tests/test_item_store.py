@@ -0,0 +1,48 @@
+import pytest
+
+from item_store import ItemStore
+
+def test_bolak_balik_dan_versi(proyek):
+    store = ItemStore.dari_list(iter(proyek)) # Iterable apa pun (mis. generator ProjectStore.items())
+    assert store.to_list() == proyek and len(store) == len(proyek) and store
+    versi = store.versi
+    assert ItemStore.dari_list(proyek).versi != versi # Store lain tidak pernah berbagi versi
+    ids = store.ids()
+    store.ubah(ids[2], {**proyek[2], "nama": "Baru"})
+    assert store.versi != versi and store.ambil(ids[2])["nama"] == "Baru" and store.ids()[2] == ids[2]
+    store.hapus(ids[0])
+    assert ids[0] not in store and store.posisi()[ids[1]] == 1
+    assert store.tambah(proyek[0]) == max(ids) + 1 # id tidak dipakai ulang
+    with pytest.raises(KeyError):
+        store.hapus(ids[0])
+    store.kosongkan()
+    assert not store and store.ids() == [] and store.tipe() == []
+
+def test_filter_tipe_dan_nama(proyek):
+    store = ItemStore.dari_list(proyek)
+    ids = store.ids()
+    beton = [i for i, item in zip(ids, proyek) if item["tipe"] == "Saluran Beton"]
+    assert store.ids("Saluran Beton") == beton
+    assert store.ids(["Saluran Beton", "Saluran Batu"]) == [i for i, item in zip(ids, proyek) if item["tipe"].startswith("Saluran")]
+    assert store.ids(cari="BETON 1") == [i for i, item in zip(ids, proyek) if "beton 1" in item["nama"].lower()]
+    assert store.ids("Saluran Batu", cari="beton") == []
+    store.ubah(beton[0], {**proyek[0], "tipe": "Saluran Batu", "nama": "Pindah"})
+    assert beton[0] not in store.ids("Saluran Beton") and store.ids(cari="pindah") == [beton[0]]
+    assert store.to_list(beton[1:3]) == [store.ambil(i) for i in beton[1:3]]
+
+def test_urutan_lazy(proyek):
+    store = ItemStore.dari_list(proyek)
+    urutan = store.urutan()
+    assert len(urutan) == len(proyek) and list(urutan) == store.to_list()
+    assert urutan[3] == store.to_list()[3] and urutan[-1] == store.to_list()[-1]
+    assert urutan[5:12] == store.to_list()[5:12] and urutan[::-7] == store.to_list()[::-7]
+    with pytest.raises(IndexError):
+        urutan[len(proyek)]
+    versi = store.versi
+    store.hapus(store.ids()[0])
+    assert store.versi != versi and len(urutan) == len(proyek) - 1
+
+def test_jejak_memori(proyek):
+    jejak = ItemStore.dari_list(proyek).jejak_memori()
+    assert jejak["jumlah_item"] == len(proyek) and jejak["total"] == jejak["record"] + jejak["indeks"]
+    assert jejak["record"] < jejak["list_of_dict"] # Skema kunci dipakai bersama, bukan 1 dict per item
@@ -0,0 +1,60 @@
+import random
+from collections import Counter
+
+import pytest
+
+from jadwal_besi import PANJANG_STOK, _bfd_kelompok, buat_bbs, optimasi_potong
+
+def bfd_naif(potongan, stok, kerf):
+    """BFD satu per satu: sisa batang = stok - jumlah (L + kerf); potongan L muat bila sisa >= L"""
+    batang = []
+    for L in sorted((L for L, c in potongan.items() for _ in range(c)), reverse=True):
+        muat = [i for i, (r, _) in enumerate(batang) if r >= L]
+        if muat:
+            i = min(muat, key=lambda i: batang[i][0])
+            batang[i] = (batang[i][0] - L - kerf, batang[i][1] + [L])
+        else:
+            batang.append((stok - L - kerf, [L]))
+    return batang
+
+def periksa_pola(hasil, potongan, stok, kerf):
+    terpotong = Counter()
+    for pola, n, sisa in hasil:
+        assert n > 0 and pola
+        panjang = sum(pola) + kerf * (len(pola) - 1) # Potongan terakhir tidak perlu kerf
+        assert panjang <= stok, (pola, stok, kerf)
+        assert sisa == max(stok - sum(pola) - kerf * len(pola), 0)
+        for L in pola: terpotong[L] += n
+    assert terpotong == Counter(potongan)
+
+@pytest.mark.parametrize("kerf", [0, 3, 10])
+def test_bfd_kelompok_acak(kerf):
+    acak = random.Random(kerf)
+    for _ in range(300):
+        stok = acak.choice([6000, 9000, 12000])
+        potongan = {acak.randint(150, stok): acak.randint(1, 40) for _ in range(acak.randint(1, 8))}
+        hasil = _bfd_kelompok(potongan, stok, kerf)
+        periksa_pola(hasil, potongan, stok, kerf)
+        assert sum(n for _, n, _ in hasil) == len(bfd_naif(potongan, stok, kerf))
+
+def test_potongan_pas_ujung_batang():
+    # 4 x 2997 + 3 x kerf 4 = 12000: muat 1 batang, sisa 0 (bukan -kerf)
+    assert _bfd_kelompok({2997: 4}, 12000, 4) == [((2997,) * 4, 1, 0)]
+    assert sum(n for _, n, _ in _bfd_kelompok({2998: 4}, 12000, 4)) == 2
+
+def test_potongan_lebih_panjang_dari_stok():
+    with pytest.raises(ValueError):
+        _bfd_kelompok({12001: 1}, 12000, 0)
+
+@pytest.mark.parametrize("panjang_stok, kerf", [(PANJANG_STOK, 0), (PANJANG_STOK, 5), (9.0, 3)])
+def test_optimasi_potong_proyek(proyek, panjang_stok, kerf):
+    bbs = buat_bbs(proyek, panjang_stok)
+    assert not bbs.empty
+    assert (bbs["Panjang Potong (m)"] <= panjang_stok + 1e-9).all() # Bar lebih panjang dari stok dipecah (sambungan)
+    hasil = optimasi_potong(bbs, panjang_stok, kerf)
+    ringkasan = hasil["ringkasan"].set_index("Dia (mm)")
+    jumlah_bbs = bbs.groupby("Dia (mm)")["Jumlah"].sum()
+    assert ringkasan["Jumlah Potongan"].to_dict() == jumlah_bbs.to_dict()
+    assert (ringkasan["Panjang Terpakai (m)"] <= ringkasan["Panjang Stok (m)"] + 1e-9).all()
+    assert ringkasan["Batang Stok"].to_dict() == hasil["pola"].groupby("Dia (mm)")["Jumlah Batang"].sum().to_dict()
+    assert ((hasil["pola"]["Sisa per Batang (m)"] >= 0) & (hasil["pola"]["Sisa per Batang (m)"] < panjang_stok)).all()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from kurva_s import REGU_DEFAULT, jumlah_regu, pendahulu_dari_teks, pendahulu_otomatis, susun_jadwal
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, OVERHEAD_DEFAULT, hitung_rab
+
+@pytest.fixture
+def tabel_hsp():
+    return AHSP_Engine.tabel_harga_satuan(HARGA_DEFAULT, OVERHEAD_DEFAULT)
+
+def periksa_pendahulu(hasil, pendahulu):
+    jadwal = hasil["jadwal"]
+    mulai, selesai = jadwal["Mulai (hari)"].to_numpy(), jadwal["Selesai (hari)"].to_numpy()
+    for i, p in enumerate(pendahulu):
+        for j in p: assert mulai[i] >= selesai[j], (i, j)
+    assert (selesai - mulai == jadwal["Durasi (hari)"].to_numpy()).all()
+
+@pytest.mark.parametrize("mode", ["Paralel", "Berurutan per Tipe", "Berurutan"])
+def test_pendahulu_dan_total_kurva_s(proyek, tabel_hsp, mode):
+    pendahulu = pendahulu_otomatis(proyek, mode)
+    hasil = susun_jadwal(proyek, tabel_hsp, pendahulu)
+    periksa_pendahulu(hasil, pendahulu)
+    total_rab = hitung_rab(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)[1]
+    mingguan = hasil["mingguan"]
+    assert mingguan["Biaya (Rp)"].sum() == pytest.approx(total_rab, rel=1e-9)
+    assert mingguan["Biaya Kumulatif (Rp)"].iloc[-1] == pytest.approx(total_rab, rel=1e-9)
+    assert mingguan["Kumulatif (%)"].iloc[-1] == pytest.approx(100.0)
+    assert hasil["durasi_minggu"] == len(mingguan) == -(-hasil["durasi_hari"] // 6)
+    if mode == "Berurutan":
+        assert hasil["durasi_hari"] == hasil["jadwal"]["Durasi (hari)"].sum()
+
+def test_pendahulu_manual_dan_kapasitas_regu(proyek, tabel_hsp):
+    n = len(proyek)
+    # Item terakhir menunggu semua item lain; item 5 menunggu item 30 (urutan tidak harus menurut No)
+    pendahulu = [[] for _ in range(n)]
+    pendahulu[-1] = list(range(n - 1))
+    pendahulu[4] = pendahulu_dari_teks("30")
+    kapasitas = {"Pekerja": 30, "Tukang": 8, "Mandor": 3}
+    hasil = susun_jadwal(proyek, tabel_hsp, pendahulu, kapasitas=kapasitas)
+    periksa_pendahulu(hasil, pendahulu)
+    jadwal = hasil["jadwal"]
+    assert hasil["regu"] == jumlah_regu(REGU_DEFAULT, kapasitas) == 2
+    aktif = jadwal[jadwal["Durasi (hari)"] > 0]
+    for hari in range(hasil["durasi_hari"]):
+        jalan = ((aktif["Mulai (hari)"] <= hari) & (hari < aktif["Selesai (hari)"])).sum()
+        assert jalan <= hasil["regu"]
+
+def test_biaya_dari_rab_inkremental(proyek, tabel_hsp):
+    biaya = np.arange(1, len(proyek) + 1) * 1e6
+    hasil = susun_jadwal(proyek, tabel_hsp, biaya=biaya)
+    assert hasil["mingguan"]["Biaya (Rp)"].sum() == pytest.approx(biaya.sum())
+
+def test_pendahulu_tidak_valid(proyek, tabel_hsp):
+    n = len(proyek)
+    melingkar = [[] for _ in range(n)]
+    melingkar[0], melingkar[1] = [1], [0]
+    with pytest.raises(ValueError, match="melingkar"):
+        susun_jadwal(proyek, tabel_hsp, melingkar)
+    with pytest.raises(ValueError):
+        susun_jadwal(proyek, tabel_hsp, [[n]] + [[] for _ in range(n - 1)])
+    with pytest.raises(ValueError):
+        pendahulu_dari_teks("dua")
+
+def test_proyek_kosong(tabel_hsp):
+    hasil = susun_jadwal([], tabel_hsp)
+    assert hasil["durasi_hari"] == 0 and hasil["jadwal"].empty
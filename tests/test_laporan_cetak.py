@@ -0,0 +1,48 @@
+import re
+import zlib
+from io import BytesIO
+
+import pytest
+
+from laporan_cetak import BAGIAN_LAPORAN, _bungkus, _pdf_str, halaman_laporan, lebar_teks, tulis_laporan_pdf
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, OVERHEAD_DEFAULT, TARIF_PPN, hitung_rab
+
+def isi_halaman(pdf):
+    """Content stream (teks terdekompresi) tiap halaman"""
+    return [zlib.decompress(m.group(1)) for m in re.finditer(rb"stream\n(.*?)\nendstream", pdf, re.S)]
+
+def test_pdf_valid_dan_xref(proyek):
+    output = BytesIO()
+    n = tulis_laporan_pdf(output, proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    pdf = output.getvalue()
+    assert pdf.startswith(b"%PDF-1.4") and pdf.endswith(b"%%EOF\n")
+    assert n == len(re.findall(rb"/Type /Page ", pdf)) == len(isi_halaman(pdf)) > len(BAGIAN_LAPORAN)
+    assert re.search(rb"/Count %d " % n, pdf)
+    # Tiap entri xref menunjuk tepat ke awal objeknya
+    awal_xref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    entri = re.findall(rb"(\d{10}) 00000 n ", pdf[awal_xref:])
+    for nomor, offset in enumerate(entri, start=1):
+        assert pdf[int(offset):].startswith(b"%d 0 obj" % nomor)
+
+def test_rekap_berisi_total(proyek):
+    output = BytesIO()
+    tulis_laporan_pdf(output, proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, bagian=("rekap",))
+    teks = b"".join(isi_halaman(output.getvalue()))
+    total = hitung_rab(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)[1]
+    assert f"({total * (1 + TARIF_PPN):,.0f})".encode() in teks
+    for item in proyek: assert _pdf_str(item["nama"]) in teks
+
+def test_bagian_dan_kode_ahsp(proyek):
+    analisa = list(halaman_laporan(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, bagian=("analisa",), kode_ahsp=AHSP_Engine.KODE[:1]))
+    assert len(analisa) == 1 and b"Analisa: " in analisa[0]
+    assert list(halaman_laporan([], HARGA_DEFAULT, OVERHEAD_DEFAULT, bagian=("detail",))) # Judul bagian tetap tercetak
+    with pytest.raises(ValueError, match="tidak dikenal"):
+        list(halaman_laporan(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, bagian=("lampiran",)))
+
+def test_bungkus_dan_escape():
+    teks = "Pekerjaan galian tanah biasa sedalam 1 m (manual) SuperPanjangTanpaSpasiYangHarusDipotongPerHuruf"
+    baris = _bungkus(teks, 80)
+    assert len(baris) > 1 and all(lebar_teks(b) <= 80 for b in baris)
+    assert "".join(baris).replace(" ", "") == teks.replace(" ", "")
+    assert _bungkus("pendek", 80) == ["pendek"]
+    assert _pdf_str("a(b)\\c ✅") == b"(a\\(b\\)\\\\c ?)"
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from optimasi_usbr import optimasi_terjunan, pareto_biaya_sf
+from rab_engine import (AHSP_Engine, Calculator, HARGA_DEFAULT, OVERHEAD_DEFAULT, SF_UPLIFT_MIN, biaya_batch, hitung_rab,
+                        segmen_ke_items)
+from conftest import segmen_acak
+
+@pytest.fixture
+def tabel_hsp():
+    return AHSP_Engine.tabel_harga_satuan(HARGA_DEFAULT, OVERHEAD_DEFAULT)
+
+def test_biaya_batch_sama_dengan_hitung_rab(tabel_hsp):
+    df = segmen_acak("Gorong-Gorong Box", 30, seed=7).assign(nama="Box", tipe="Gorong-Gorong Box")
+    biaya = biaya_batch(Calculator.hitung_gorong_box_struktur_batch(df, fc=25, fy=400), tabel_hsp)
+    for b, item in zip(biaya, segmen_ke_items(df)):
+        assert b == pytest.approx(hitung_rab([item], HARGA_DEFAULT, OVERHEAD_DEFAULT)[1], rel=1e-9, abs=1e-6)
+
+def test_terbaik_aman_dan_termurah(tabel_hsp):
+    hasil = optimasi_terjunan(Q=4.0, H_total=3.0, B=2.0, qa_tanah=150.0, tabel_hsp=tabel_hsp)
+    grid, terbaik = hasil["grid"], hasil["terbaik"]
+    assert terbaik is not None and terbaik["sf_uplift"] >= SF_UPLIFT_MIN and terbaik["sigma_tanah"] <= 150.0
+    assert terbaik["biaya"] == grid.loc[grid["aman"], "biaya"].min()
+    # Biaya grid = hitung_rab item skalar dengan konfigurasi yang sama
+    vol = Calculator.hitung_terjunan_usbr(4.0, 3.0, terbaik["H_step"], 2.0, terbaik["t_lantai"], terbaik["t_dinding"],
+                                          150.0, bool(terbaik["mode_hemat"]), False)
+    item = {"nama": "USBR", "tipe": "Terjunan USBR (Integrated)", "vol": vol}
+    assert terbaik["biaya"] == pytest.approx(hitung_rab([item], HARGA_DEFAULT, OVERHEAD_DEFAULT)[1], rel=1e-9)
+
+def test_pareto_tidak_didominasi(tabel_hsp):
+    aman = optimasi_terjunan(Q=4.0, H_total=3.0, B=2.0, qa_tanah=150.0, tabel_hsp=tabel_hsp)["grid"].query("aman")
+    pareto = pareto_biaya_sf(aman)
+    assert np.all(np.diff(pareto["biaya"].to_numpy()) >= 0) and np.all(np.diff(pareto["sf_uplift"].to_numpy()) > 0)
+    for _, p in pareto.iterrows():
+        assert not ((aman["biaya"] < p["biaya"]) & (aman["sf_uplift"] >= p["sf_uplift"])).any()
+
+def test_tidak_ada_desain_aman(tabel_hsp):
+    hasil = optimasi_terjunan(Q=4.0, H_total=3.0, B=2.0, qa_tanah=150.0, tabel_hsp=tabel_hsp, sf_min=99.0, t_lantai=(0.2,))
+    assert hasil["terbaik"] is None and hasil["pareto"].empty and not hasil["grid"]["aman"].any()
@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+import pytest
+
+from portofolio import folder_di_akar, muat_portofolio
+from proyek_store import ProjectStore
+from rab_engine import HARGA_DEFAULT, OVERHEAD_DEFAULT, hitung_rab, segmen_ke_items
+from conftest import segmen_acak
+
+def total_rab(data_proyek):
+    return hitung_rab(data_proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)[1]
+
+@pytest.fixture
+def segmen():
+    """Tabel segmen (.csv): saluran berpanjang + Box (panjang 0)"""
+    beton = segmen_acak("Saluran Beton", 6, seed=3, guard=False).assign(nama="Saluran", tipe="Saluran Beton")
+    box = segmen_acak("Gorong-Gorong Box", 4, seed=4, guard=False).assign(nama="Box", tipe="Gorong-Gorong Box")
+    return pd.concat([beton, box], ignore_index=True)
+
+def test_upload_json_rabdb_csv(proyek, segmen):
+    upload = [
+        ("a.json", json.dumps(proyek).encode()),
+        ("b.rabdb", ProjectStore.dari_list(proyek).to_bytes()),
+        ("c.CSV", segmen.to_csv(index=False).encode()),
+    ]
+    hasil = muat_portofolio(upload, HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    assert hasil["gagal"] == []
+    df = hasil["proyek"].set_index("proyek")
+    assert df.loc["a.json", "jumlah"] == pytest.approx(total_rab(proyek), rel=1e-9)
+    assert df.loc["b.rabdb", "jumlah"] == pytest.approx(total_rab(proyek), rel=1e-9)
+    assert df.loc["c.CSV", "jumlah_item"] == len(segmen)
+    assert df.loc["c.CSV", "jumlah"] == pytest.approx(total_rab(segmen_ke_items(segmen)), rel=1e-9)
+
+def test_path_folder_dan_file_gagal(tmp_path, proyek, segmen):
+    (tmp_path / "a.json").write_text(json.dumps(proyek))
+    segmen.to_csv(tmp_path / "c.csv", index=False)
+    (tmp_path / "rusak.json").write_text("{bukan json")
+    (tmp_path / "catatan.txt").write_text("diabaikan")
+    hasil = muat_portofolio([str(tmp_path)], HARGA_DEFAULT, OVERHEAD_DEFAULT, max_workers=2)
+    assert sorted(hasil["proyek"]["proyek"]) == ["a.json", "c.csv"]
+    assert [nama for nama, _ in hasil["gagal"]] == ["rusak.json"]
+    assert hasil["sumber_daya"]["Kuantitas"].gt(0).any()
+
+def test_biaya_per_m_hanya_saluran(segmen):
+    items = segmen_ke_items(segmen)
+    hasil = muat_portofolio([("c.csv", segmen.to_csv(index=False).encode())], HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    baris = hasil["proyek"].iloc[0]
+    saluran = [item for item in items if item["tipe"] == "Saluran Beton"]
+    assert baris["panjang"] == pytest.approx(sum(item["panjang"] for item in saluran))
+    # Biaya Box (panjang 0) ada di jumlah, tidak ikut dibagi panjang saluran
+    assert baris["jumlah"] == pytest.approx(total_rab(items), rel=1e-9)
+    assert baris["biaya_per_m"] == pytest.approx(total_rab(saluran) / baris["panjang"], rel=1e-9)
+    satuan = hasil["sebaran"].set_index("tipe")["satuan"]
+    assert satuan.to_dict() == {"Gorong-Gorong Box": "bh", "Saluran Beton": "m"}
+
+def test_folder_di_akar(tmp_path):
+    (tmp_path / "paket").mkdir()
+    assert folder_di_akar("paket", akar=str(tmp_path)) == str((tmp_path / "paket").resolve())
+    for sub in ["..", "../..", "/etc", "tidak_ada"]:
+        with pytest.raises(ValueError):
+            folder_di_akar(sub, akar=str(tmp_path))
+    with pytest.raises(ValueError):
+        folder_di_akar("paket", akar=None)
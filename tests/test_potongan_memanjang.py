@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from potongan_memanjang import format_sta, impor_potongan_memanjang
+from rab_engine import segmen_ke_items
+
+def tabel_sta(n, seed, seragam=False):
+    """Potongan memanjang Saluran Beton tiap 25 m (h acak kecuali `seragam`)"""
+    rng = np.random.default_rng(seed)
+    h = np.full(n, 1.2) if seragam else rng.uniform(0.8, 1.8, n).round(3)
+    return pd.DataFrame({"sta": np.arange(n) * 25.0, "h": h, "b": 1.0, "m": 0.5, "t_cm": 20.0, "dia": 13.0, "jarak": 20.0})
+
+def vol_sama(a, b):
+    for k, v in a.items():
+        if isinstance(v, dict): vol_sama(v, b[k])
+        elif isinstance(v, str): assert v == b[k], k
+        else: assert b[k] == pytest.approx(v, rel=1e-9, abs=1e-9), k
+
+def test_format_sta():
+    assert format_sta(0) == "0+000.00" and format_sta(1250.5) == "1+250.50"
+
+@pytest.mark.parametrize("metode", ["rata2", "prismoida"])
+def test_penampang_seragam_sama_dengan_segmen(tmp_path, metode):
+    path = tmp_path / "sta.csv"
+    tabel_sta(13, 0, seragam=True).to_csv(path, index=False) # STA 0+000 - 0+300
+    items = impor_potongan_memanjang(str(path), panjang_ruas=100.0, metode=metode)
+    assert [item["panjang"] for item in items] == [100.0, 100.0, 100.0]
+    assert items[0]["nama"] == "Ruas 1 (STA 0+000.00 - 0+100.00)"
+    segmen = pd.DataFrame([{"nama": "Ref", "tipe": "Saluran Beton", "h": 1.2, "b": 1.0, "m": 0.5, "panjang": 100.0,
+                            "t_cm": 20.0, "dia": 13.0, "jarak": 20.0}])
+    acuan = segmen_ke_items(segmen)[0]["vol"]
+    for item in items: vol_sama(acuan, item["vol"])
+
+def test_chunk_dan_xlsx_sama(tmp_path):
+    df = tabel_sta(57, 1).assign(is_rehab=lambda d: d["sta"] >= 1000)
+    df.to_csv(tmp_path / "sta.csv", index=False)
+    df.to_excel(tmp_path / "sta.xlsx", index=False)
+    utuh = impor_potongan_memanjang(str(tmp_path / "sta.csv"), panjang_ruas=150.0)
+    assert sum(item["panjang"] for item in utuh) == pytest.approx(df["sta"].iloc[-1])
+    assert any(item["nama"].endswith("(REHAB)") for item in utuh)
+    for lain in (impor_potongan_memanjang(str(tmp_path / "sta.csv"), panjang_ruas=150.0, ukuran_chunk=7),
+                 impor_potongan_memanjang(str(tmp_path / "sta.xlsx"), panjang_ruas=150.0, ukuran_chunk=10)):
+        assert [item["nama"] for item in lain] == [item["nama"] for item in utuh]
+        for a, b in zip(utuh, lain): vol_sama(a["vol"], b["vol"])
+
+def test_sta_tidak_urut(tmp_path):
+    df = tabel_sta(5, 2)
+    df.loc[3, "sta"] = 10.0
+    df.to_csv(tmp_path / "sta.csv", index=False)
+    with pytest.raises(ValueError, match="urut"):
+        impor_potongan_memanjang(str(tmp_path / "sta.csv"))
@@ -0,0 +1,58 @@
+import csv
+import sys
+import tracemalloc
+
+import pytest
+
+import profil_rerun
+from profil_rerun import KOLOM_PROFIL, ProfilRerun, tulis_csv
+
+@pytest.fixture(autouse=True)
+def tanpa_trace():
+    assert not tracemalloc.is_tracing() and profil_rerun._n_trace == 0
+    yield
+    assert profil_rerun._n_trace == 0
+    if tracemalloc.is_tracing(): tracemalloc.stop()
+
+def test_tahap_dan_csv(tmp_path):
+    profil = ProfilRerun(aktif=True)
+    profil.tahap("init")
+    data = [bytes(1000) for _ in range(200)]
+    profil.tahap("hitung")
+    hasil = profil.selesai(n_item=len(data))
+    assert [r["tahap"] for r in hasil] == ["init", "hitung"] and all(list(r) == KOLOM_PROFIL for r in hasil)
+    assert hasil[0]["alokasi_kb"] > 150 and hasil[0]["puncak_kb"] is not None and hasil[0]["n_item"] == 200
+    assert profil.tabel()["persen"].sum() == pytest.approx(100.0)
+    path = tmp_path / "profil.csv"
+    tulis_csv(hasil, str(path)); tulis_csv(hasil, str(path))
+    with open(path, newline="", encoding="utf-8") as f: assert len(list(csv.DictReader(f))) == 4
+
+def test_sesi_lain_tidak_menghentikan_trace():
+    a = ProfilRerun(aktif=True)
+    a.tahap("tab1")
+    ProfilRerun(aktif=False).selesai() # Sesi tanpa debug
+    b = ProfilRerun(aktif=True)
+    b.tahap("tab2")
+    # Puncak tidak dibaca / di-reset selama sesi A juga ber-profil (puncak global milik kedua rerun)
+    assert b.selesai()[0]["puncak_kb"] is None
+    assert tracemalloc.is_tracing() # Rerun sesi A masih berjalan
+    a.tahap("tab3")
+    assert a.selesai()[1]["puncak_kb"] is not None
+    assert not tracemalloc.is_tracing()
+
+def test_selesai_aman_dipanggil_ulang():
+    profil = ProfilRerun(aktif=True, cprofile=True)
+    with pytest.raises(ZeroDivisionError):
+        try:
+            profil.tahap("tab1")
+            1 / 0 # Rerun terpotong di tengah tahap
+        finally:
+            profil.selesai()
+    assert sys.getprofile() is None and not tracemalloc.is_tracing()
+    assert profil.selesai(5) is profil.hasil and profil_rerun._n_trace == 0
+    assert "ZeroDivisionError" not in profil.laporan_cprofile() and profil.cprofile_bytes()
+
+def test_trace_milik_pengguna_tidak_dihentikan():
+    tracemalloc.start()
+    ProfilRerun(aktif=True).selesai()
+    assert tracemalloc.is_tracing()
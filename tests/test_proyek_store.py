@@ -0,0 +1,60 @@
+import io
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import proyek_store
+from proyek_store import ProjectStore, _muat_lewat_file, _simpan_lewat_file, muat_proyek
+from rab_engine import segmen_ke_items
+from conftest import segmen_acak
+
+@pytest.fixture
+def items():
+    """Item skema rab_proyek.json: vol bertingkat (rho_data), dimensi, panjang kosong pada bangunan"""
+    return [
+        {"nama": f"Saluran {i}", "tipe": "Saluran Beton", "panjang": 10.0 * i,
+         "vol": {"vol_beton": 1.5 * i, "berat_besi": 80.25 * i, "rho_data": {"act": 0.01, "status": "AMAN"}},
+         "dimensi": {"h": 1.0, "b": 0.8}}
+        for i in range(1, 6)
+    ] + [{"nama": "Box", "tipe": "Gorong-Gorong Box", "panjang": 0, "vol": {"vol_beton": 4.0}}]
+
+def test_rabdb_bolak_balik(items):
+    store = ProjectStore.dari_list(items)
+    assert len(store) == len(items) and store.to_list() == items
+    assert list(ProjectStore.dari_bytes(store.to_bytes()).items()) == items
+    assert ProjectStore.dari_json(io.StringIO(store.to_json())).to_list() == items
+
+def test_operasi_per_item(items):
+    store = ProjectStore.dari_list(items[:2])
+    baru = store.tambah(items[2])
+    store.ubah(store.ids()[0], {**items[0], "nama": "Diubah"})
+    store.hapus(store.ids()[1])
+    assert [item["nama"] for item in store.items()] == ["Diubah", items[2]["nama"]]
+    assert store.ambil(baru) == items[2]
+    for operasi in (lambda: store.ambil(999), lambda: store.hapus(999), lambda: store.ubah(999, items[0])):
+        with pytest.raises(KeyError):
+            operasi()
+
+def test_cadangan_tanpa_serialize(items):
+    """Python < 3.11: lewat file sementara + backup, hasilnya dapat dibaca bolak-balik dengan jalur serialize"""
+    store = ProjectStore.dari_list(items)
+    data = _simpan_lewat_file(store.conn)
+    conn = sqlite3.connect(":memory:")
+    _muat_lewat_file(store.to_bytes(), conn)
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == len(items)
+    assert ProjectStore.dari_bytes(data).to_list() == items
+
+def test_muat_proyek_path_dan_upload(tmp_path, monkeypatch, items):
+    segmen = segmen_acak("Saluran Batu", 12, seed=2, guard=False).assign(nama="Batu", tipe="Saluran Batu")
+    berkas = {"p.json": (json.dumps(items).encode(), items),
+              "p.rabdb": (ProjectStore.dari_list(items).to_bytes(), items),
+              "p.csv": (segmen.to_csv(index=False).encode(), segmen_ke_items(segmen))}
+    monkeypatch.setattr(proyek_store, "UKURAN_CHUNK_CSV", 5) # .csv dibaca 3 chunk
+    with ThreadPoolExecutor(2) as pool:
+        for nama, (isi, harapan) in berkas.items():
+            (tmp_path / nama).write_bytes(isi)
+            assert muat_proyek(str(tmp_path / nama)) == harapan
+            assert muat_proyek(isi, nama.upper()) == harapan # Upload UI: bytes + nama file
+            assert muat_proyek(str(tmp_path / nama), pool=pool) == harapan
@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from pustaka_harga import NAMA_DEFAULT, HargaSesi, PustakaHarga, TurunanHarga, admin_sah, baca_harga
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, OVERHEAD_DEFAULT
+
+@pytest.fixture
+def pustaka(tmp_path):
+    (tmp_path / "Kota A.json").write_text(json.dumps({"p_semen": 1800, "overhead": 12}))
+    (tmp_path / "Kota B.csv").write_text("kunci,harga\nu_pekerja,110000\n")
+    (tmp_path / "Rusak.json").write_text("{")
+    return PustakaHarga(folder=str(tmp_path))
+
+def test_admin_sah():
+    assert admin_sah("rahasia", kunci_admin="rahasia")
+    assert not admin_sah("salah", kunci_admin="rahasia")
+    assert not admin_sah("", kunci_admin="rahasia") and not admin_sah(None, kunci_admin="rahasia")
+    # Tanpa kunci admin (env tidak diatur) tidak ada yang sah, termasuk kunci kosong
+    assert not admin_sah("", kunci_admin=None) and not admin_sah("apa saja", kunci_admin="")
+
+def test_muat_folder(pustaka, tmp_path):
+    assert pustaka.daftar() == [NAMA_DEFAULT, "Kota A", "Kota B"] and list(pustaka.gagal) == ["Rusak"]
+    a = pustaka.ambil("Kota A")
+    assert a.prices["p_semen"] == 1800 and a.prices["p_besi"] == HARGA_DEFAULT["p_besi"] and a.overhead == 12
+    assert pustaka.ambil("Kota B").overhead == OVERHEAD_DEFAULT
+    with pytest.raises(TypeError):
+        a.prices["p_semen"] = 1 # Read-only untuk semua sesi
+    (tmp_path / "Kota B.csv").unlink()
+    assert pustaka.muat_ulang() == ["Kota B"] and pustaka.ambil("Kota B").nama == NAMA_DEFAULT
+    with pytest.raises(ValueError):
+        pustaka.hapus(NAMA_DEFAULT)
+
+def test_perbarui_naikkan_versi_dan_buang_turunan(pustaka):
+    lama = pustaka.ambil("Kota A")
+    t1 = pustaka.turunan("Kota A")
+    assert pustaka.turunan(lama) is t1 # Dihitung sekali, dibagi
+    assert not t1.vektor.flags.writeable
+    baru = pustaka.perbarui("Kota A", {**lama.prices, "p_semen": 1900}, 12)
+    assert baru.versi == lama.versi + 1 and lama.prices["p_semen"] == 1800
+    t2 = pustaka.turunan("Kota A")
+    assert t2 is not t1 and t2.hsp != t1.hsp
+    tabel = AHSP_Engine.tabel_harga_satuan(dict(baru.prices), 12)
+    assert dict(t2.hsp) == pytest.approx(tabel, rel=1e-12)
+    assert all(v[3] == t2.hsp[v[2]] for v in t2.map_pekerjaan.values())
+
+def test_override_sesi_terpisah(pustaka):
+    dasar = pustaka.ambil(NAMA_DEFAULT)
+    a, b = HargaSesi(), HargaSesi()
+    a.catat(dasar, "p_semen", 2000.0)
+    a.catat(dasar, "p_besi", dasar.prices["p_besi"]) # Sama dengan daftar: tidak disimpan
+    assert a.override == {"p_semen": 2000.0} and b.override == {}
+    assert a.prices(dasar)["p_semen"] == 2000.0 and b.prices(dasar)["p_semen"] == HARGA_DEFAULT["p_semen"]
+    assert dasar.prices["p_semen"] == HARGA_DEFAULT["p_semen"]
+    assert a.turunan(pustaka, dasar) is None and b.turunan(pustaka, dasar) is pustaka.turunan(dasar)
+
+    # Upload harga 1 sesi: hanya jadi override sesi itu, daftar bersama & sesi lain tidak berubah
+    b.muat(dasar, {**HARGA_DEFAULT, "u_pekerja": 150000, "kunci_asing": 1.0}, 10.0)
+    assert b.override == {"u_pekerja": 150000.0} and b.overhead_pct(dasar) == 10.0
+    assert a.override == {"p_semen": 2000.0} and a.overhead_pct(dasar) == OVERHEAD_DEFAULT
+    assert pustaka.ambil(NAMA_DEFAULT).prices["u_pekerja"] == HARGA_DEFAULT["u_pekerja"]
+    b.reset()
+    assert b.override == {} and b.overhead is None
+
+def test_turunan_sama_dengan_hitung_sendiri():
+    prices = {**HARGA_DEFAULT, "p_pasir": 280000.0}
+    turunan = TurunanHarga(prices, 14.0)
+    assert np.array_equal(turunan.vektor, AHSP_Engine.vektor_harga(prices))
+    assert dict(turunan.hsp) == pytest.approx(AHSP_Engine.tabel_harga_satuan(prices, 14.0), rel=1e-12)
+
+def test_baca_harga(tmp_path):
+    (tmp_path / "h.json").write_text(json.dumps({"p_batu": 300000}))
+    prices, overhead = baca_harga(str(tmp_path / "h.json"))
+    assert prices == {**HARGA_DEFAULT, "p_batu": 300000.0} and overhead == OVERHEAD_DEFAULT
+    with open(tmp_path / "h.json", "rb") as f:
+        assert baca_harga(f, "upload.json") == (prices, overhead)
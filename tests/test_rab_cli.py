@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+import rab_cli
+from rab_cli import main, muat_harga, proses_proyek
+from rab_engine import HARGA_DEFAULT, OVERHEAD_DEFAULT, TARIF_PPN, hitung_rab, segmen_ke_items
+from conftest import segmen_acak
+
+def test_cli_tanpa_streamlit():
+    kode = "import sys, rab_cli; sys.exit('streamlit' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", kode], cwd=os.path.dirname(rab_cli.__file__)).returncode == 0
+
+def test_cli_json_csv_dan_harga(tmp_path, proyek):
+    segmen = segmen_acak("Saluran Beton", 9, seed=2).assign(nama="Beton", tipe="Saluran Beton")
+    (tmp_path / "a.json").write_text(json.dumps(proyek))
+    segmen.to_csv(tmp_path / "b.csv", index=False)
+    (tmp_path / "harga.json").write_text(json.dumps({"p_semen": 2000, "overhead": 12}))
+    keluar = tmp_path / "hasil"
+    assert main([str(tmp_path / "a.json"), str(tmp_path / "b.csv"), "--harga", str(tmp_path / "harga.json"),
+                 "--out-dir", str(keluar), "--jobs", "2"]) == 0
+
+    prices, overhead = muat_harga(str(tmp_path / "harga.json"))
+    assert prices == {**HARGA_DEFAULT, "p_semen": 2000.0} and overhead == 12
+    rekap = pd.read_csv(keluar / "rekap_rab.csv").set_index("jumlah_item")
+    for data_proyek in (proyek, segmen_ke_items(segmen)):
+        total = hitung_rab(data_proyek, prices, overhead)[1]
+        assert rekap.loc[len(data_proyek), "total_akhir"] == pytest.approx(total * (1 + TARIF_PPN), rel=1e-9)
+    wb = load_workbook(keluar / "RAB_a.xlsx", read_only=True)
+    assert len(wb.sheetnames) >= 4
+    wb.close()
+
+def test_proses_proyek_tanpa_output(proyek):
+    hasil = proses_proyek(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    assert hasil["jumlah"] == pytest.approx(hitung_rab(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)[1])
+    assert hasil["excel"] is None and hasil["total_akhir"] == pytest.approx(hasil["jumlah"] * (1 + TARIF_PPN))
@@ -0,0 +1,54 @@
+import math
+
+import pandas as pd
+import pytest
+
+from rab_engine import (AHSP_Engine, Calculator, HARGA_DEFAULT, OVERHEAD_DEFAULT, MAP_PEKERJAAN, TIPE_SEGMEN,
+                        _vol_dari_baris, hitung_rab)
+from conftest import segmen_acak
+
+def sama(skalar, batch, path="vol"):
+    """Bandingkan dict hasil fungsi skalar dengan baris batch yang disusun ulang (_vol_dari_baris)"""
+    if isinstance(skalar, dict):
+        assert isinstance(batch, dict), path
+        assert set(skalar) == set(batch), f"{path}: {sorted(set(skalar) ^ set(batch))}"
+        for k in skalar: sama(skalar[k], batch[k], f"{path}.{k}")
+    elif isinstance(skalar, str) or skalar is None:
+        assert skalar == batch, path
+    else:
+        assert float(batch) == pytest.approx(float(skalar), rel=1e-9, abs=1e-9), path
+
+@pytest.mark.parametrize("tipe", list(TIPE_SEGMEN))
+def test_batch_sama_dengan_skalar(tipe):
+    fungsi_batch, konstan = TIPE_SEGMEN[tipe]
+    fungsi_skalar = getattr(Calculator, fungsi_batch.__name__.removesuffix("_batch"))
+    konstan = {k: v for k, v in konstan.items() if k != "mode_hemat"} # mode_hemat diselang-seling per baris
+    df = segmen_acak(tipe, 60, seed=len(tipe))
+    hasil = fungsi_batch(df, **konstan)
+    assert list(hasil.index) == list(df.index)
+    for baris, rec in zip(df.to_dict("records"), hasil.to_dict("records")):
+        sama(fungsi_skalar(**{**baris, **konstan}), _vol_dari_baris(rec))
+
+def test_batch_konstanta_dan_dict_of_array():
+    df = segmen_acak("Saluran Beton", 5, seed=1)
+    dari_df = Calculator.hitung_beton_struktur_batch(df, lapis=2, waste=5, fc=20, fy=280)
+    dari_dict = Calculator.hitung_beton_struktur_batch({k: df[k].to_numpy() for k in df}, lapis=2, waste=5, fc=20, fy=280)
+    pd.testing.assert_frame_equal(dari_df.reset_index(drop=True), dari_dict)
+    with pytest.raises(KeyError):
+        Calculator.hitung_beton_struktur_batch(df.drop(columns="jarak"), lapis=2, waste=5, fc=20, fy=280)
+
+def test_hitung_rab_per_item(proyek):
+    rows, total = hitung_rab(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    assert total == pytest.approx(sum(r["Total"] for r in rows), rel=1e-12)
+    assert {r["No"] for r in rows} <= set(range(1, len(proyek) + 1))
+    per_item = [hitung_rab([item], HARGA_DEFAULT, OVERHEAD_DEFAULT, no_awal=i)[1] for i, item in enumerate(proyek, 1)]
+    assert total == pytest.approx(sum(per_item), rel=1e-12)
+    for r in rows: assert r["Total"] == pytest.approx(r["Vol"] * r["H.Sat"], rel=1e-12)
+
+def test_tabel_harga_satuan_sama_dengan_per_kode():
+    prices = {**HARGA_DEFAULT, "p_semen": HARGA_DEFAULT["p_semen"] * 1.3}
+    tabel = AHSP_Engine.tabel_harga_satuan(prices, 12.5)
+    kode_rab = {kode for _, _, kode in MAP_PEKERJAAN.values()}
+    for kode in kode_rab:
+        assert tabel[kode] == pytest.approx(AHSP_Engine.hitung_harga_satuan(kode, prices, 12.5), rel=1e-12)
+    assert not any(math.isnan(v) for v in tabel.values())
@@ -0,0 +1,32 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, hitung_rab
+from rekap_sumber_daya import SATUAN_SUMBER_DAYA, ekspor_sumber_daya_excel, hitung_sumber_daya
+
+def test_total_sama_dengan_rab_tanpa_overhead(proyek):
+    hasil = hitung_sumber_daya(proyek)
+    total = hasil["total"]
+    assert set(total["Sumber Daya"]) == set(AHSP_Engine.SUMBER_DAYA) == set(SATUAN_SUMBER_DAYA)
+    # Nilai sumber daya (tanpa overhead) = RAB dengan overhead 0
+    assert total["Jumlah Harga (Rp)"].sum() == pytest.approx(hitung_rab(proyek, HARGA_DEFAULT, 0)[1], rel=1e-9)
+    assert hasil["per_item"].to_numpy().sum(axis=0) == pytest.approx(hasil["per_kode"].to_numpy().sum(axis=0), rel=1e-12)
+    assert list(total["Kategori"].drop_duplicates()) == ["Upah", "Bahan"]
+
+def test_per_item_dan_harga(proyek):
+    prices = {**HARGA_DEFAULT, "p_besi": HARGA_DEFAULT["p_besi"] * 2}
+    hasil = hitung_sumber_daya(proyek[:3], prices)
+    for i, item in enumerate(proyek[:3]):
+        satu = hitung_sumber_daya([item])["total"].set_index("Sumber Daya")["Kuantitas"]
+        baris = pd.Series(hasil["per_item"].iloc[i].to_numpy(), index=AHSP_Engine.SUMBER_DAYA)
+        assert baris.to_numpy() == pytest.approx(satu.loc[AHSP_Engine.SUMBER_DAYA].to_numpy(), rel=1e-12, abs=1e-12)
+    besi = hasil["total"].set_index("Sumber Daya").loc["Besi Beton"]
+    assert besi["Harga Satuan (Rp)"] == prices["p_besi"]
+    assert np.isclose(besi["Jumlah Harga (Rp)"], besi["Kuantitas"] * prices["p_besi"])
+
+def test_ekspor_excel(proyek):
+    sheet = pd.read_excel(io.BytesIO(ekspor_sumber_daya_excel(hitung_sumber_daya(proyek))), sheet_name=None)
+    assert list(sheet) == ["Total Sumber Daya", "Per Kode AHSP", "Per Item"] and len(sheet["Per Item"]) == len(proyek)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from rab_engine import HARGA_DEFAULT, OVERHEAD_DEFAULT, TARIF_PPN, hitung_rab
+from risiko_biaya import KOLOM_KETIDAKPASTIAN, PERSENTIL, histogram_risiko, simulasi_risiko, tabel_ketidakpastian
+
+def rentang_nol(**aktif):
+    """Tabel ketidakpastian dengan semua rentang 0 kecuali `aktif` (kunci -> (bawah, atas))"""
+    tabel = tabel_ketidakpastian()
+    tabel[["Bawah (%)", "Atas (%)"]] = 0.0
+    for kunci, (bawah, atas) in aktif.items():
+        tabel.loc[tabel["Kunci"] == kunci, ["Bawah (%)", "Atas (%)"]] = (bawah, atas)
+    return tabel
+
+def test_dasar_sama_dengan_rab(proyek):
+    tabel = tabel_ketidakpastian()
+    assert list(tabel.columns) == KOLOM_KETIDAKPASTIAN and tabel["Kunci"].is_unique
+    hasil = simulasi_risiko(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, n_sampel=2000)
+    total = hitung_rab(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)[1] * (1 + TARIF_PPN)
+    assert hasil["dasar"] == pytest.approx(total, rel=1e-9)
+    assert hasil["persentil"]["Ukuran"].tolist()[2:] == [f"P{p}" for p in PERSENTIL]
+    assert histogram_risiko(hasil["sampel"], n_bin=20)["Kumulatif (%)"].iloc[-1] == pytest.approx(100.0)
+
+def test_tanpa_ketidakpastian(proyek):
+    hasil = simulasi_risiko(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, rentang_nol(), n_sampel=500)
+    assert hasil["sampel"] == pytest.approx(np.full(500, hasil["dasar"]), rel=1e-12)
+    assert (hasil["pemicu"]["Spearman"] == 0).all() and (hasil["pemicu"]["Ayunan (Rp)"].abs() < 1e-3).all()
+
+def test_satu_pemicu_dan_batas_sampel(proyek):
+    tabel = rentang_nol(p_besi=(-10.0, 25.0))
+    hasil = simulasi_risiko(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, tabel, n_sampel=3000)
+    harga = lambda f: {**HARGA_DEFAULT, "p_besi": HARGA_DEFAULT["p_besi"] * f}
+    total = lambda f: hitung_rab(proyek, harga(f), OVERHEAD_DEFAULT)[1] * (1 + TARIF_PPN)
+    assert total(0.9) - 1e-3 <= hasil["sampel"].min() and hasil["sampel"].max() <= total(1.25) + 1e-3
+    pemicu = hasil["pemicu"].set_index("Kunci")
+    assert pemicu.index[0] == "p_besi" and pemicu.loc["p_besi", "Spearman"] == pytest.approx(1.0)
+    assert pemicu.loc["p_besi", "Kontribusi Varian (%)"] == pytest.approx(100.0)
+
+def test_batch_dan_seed(proyek):
+    a = simulasi_risiko(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, n_sampel=3000, seed=4, ukuran_batch=3000)
+    b = simulasi_risiko(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, n_sampel=3000, seed=4, ukuran_batch=700)
+    assert np.array_equal(a["sampel"], b["sampel"]) # Ukuran batch tidak mengubah hasil
+    c = simulasi_risiko(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT, n_sampel=3000, seed=5)
+    assert not np.array_equal(a["sampel"], c["sampel"])
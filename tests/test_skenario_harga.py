@@ -0,0 +1,39 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rab_engine import AHSP_Engine, HARGA_DEFAULT, OVERHEAD_DEFAULT, hitung_rab, matriks_volume
+from skenario_harga import ekspor_skenario_excel, hitung_skenario, muat_skenario, skenario_eskalasi
+
+def test_matriks_volume_sama_dengan_hitung_rab(proyek):
+    rows, total = hitung_rab(proyek, HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    tabel_hsp = AHSP_Engine.tabel_harga_satuan(HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    hsp = np.array([tabel_hsp[k] for k in AHSP_Engine.KODE])
+    assert total == pytest.approx(float((matriks_volume(proyek) @ hsp).sum()), rel=1e-12)
+    assert total == pytest.approx(sum(r["Total"] for r in rows), rel=1e-12)
+    assert {r["No"] for r in rows} <= set(range(1, len(proyek) + 1))
+
+def test_eskalasi_sama_dengan_hitung_rab(proyek):
+    df = skenario_eskalasi(HARGA_DEFAULT, [0, 10, -5])
+    hasil = hitung_skenario(proyek, df, OVERHEAD_DEFAULT, prices_dasar=HARGA_DEFAULT)
+    total = hasil["total"]
+    for nama, harga in zip(df.index, df.to_dict("records")):
+        assert total.loc[nama, "Jumlah"] == pytest.approx(hitung_rab(proyek, harga, OVERHEAD_DEFAULT)[1], rel=1e-9)
+    assert total["Selisih vs Harga Dasar (%)"].tolist() == pytest.approx([0.0, 10.0, -5.0])
+    assert hasil["subtotal"].sum(axis=0).to_numpy() == pytest.approx(total["Jumlah"].to_numpy(), rel=1e-12)
+    tabel_hsp = AHSP_Engine.tabel_harga_satuan(HARGA_DEFAULT, OVERHEAD_DEFAULT)
+    assert hasil["hsp"].loc["+0%"].to_dict() == pytest.approx(tabel_hsp, rel=1e-12)
+
+def test_muat_skenario_csv_dan_overhead(proyek):
+    csv = io.StringIO("skenario,p_semen,u_pekerja,overhead\nSemen naik,2000,,15\nOH rendah,,,10\n")
+    df = muat_skenario(csv, HARGA_DEFAULT)
+    assert df.loc["Semen naik", "u_pekerja"] == HARGA_DEFAULT["u_pekerja"]
+    assert df.loc["OH rendah", "p_semen"] == HARGA_DEFAULT["p_semen"]
+    hasil = hitung_skenario(proyek, df, OVERHEAD_DEFAULT)
+    harga_semen = {**HARGA_DEFAULT, "p_semen": 2000.0}
+    assert hasil["total"].loc["Semen naik", "Jumlah"] == pytest.approx(hitung_rab(proyek, harga_semen, 15)[1], rel=1e-9)
+    assert hasil["total"].loc["OH rendah", "Jumlah"] == pytest.approx(hitung_rab(proyek, HARGA_DEFAULT, 10)[1], rel=1e-9)
+    sheet = pd.read_excel(io.BytesIO(ekspor_skenario_excel(hasil, df)), sheet_name=None)
+    assert list(sheet) == ["Total Skenario", "HSP per Skenario", "Subtotal Item", "Harga Skenario"]
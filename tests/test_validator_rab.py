@@ -0,0 +1,46 @@
+import copy
+
+import pytest
+
+from rab_engine import SF_UPLIFT_MIN
+from validator_rab import KOLOM_TEMUAN, TINGKAT, ringkasan_validasi, validasi_proyek
+
+def temuan_item(temuan, nama, aturan):
+    return temuan[(temuan["Item"] == nama) & (temuan["Aturan"] == aturan)]
+
+def test_proyek_kosong():
+    temuan = validasi_proyek([])
+    assert list(temuan.columns) == KOLOM_TEMUAN and temuan.empty
+    assert ringkasan_validasi(temuan).empty
+
+def test_temuan_urut_dari_kritis(proyek):
+    temuan = validasi_proyek(proyek)
+    assert list(temuan.columns) == KOLOM_TEMUAN and not temuan.empty
+    tingkat = temuan["Tingkat"].map(TINGKAT).to_numpy()
+    assert (tingkat[:-1] <= tingkat[1:]).all()
+    assert ringkasan_validasi(temuan)["Jumlah"].sum() == len(temuan)
+    rho = [item["vol"].get("rho_data") or {} for item in proyek]
+    boros = [no for no, r in enumerate(rho, 1) if r and r["act"] > r["max"]]
+    assert sorted(temuan.loc[temuan["Aturan"] == "Rho Maksimum", "No"]) == boros
+
+def test_timbunan_melebihi_ruang_galian(proyek):
+    item = copy.deepcopy(proyek[0])
+    vol = item["vol"]
+    struktur = vol.get("vol_beton", 0) + vol.get("vol_batu", 0)
+    vol["vol_timbunan"] = vol["vol_galian"] - struktur + 25.0
+    baris = temuan_item(validasi_proyek([item]), item["nama"], "Timbunan > Ruang Galian (m3)")
+    assert len(baris) == 1
+    assert baris["Nilai"].iloc[0] == pytest.approx(vol["vol_timbunan"], abs=1e-4) # m3, bukan rasio
+    assert baris["Batas"].iloc[0] == f"≤ {vol['vol_galian'] - struktur:,.2f} m3 (galian - struktur)"
+
+    vol["vol_timbunan"] = vol["vol_galian"] - struktur - 1.0
+    assert temuan_item(validasi_proyek([item]), item["nama"], "Timbunan > Ruang Galian (m3)").empty
+
+def test_volume_nol_dan_sf_uplift(proyek):
+    kosong = {"nama": "Kosong", "tipe": "Saluran Batu", "vol": {}}
+    usbr = copy.deepcopy(next(item for item in proyek if item["tipe"].startswith("Terjunan")))
+    usbr["vol"]["stabilitas"]["sf_uplift"] = SF_UPLIFT_MIN - 0.1
+    temuan = validasi_proyek([kosong, usbr])
+    assert temuan_item(temuan, "Kosong", "Volume Nol")["No"].tolist() == [1]
+    sf = temuan_item(temuan, usbr["nama"], "SF Uplift")
+    assert sf["Tingkat"].tolist() == ["⛔ KRITIS"] and sf["Nilai"].iloc[0] == pytest.approx(SF_UPLIFT_MIN - 0.1)
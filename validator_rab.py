@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from rab_engine import SF_UPLIFT_MIN
+
+# ==========================================
+# VALIDASI OTOMATIS (RULE-BASED, OFFLINE)
+# ==========================================
+# Semua item dicek sekaligus: data proyek diratakan jadi 1 tabel (lihat JALUR_KOLOM),
+# tiap aturan = 1 mask boolean atas seluruh kolom, hasilnya digabung jadi tabel temuan.
+
+TINGKAT = {"⛔ KRITIS": 0, "⚠️ PERINGATAN": 1}
+
+# Rasio pembesian wajar (kg besi / m3 beton) per tipe: (min, max)
+RASIO_BESI_WAJAR = {
+    "Saluran Beton": (50.0, 150.0),
+    "Gorong-Gorong Box": (60.0, 200.0),
+    "Terjunan USBR (Integrated)": (100.0, 160.0),
+}
+# Rasio galian / volume struktur (beton + batu) wajar per tipe: (min, max)
+RASIO_GALIAN_WAJAR = {
+    "Saluran Beton": (1.0, 10.0),
+    "Saluran Batu": (1.0, 3.0),
+    "Gorong-Gorong Box": (1.0, 8.0),
+    "Terjunan USBR (Integrated)": (1.0, 3.0),
+}
+
+KOLOM_TEMUAN = ["No", "Item", "Tipe", "Aturan", "Tingkat", "Nilai", "Batas", "Keterangan"]
+
+# Kolom tabel validasi: nama kolom -> jalur kunci di dalam item
+JALUR_KOLOM = {
+    "nama": ("nama",), "tipe": ("tipe",),
+    **{k: ("vol", k) for k in ["vol_beton", "vol_batu", "vol_galian", "vol_timbunan", "berat_besi", "t_rekom"]},
+    **{k: ("vol", "rho_data", k) for k in ["act", "min", "max"]},
+    **{k: ("vol", "stabilitas", k) for k in ["sf_uplift", "sigma_tanah", "status_tanah"]},
+    **{k: ("dimensi", k) for k in ["t_cm", "qa_tanah"]},
+}
+
+def _ambil(item, jalur):
+    for kunci in jalur:
+        if not isinstance(item, dict): return None
+        item = item.get(kunci)
+    return item
+
+def _tabel_validasi(data_proyek):
+    """Ratakan data proyek: 1 baris per item (kolom yang tidak ada pada item diisi NaN)"""
+    df = pd.DataFrame({k: [_ambil(item, jalur) for item in data_proyek] for k, jalur in JALUR_KOLOM.items()})
+    angka = df.columns.difference(["nama", "tipe", "status_tanah"])
+    df[angka] = df[angka].apply(pd.to_numeric, errors="coerce")
+    df["no"] = np.arange(1, len(df) + 1)
+    for k in ["vol_beton", "vol_batu", "vol_galian", "vol_timbunan", "berat_besi"]:
+        df[k] = df[k].fillna(0.0)
+    struktur = df["vol_beton"] + df["vol_batu"]
+    df["rasio_besi"] = (df["berat_besi"] / df["vol_beton"]).where(df["vol_beton"] > 0)
+    df["rasio_galian"] = (df["vol_galian"] / struktur).where(struktur > 0)
+    df["galian_bebas"] = df["vol_galian"] - struktur
+    return df
+
+def _batas_tipe(df, tabel):
+    """Kolom batas bawah/atas per baris sesuai tipe (NaN bila tipe tidak punya aturan)"""
+    bawah = df["tipe"].map({t: v[0] for t, v in tabel.items()}).astype(float)
+    atas = df["tipe"].map({t: v[1] for t, v in tabel.items()}).astype(float)
+    return bawah, atas
+
+def _temuan(df, mask, aturan, tingkat, nilai, batas, keterangan):
+    """Baris temuan untuk item yang melanggar `mask` (nilai/batas: Series sejajar df atau skalar)"""
+    mask = mask.fillna(False).to_numpy(dtype=bool)
+    if not mask.any(): return None
+    pilih = lambda x: x[mask] if isinstance(x, pd.Series) else x
+    return pd.DataFrame({
+        "No": df["no"][mask], "Item": df["nama"][mask], "Tipe": df["tipe"][mask],
+        "Aturan": aturan, "Tingkat": tingkat, "Nilai": pilih(nilai),
+        "Batas": pilih(batas), "Keterangan": keterangan,
+    })
+
+def validasi_proyek(data_proyek):
+    """
+    Cek semua item sekaligus terhadap aturan teknis: rasio besi (kg/m3) per tipe, rasio galian/timbunan,
+    rho min/max, SF uplift & daya dukung tanah (USBR), serta tebal rencana vs t_rekom.
+    Return: DataFrame KOLOM_TEMUAN, urut dari yang paling kritis (kosong bila tidak ada temuan).
+    """
+    if not data_proyek: return pd.DataFrame(columns=KOLOM_TEMUAN)
+    df = _tabel_validasi(data_proyek)
+    fmt = lambda a, b: a.map("{:.2f}".format) + " – " + b.map("{:.2f}".format)
+
+    besi_min, besi_max = _batas_tipe(df, RASIO_BESI_WAJAR)
+    galian_min, galian_max = _batas_tipe(df, RASIO_GALIAN_WAJAR)
+    qa = df["qa_tanah"]
+    kosong = (df["vol_beton"] + df["vol_batu"] + df["vol_galian"]) <= 0.001
+
+    hasil = [
+        _temuan(df, kosong, "Volume Nol", "⚠️ PERINGATAN", 0.0, "> 0",
+                "Item tanpa volume (dimensi 0 / data kosong)"),
+        _temuan(df, df["rasio_besi"] < besi_min, "Rasio Besi (kg/m3)", "⚠️ PERINGATAN", df["rasio_besi"], fmt(besi_min, besi_max),
+                "Pembesian di bawah kewajaran tipe ini"),
+        _temuan(df, df["rasio_besi"] > besi_max, "Rasio Besi (kg/m3)", "⚠️ PERINGATAN", df["rasio_besi"], fmt(besi_min, besi_max),
+                "Pembesian di atas kewajaran tipe ini (boros)"),
+        _temuan(df, df["rasio_galian"] < galian_min, "Rasio Galian / Struktur", "⛔ KRITIS", df["rasio_galian"], fmt(galian_min, galian_max),
+                "Galian lebih kecil dari volume struktur"),
+        _temuan(df, df["rasio_galian"] > galian_max, "Rasio Galian / Struktur", "⚠️ PERINGATAN", df["rasio_galian"], fmt(galian_min, galian_max),
+                "Galian terlalu besar dibanding volume struktur"),
+        _temuan(df, df["vol_timbunan"] > df["galian_bebas"].clip(lower=0) + 0.001, "Timbunan > Ruang Galian (m3)", "⚠️ PERINGATAN",
+                df["vol_timbunan"], "≤ " + df["galian_bebas"].clip(lower=0).map("{:,.2f} m3 (galian - struktur)".format),
+                "Timbunan kembali melebihi sisa ruang galian"),
+        _temuan(df, df["act"] < df["min"], "Rho Minimum", "⛔ KRITIS", df["act"], "≥ " + df["min"].map("{:.4f}".format),
+                "Tulangan kurang dari rho minimum (KURANG BESI)"),
+        _temuan(df, df["act"] > df["max"], "Rho Maksimum", "⚠️ PERINGATAN", df["act"], "≤ " + df["max"].map("{:.4f}".format),
+                "Tulangan melebihi rho maksimum (BOROS BESI)"),
+        _temuan(df, df["sf_uplift"] < SF_UPLIFT_MIN, "SF Uplift", "⛔ KRITIS", df["sf_uplift"], f"≥ {SF_UPLIFT_MIN}",
+                "Bahaya mengapung: pertebal lantai / perpanjang kolam"),
+        _temuan(df, (df["sigma_tanah"] > qa) | (qa.isna() & df["status_tanah"].notna() & (df["status_tanah"] != "AMAN")),
+                "Daya Dukung Tanah", "⛔ KRITIS", df["sigma_tanah"], "≤ " + qa.map("{:.2f}".format),
+                "Tekanan netto melebihi daya dukung tanah (amblas)"),
+        _temuan(df, df["t_cm"] < df["t_rekom"] - 0.05, "Tebal vs t_rekom (cm)", "⚠️ PERINGATAN", df["t_cm"],
+                "≥ " + df["t_rekom"].map("{:.1f}".format), "Tebal rencana di bawah tebal rekomendasi"),
+    ]
+    hasil = [h for h in hasil if h is not None]
+    if not hasil: return pd.DataFrame(columns=KOLOM_TEMUAN)
+    temuan = pd.concat(hasil, ignore_index=True)
+    temuan["Nilai"] = temuan["Nilai"].astype(float).round(4)
+    urut = temuan["Tingkat"].map(TINGKAT)
+    return temuan.assign(_urut=urut).sort_values(["_urut", "No", "Aturan"], kind="stable").drop(columns="_urut").reset_index(drop=True)
+
+def ringkasan_validasi(temuan):
+    """Jumlah temuan per aturan & tingkat (untuk metrik UI / digest AI)"""
+    if temuan.empty: return pd.DataFrame(columns=["Aturan", "Tingkat", "Jumlah"])
+    return temuan.groupby(["Tingkat", "Aturan"], sort=False).size().rename("Jumlah").reset_index()